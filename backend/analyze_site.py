@@ -1,47 +1,54 @@
 """
 Run all AI workers to analyze the current Stimulus Collective site.
 Generates a comprehensive report with recommendations.
+
+The UX, visual and tech audits don't depend on each other, so they run
+concurrently (see workers/audit_runner.py) and each section is printed as
+soon as it completes.
+
+Every run is logged section by section to AUDIT_LOG_DIR (see
+workers/audit_log.py): a run that fails part-way can be resumed, sections
+whose inputs, prompts and model haven't changed since the last finished run
+are copied from it instead of re-run, and each report lists which issues
+are new, resolved or persisting since that run.
+
+Usage:
+    python analyze_site.py                  # all sections, 3 at a time
+    python analyze_site.py --parallel 1     # one after another
+    python analyze_site.py --sections ux tech
+    python analyze_site.py --refresh        # ignore cached steps and earlier runs
+    python analyze_site.py --mode fast      # one fused call per worker
+    python analyze_site.py --resume         # finish the last unfinished run
+    python analyze_site.py --diff           # last two finished runs, no LM calls
 """
 
-import dspy
+import argparse
 import json
+import time
 from datetime import datetime
-from config import GROQ_API_KEY, DSPY_LM_MODEL
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+from config import DSPY_LM_MODEL, AUDIT_PARALLELISM, AUDIT_LOG_DIR, AUDIT_REPORT_PATH
 
 # Import workers
 from workers.ux_designer import UXDesignerWorker
 from workers.visual_designer import VisualDesignerWorker
 from workers.tech_architect import TechArchitectWorker
+from workers.audit_log import AuditLog, count_changes, diff_reports, find_run, latest_run, list_runs
+from workers.audit_runner import AuditSection, SectionResult, run_audit
+from workers.cache import make_key, signature_hash
+from workers.fused import MODES
+from workers.lm_client import configure_lm
+from workers.stages import StageCache, summarize_stages
 
-# Configure DSPy
-print(f"📡 Connecting to {DSPY_LM_MODEL}...")
-lm = dspy.LM(DSPY_LM_MODEL, api_key=GROQ_API_KEY)
-dspy.configure(lm=lm)
-print("✅ DSPy configured\n")
-
-# Initialize workers
-print("🤖 Initializing AI Workers...")
-ux_worker = UXDesignerWorker()
-visual_worker = VisualDesignerWorker()
-tech_worker = TechArchitectWorker()
-print("✅ All workers ready\n")
-
-print("=" * 80)
-print("STIMULUS COLLECTIVE - AI DESIGN AUDIT")
-print("=" * 80)
-print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"Analyzing: http://100.118.170.68:4322")
-print("=" * 80)
-print()
+SITE_URL = "http://100.118.170.68:4322"
 
-# ============================================================================
-# 1. UX/UI DESIGNER ANALYSIS
-# ============================================================================
-print("\n" + "━" * 80)
-print("🎨 UX/UI DESIGNER ANALYSIS")
-print("━" * 80)
+# Shared by the UX and visual workers: unchanged steps are served from cache
+STAGE_CACHE = StageCache()
 
-current_homepage_layout = """
+CURRENT_HOMEPAGE_LAYOUT = """
 CURRENT HOMEPAGE LAYOUT:
 
 Header/Hero (Grid 2 columns):
@@ -77,39 +84,7 @@ DESIGN ELEMENTS USED:
 - E53935 red accent color
 """
 
-ux_result = ux_worker(
-    page_type="homepage",
-    current_layout=current_homepage_layout,
-    user_behavior_data="No data yet - new site launch",
-    device_breakdown="Estimated: mobile 60%, desktop 35%, tablet 5%"
-)
-
-print("\n🔍 ISSUES FOUND:")
-for i, issue in enumerate(ux_result.issues_found, 1):
-    print(f"{i}. {issue}")
-
-print("\n💡 RECOMMENDATIONS:")
-for i, rec in enumerate(ux_result.recommendations, 1):
-    print(f"{i}. {rec}")
-
-print("\n📱 MOBILE-SPECIFIC FIXES:")
-for i, fix in enumerate(ux_result.mobile_specific_fixes, 1):
-    print(f"{i}. {fix}")
-
-print("\n♿ ACCESSIBILITY ISSUES:")
-for i, issue in enumerate(ux_result.accessibility_issues, 1):
-    print(f"{i}. {issue}")
-
-print(f"\n⚠️  PRIORITY SCORE: {ux_result.priority_score}/10")
-
-# ============================================================================
-# 2. VISUAL DESIGNER ANALYSIS
-# ============================================================================
-print("\n" + "━" * 80)
-print("👁️  VISUAL DESIGNER ANALYSIS")
-print("━" * 80)
-
-visual_description = """
+VISUAL_DESCRIPTION = """
 CURRENT VISUAL DESIGN:
 
 TYPOGRAPHY:
@@ -152,7 +127,7 @@ IMAGERY:
 - Placeholder images (not real photos)
 """
 
-brand_guidelines = """
+BRAND_GUIDELINES = """
 STIMULUS COLLECTIVE BRAND:
 - Industry: Premium experience tours in Basel
 - Target: Sophisticated travelers, locals seeking quality, corporate teams
@@ -168,108 +143,338 @@ DESIRED AESTHETIC:
 - Professional enough for corporate bookings
 """
 
-visual_result = visual_worker(
-    page_screenshot_description=visual_description,
-    brand_guidelines=brand_guidelines,
-    competitor_references=[
+# ============================================================================
+# 1. UX/UI DESIGNER ANALYSIS
+# ============================================================================
+
+UX_INPUTS = {
+    "page_type": "homepage",
+    "current_layout": CURRENT_HOMEPAGE_LAYOUT,
+    "user_behavior_data": "No data yet - new site launch",
+    "device_breakdown": "Estimated: mobile 60%, desktop 35%, tablet 5%",
+}
+
+
+def run_ux(mode: str = "chain"):
+    return UXDesignerWorker(STAGE_CACHE)(mode=mode, **UX_INPUTS)
+
+
+def ux_report(result) -> dict:
+    analysis, solutions, plan = result["analysis"], result["solutions"], result["action_plan"]
+    return {
+        "what_works": analysis.what_works,
+        "critical_issues": analysis.critical_issues,
+        "brand_misalignments": analysis.brand_misalignments,
+        "missed_opportunities": analysis.missed_opportunities,
+        "quick_wins": solutions.quick_wins,
+        "major_improvements": solutions.major_improvements,
+        "mobile_fixes": solutions.mobile_optimizations,
+        "accessibility_fixes": solutions.accessibility_fixes,
+        "do_now": plan.do_now,
+        "do_next": plan.do_next,
+        "do_later": plan.do_later,
+        "avoid": plan.avoid,
+        "priority_score": plan.priority_score,
+        "stages": result["stages"]
+    }
+
+
+def print_ux(report: dict):
+    print_list("🔍 CRITICAL ISSUES", report["critical_issues"])
+    print_list("❌ BRAND MISALIGNMENTS", report["brand_misalignments"])
+    print_list("💡 QUICK WINS", report["quick_wins"])
+    print_list("📱 MOBILE-SPECIFIC FIXES", report["mobile_fixes"])
+    print_list("♿ ACCESSIBILITY FIXES", report["accessibility_fixes"])
+    print_list("🎯 DO NOW", report["do_now"])
+    print(f"\n⚠️  PRIORITY SCORE: {report['priority_score']}/10")
+
+
+# ============================================================================
+# 2. VISUAL DESIGNER ANALYSIS
+# ============================================================================
+
+VISUAL_INPUTS = {
+    "page_screenshot_description": VISUAL_DESCRIPTION,
+    "brand_guidelines": BRAND_GUIDELINES,
+    "competitor_references": [
         "Airbnb Experiences - clean, photo-first, professional",
         "GetYourGuide - trustworthy, clear, European aesthetic",
         "Viator - simple, conversion-focused, credible"
-    ]
-)
+    ],
+}
 
-print("\n🔍 HIERARCHY ISSUES:")
-for i, issue in enumerate(visual_result.hierarchy_issues, 1):
-    print(f"{i}. {issue}")
 
-print("\n❌ BRAND DEVIATIONS:")
-for i, dev in enumerate(visual_result.brand_deviations, 1):
-    print(f"{i}. {dev}")
+def run_visual(mode: str = "chain"):
+    return VisualDesignerWorker(STAGE_CACHE)(mode=mode, **VISUAL_INPUTS)
+
+
+def visual_report(result) -> dict:
+    inventory, problems, recs = result["inventory"], result["problems"], result["recommendations"]
+    return {
+        "color_usage": inventory.color_usage,
+        "typography_breakdown": inventory.typography_breakdown,
+        "visual_weight_distribution": inventory.visual_weight_distribution,
+        "brand_alignment_score": inventory.brand_alignment_score,
+        "hierarchy_problems": problems.hierarchy_problems,
+        "color_issues": problems.color_issues,
+        "typography_improvements": problems.typography_improvements,
+        "spacing_refinements": problems.spacing_refinements,
+        "quick_css_fixes": recs.quick_css_fixes,
+        "major_redesign_ideas": recs.major_redesign_ideas,
+        "before_after": recs.before_after_mockup_descriptions,
+        "do_not_change": recs.do_not_change,
+        "stages": result["stages"]
+    }
 
-print("\n✨ DESIGN RECOMMENDATIONS:")
-for i, rec in enumerate(visual_result.design_recommendations, 1):
-    print(f"{i}. {rec}")
 
-print("\n🎨 COLOR IMPROVEMENTS:")
-for i, imp in enumerate(visual_result.color_improvements, 1):
-    print(f"{i}. {imp}")
+def print_visual(report: dict):
+    print(f"\n🎯 BRAND ALIGNMENT: {report['brand_alignment_score']}/10")
+    print_list("🔍 HIERARCHY PROBLEMS", report["hierarchy_problems"])
+    print_list("🎨 COLOR ISSUES", report["color_issues"])
+    print_list("📝 TYPOGRAPHY IMPROVEMENTS", report["typography_improvements"])
+    print_list("✨ QUICK CSS FIXES", report["quick_css_fixes"])
+    print_list("✅ DO NOT CHANGE", report["do_not_change"])
 
-print("\n📝 TYPOGRAPHY FIXES:")
-for i, fix in enumerate(visual_result.typography_fixes, 1):
-    print(f"{i}. {fix}")
 
 # ============================================================================
 # 3. TECH ARCHITECT ANALYSIS
 # ============================================================================
-print("\n" + "━" * 80)
-print("⚙️  TECH ARCHITECT ANALYSIS")
-print("━" * 80)
 
-tech_result = tech_worker(
-    page_url="http://100.118.170.68:4322",
-    current_stack="Astro 5.16.0, static build, dev server on Hetzner, port 4322",
-    lighthouse_report="Not run yet - in development",
-    bundle_analysis="Astro default - minimal JS, Web Fonts (Caveat + Inter from Google)"
-)
+TECH_INPUTS = {
+    "page_url": SITE_URL,
+    "current_stack": "Astro 5.16.0, static build, dev server on Hetzner, port 4322",
+    "lighthouse_report": "Not run yet - in development",
+    "bundle_analysis": "Astro default - minimal JS, Web Fonts (Caveat + Inter from Google)",
+}
 
-print("\n⚠️  PERFORMANCE ISSUES:")
-for i, issue in enumerate(tech_result.performance_issues, 1):
-    print(f"{i}. {issue}")
 
-print("\n🔧 CODE FIXES:")
-for i, fix in enumerate(tech_result.code_fixes, 1):
-    print(f"{i}. {fix}")
+def run_tech():
+    return TechArchitectWorker()(**TECH_INPUTS)
 
-print("\n🔍 SEO RECOMMENDATIONS:")
-for i, rec in enumerate(tech_result.seo_recommendations, 1):
-    print(f"{i}. {rec}")
 
-print("\n⚡ CORE WEB VITALS FIXES:")
-for metric, fix in tech_result.core_web_vitals_fixes.items():
-    print(f"  {metric}: {fix}")
+def tech_report(result) -> dict:
+    return {
+        "performance_issues": result.performance_issues,
+        "code_fixes": result.code_fixes,
+        "seo_recommendations": result.seo_recommendations,
+        "core_web_vitals_fixes": result.core_web_vitals_fixes,
+        "estimated_improvement": result.estimated_score_improvement
+    }
 
-print(f"\n📊 ESTIMATED SCORE IMPROVEMENT: {tech_result.estimated_score_improvement}")
 
-# ============================================================================
-# SAVE REPORT
-# ============================================================================
-print("\n" + "=" * 80)
-print("📄 SAVING FULL REPORT")
-print("=" * 80)
-
-report = {
-    "timestamp": datetime.now().isoformat(),
-    "site_url": "http://100.118.170.68:4322",
-    "ux_analysis": {
-        "issues_found": ux_result.issues_found,
-        "recommendations": ux_result.recommendations,
-        "mobile_fixes": ux_result.mobile_specific_fixes,
-        "accessibility_issues": ux_result.accessibility_issues,
-        "priority_score": ux_result.priority_score
-    },
-    "visual_analysis": {
-        "hierarchy_issues": visual_result.hierarchy_issues,
-        "brand_deviations": visual_result.brand_deviations,
-        "design_recommendations": visual_result.design_recommendations,
-        "color_improvements": visual_result.color_improvements,
-        "typography_fixes": visual_result.typography_fixes
-    },
-    "tech_analysis": {
-        "performance_issues": tech_result.performance_issues,
-        "code_fixes": tech_result.code_fixes,
-        "seo_recommendations": tech_result.seo_recommendations,
-        "core_web_vitals_fixes": tech_result.core_web_vitals_fixes,
-        "estimated_improvement": tech_result.estimated_score_improvement
+def print_tech(report: dict):
+    print_list("⚠️  PERFORMANCE ISSUES", report["performance_issues"])
+    print_list("🔧 CODE FIXES", report["code_fixes"])
+    print_list("🔍 SEO RECOMMENDATIONS", report["seo_recommendations"])
+    print("\n⚡ CORE WEB VITALS FIXES:")
+    for metric, fix in (report["core_web_vitals_fixes"] or {}).items():
+        print(f"  {metric}: {fix}")
+    print(f"\n📊 ESTIMATED SCORE IMPROVEMENT: {report['estimated_improvement']}")
+
+
+SECTION_NAMES = ("ux", "visual", "tech")
+
+
+def section_fingerprint(name: str, worker, inputs: dict, mode: Optional[str] = None) -> str:
+    """Everything a section's report depends on: inputs, every prompt the worker has, mode, model."""
+    prompts = [signature_hash(predictor.signature) for _, predictor in worker.named_predictors()]
+    return make_key("audit", name, mode, DSPY_LM_MODEL, prompts, inputs)
+
+
+def build_sections(mode: str = "chain") -> dict:
+    """Audit sections by name; `mode` picks chain or fast for the UX and visual workers."""
+    return {
+        "ux": AuditSection("ux_analysis", "🎨 UX/UI DESIGNER ANALYSIS",
+                           partial(run_ux, mode), ux_report, print_ux,
+                           section_fingerprint("ux", UXDesignerWorker(STAGE_CACHE), UX_INPUTS, mode)),
+        "visual": AuditSection("visual_analysis", "👁️  VISUAL DESIGNER ANALYSIS",
+                               partial(run_visual, mode), visual_report, print_visual,
+                               section_fingerprint("visual", VisualDesignerWorker(STAGE_CACHE), VISUAL_INPUTS, mode)),
+        "tech": AuditSection("tech_analysis", "⚙️  TECH ARCHITECT ANALYSIS",
+                             run_tech, tech_report, print_tech,
+                             section_fingerprint("tech", TechArchitectWorker(), TECH_INPUTS)),
     }
-}
 
-with open("site_analysis_report.json", "w") as f:
-    json.dump(report, f, indent=2)
 
-print("\n✅ Report saved to: site_analysis_report.json")
-print("\n🎯 NEXT STEPS:")
-print("1. Review UX recommendations (Priority: {}/10)".format(ux_result.priority_score))
-print("2. Implement visual simplifications (remove craft elements)")
-print("3. Apply performance optimizations")
-print("4. Re-run analysis after changes")
-print("\n" + "=" * 80)
+def print_list(title: str, items):
+    print(f"\n{title}:")
+    for i, item in enumerate(items or [], 1):
+        print(f"{i}. {item}")
+
+
+def print_section(result):
+    print("\n" + "━" * 80)
+    if result.reused_from:
+        print(f"{result.section.title}  (from run {result.reused_from})")
+    else:
+        print(f"{result.section.title}  ({result.seconds:.1f}s)")
+    print("━" * 80)
+    if result.ok:
+        result.section.render(result.report)
+        if "stages" in result.report and not result.reused_from:
+            print(f"\n♻️  STAGES: {summarize_stages(result.report['stages'])}")
+    else:
+        print(f"\n❌ Section failed: {type(result.error).__name__}: {result.error}")
+
+
+def audit(section_names=SECTION_NAMES, mode: str = "chain", parallelism: int = AUDIT_PARALLELISM,
+          on_complete=None, resume: Optional[str] = None, reuse: bool = True,
+          log_dir: Path = AUDIT_LOG_DIR) -> dict:
+    """Run the named sections and return the report (DSPy must be configured).
+
+    Each section is logged as it completes (see module docstring).
+    `resume` continues an unfinished run ("latest" or a run id) in its
+    original sections and mode, re-running only what it hasn't completed.
+    With `reuse`, sections unchanged since the last finished run are taken
+    from it. Failed sections are listed under "failed_sections" instead of
+    raising; the run then stays unfinished, so it can be resumed.
+    """
+    if resume:
+        log = latest_run(log_dir, finished=False) if resume == "latest" else find_run(log_dir, resume)
+        if log is None:
+            raise LookupError(f"No unfinished audit run in {log_dir}")
+        if log.finished:
+            raise ValueError(f"Audit run {log.run_id} already finished")
+        section_names, mode = log.meta["sections"], log.meta["mode"]
+        logged = log.sections()
+        print(f"⏯️  Resuming audit run {log.run_id} ({len(logged)} sections done)")
+    else:
+        log = AuditLog.create(log_dir, site_url=SITE_URL, mode=mode, sections=list(section_names))
+        logged = {}
+    previous = latest_run(log_dir, finished=True, exclude=log.run_id)
+    earlier = previous.sections() if previous is not None and reuse else {}
+
+    def record(result: SectionResult):
+        if result.ok:
+            log.append({"event": "section", "name": result.section.name, "fingerprint": result.section.fingerprint,
+                        "seconds": round(result.seconds, 2), "report": result.report})
+        else:
+            log.append({"event": "failed", "name": result.section.name,
+                        "error": f"{type(result.error).__name__}: {result.error}"})
+        if on_complete is not None:
+            on_complete(result)
+
+    sections = build_sections(mode)
+    todo = []
+    for name in section_names:
+        section = sections[name]
+        entry = logged.get(section.name)
+        if entry is None or entry["fingerprint"] != section.fingerprint:
+            entry = earlier.get(section.name)
+            if entry is None or entry["fingerprint"] != section.fingerprint:
+                todo.append(section)
+                continue
+            # Copied into this run's log, so the run stands on its own
+            entry = {**entry, "reused_from": entry.get("reused_from") or previous.run_id}
+            log.append(entry)
+        if on_complete is not None:
+            on_complete(SectionResult(section, entry["report"], reused_from=entry.get("reused_from") or log.run_id))
+
+    results = run_audit(todo, parallelism=parallelism, on_complete=record)
+    if all(result.ok for result in results.values()):
+        log.append({"event": "finish", "timestamp": datetime.now().isoformat()})
+
+    report = log.report()
+    if previous is not None:
+        report["changes"] = {"since": previous.run_id, "sections": diff_reports(previous.report(), report)}
+    return report
+
+
+def print_changes(changes: dict):
+    """Summary of `diff_reports` output: counts per section, then the new and resolved issues."""
+    print(f"\n🔀 CHANGES SINCE RUN {changes['since']}:")
+    for name, counts in count_changes(changes["sections"]).items():
+        print(f"  {name}: {counts['new']} new, {counts['resolved']} resolved, {counts['persisting']} persisting")
+    for name, fields in changes["sections"].items():
+        for field, diff in fields.items():
+            if "old" in diff:
+                print(f"  {name}.{field}: {diff['old']} → {diff['new']}")
+                continue
+            for item in diff["new"]:
+                print(f"  + {name}.{field}: {item}")
+            for item in diff["resolved"]:
+                print(f"  - {name}.{field}: {item}")
+
+
+def diff_runs(run_ids, log_dir: Path = AUDIT_LOG_DIR):
+    """Print the changes between two logged runs (default: the last two finished)."""
+    if run_ids:
+        if len(run_ids) != 2:
+            raise SystemExit("--diff takes two run ids (or none for the last two finished runs)")
+        old, new = (find_run(log_dir, run_id) for run_id in run_ids)
+    else:
+        finished = [log for log in list_runs(log_dir) if log.finished]
+        if len(finished) < 2:
+            raise SystemExit(f"Need two finished audit runs in {log_dir} to diff")
+        old, new = finished[-2:]
+    print(f"Comparing audit run {old.run_id} → {new.run_id}")
+    print_changes({"since": old.run_id, "sections": diff_reports(old.report(), new.report())})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI design audit of the Stimulus Collective site")
+    parser.add_argument("--parallel", type=int, default=AUDIT_PARALLELISM,
+                        help="How many workers run at once")
+    parser.add_argument("--sections", nargs="*", choices=SECTION_NAMES, default=list(SECTION_NAMES),
+                        help="Which sections to run")
+    parser.add_argument("--mode", choices=MODES, default="chain",
+                        help="chain: three reasoning steps per worker; fast: one fused call")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Recompute every stage instead of reusing cached steps or earlier runs")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="Finish an unfinished run (default: the latest one)")
+    parser.add_argument("--diff", nargs="*", metavar="RUN_ID",
+                        help="Show changes between two logged runs (default: the last two finished) and exit")
+    args = parser.parse_args()
+    if args.diff is not None:
+        diff_runs(args.diff)
+        return
+    STAGE_CACHE.refresh = args.refresh
+
+    # Configure DSPy
+    print(f"📡 Connecting to {DSPY_LM_MODEL}...")
+    configure_lm(DSPY_LM_MODEL)
+    print("✅ DSPy configured\n")
+
+    print("=" * 80)
+    print("STIMULUS COLLECTIVE - AI DESIGN AUDIT")
+    print("=" * 80)
+    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Analyzing: {SITE_URL}")
+    print(f"Sections: {', '.join(args.sections)} ({args.parallel} in parallel, {args.mode} mode)")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    report = audit(args.sections, mode=args.mode, parallelism=args.parallel, on_complete=print_section,
+                   resume=args.resume, reuse=not args.refresh)
+    elapsed = time.perf_counter() - started
+
+    # ============================================================================
+    # SAVE REPORT
+    # ============================================================================
+    print("\n" + "=" * 80)
+    print(f"📄 SAVING FULL REPORT (audit took {elapsed:.1f}s)")
+    print("=" * 80)
+
+    AUDIT_REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(AUDIT_REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    print(f"\n✅ Report saved to: {AUDIT_REPORT_PATH}")
+    print(f"📜 Run log: {AUDIT_LOG_DIR / report['run_id']}.jsonl")
+    if "changes" in report:
+        print_changes(report["changes"])
+    if report.get("failed_sections"):
+        print(f"⚠️  Failed sections: {', '.join(report['failed_sections'])} "
+              f"(re-run the rest with: python analyze_site.py --resume {report['run_id']})")
+    print("\n🎯 NEXT STEPS:")
+    priority = report.get("ux_analysis", {}).get("priority_score", "?")
+    print("1. Review UX recommendations (Priority: {}/10)".format(priority))
+    print("2. Implement visual simplifications (remove craft elements)")
+    print("3. Apply performance optimizations")
+    print("4. Re-run analysis after changes")
+    print("\n" + "=" * 80)
+
+
+if __name__ == "__main__":
+    main()
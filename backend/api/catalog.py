@@ -0,0 +1,59 @@
+"""
+Experience Catalog - indexed, read-only view of data/experiences.json
+
+Builds the slug and category indexes and the list/page projections once at
+load time, serialized and precompressed as StaticPayloads, so the catalog
+endpoints are a dict lookup no matter how many experiences there are.
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+from .http_cache import StaticPayload
+
+# Fields returned by /api/experiences
+LIST_FIELDS = ("slug", "title", "price", "category", "duration", "hero_image")
+
+# Fields returned per experience by /api/pages/experiences
+PAGE_FIELDS = ("slug", "title", "price", "duration", "hero_image", "group_size", "location")
+
+
+def project(exp: dict, fields) -> dict:
+    return {field: exp[field] for field in fields}
+
+
+class ExperienceCatalog:
+    """Experiences indexed by slug and category, with prebuilt responses."""
+
+    def __init__(self, experiences: List[dict], page_header: Optional[dict] = None,
+                 max_age: int = 300):
+        self.experiences = list(experiences)
+        self.by_slug: Dict[str, dict] = {exp["slug"]: exp for exp in self.experiences}
+
+        self.by_category: Dict[str, List[dict]] = {}
+        for exp in self.experiences:
+            self.by_category.setdefault(exp["category"], []).append(exp)
+
+        self.list_projection = [project(exp, LIST_FIELDS) for exp in self.experiences]
+        self.summary_by_slug = {item["slug"]: item for item in self.list_projection}
+        self.category_projection = {
+            category: [project(exp, PAGE_FIELDS) for exp in exps]
+            for category, exps in self.by_category.items()
+        }
+        self.page_projection = {
+            **(page_header or {}),
+            "categories": self.category_projection,
+            "total_experiences": len(self.experiences),
+        }
+
+        # Pre-serialized, precompressed response bodies with ETags
+        self.list_payload = StaticPayload.from_obj(self.list_projection, max_age=max_age)
+        self.page_payload = StaticPayload.from_obj(self.page_projection, max_age=max_age)
+
+    def get(self, slug: str) -> Optional[dict]:
+        return self.by_slug.get(slug)
+
+    def __len__(self) -> int:
+        return len(self.experiences)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.experiences)
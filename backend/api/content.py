@@ -0,0 +1,367 @@
+"""
+Content Service - cached, coalesced access to copywriter output
+
+Sits between the API routes and ExperienceCopywriter: serves cache hits
+directly and funnels misses through a single-flight so concurrent requests
+for the same experience share one async LM call.
+
+Entries older than the TTL are served stale-while-revalidate: the last good
+content goes out immediately and a background task regenerates it. A failed
+regeneration is logged and the previous content keeps being served.
+
+Other languages are derived from the base content by ExperienceLocalizer,
+all of an experience's languages in one call, and cached per language
+against the base content they came from. A language the localizer fails on
+or leaves out is not retried for `retry_after_failure`; the next attempt
+asks only for the languages still missing.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from config import BASE_LANGUAGE
+from workers.cache import ContentCache, make_key
+from workers.telemetry import record_content_request, record_generation_error
+from workers.copywriter import (
+    ExperienceCopywriter, STREAMED_FIELDS, content_key, copywriter_inputs, program_fingerprint,
+)
+from workers.localizer import ExperienceLocalizer, localized_key, target_languages
+
+from .singleflight import SingleFlight
+
+
+class ContentService:
+    """Serve AI-generated experience content from cache or a shared generation."""
+
+    def __init__(self, copywriter: ExperienceCopywriter, cache: ContentCache, model: str,
+                 ttl_seconds: float = 7 * 24 * 3600, retry_after_failure: float = 60,
+                 refresh_min_age: float = 300,
+                 localizer: Optional[ExperienceLocalizer] = None,
+                 localization_model: Optional[str] = None):
+        self.copywriter = copywriter
+        self.localizer = localizer
+        self.localization_model = localization_model or model
+        self.cache = cache
+        self.model = model
+        # Content from another compiled program (or none) is regenerated like after a prompt change
+        self.program = program_fingerprint(copywriter)
+        self.ttl_seconds = ttl_seconds
+        self.retry_after_failure = retry_after_failure
+        self.refresh_min_age = refresh_min_age
+        self.flight = SingleFlight()
+        self.failures: Dict[str, Tuple[float, str]] = {}
+        self.localization_failures: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self.listeners = []
+        self._background = set()
+
+    def subscribe(self, listener: Callable[[str, dict], None]):
+        """Call `listener(slug, entry)` whenever a slug gets new content."""
+        self.listeners.append(listener)
+
+    def _notify(self, slug: str, entry: dict):
+        for listener in self.listeners:
+            try:
+                listener(slug, entry)
+            except Exception as e:
+                print(f"⚠️  Content listener failed for {slug}: {e}")
+
+    def key_for(self, exp: dict) -> str:
+        return content_key(copywriter_inputs(exp), self.model, self.program)
+
+    @staticmethod
+    def latest_key(slug: str) -> str:
+        """Key of the last good content for a slug, whatever inputs produced it."""
+        return make_key("latest", slug)
+
+    def latest(self, slug: str) -> Optional[dict]:
+        """Last good content entry for a slug (possibly stale), or None."""
+        return self.cache.get(self.latest_key(slug))
+
+    async def get(self, exp: dict) -> Tuple[dict, str]:
+        """Return `(entry, status)` for `exp`.
+
+        status is "fresh" (within TTL), "stale" (served while a background
+        regeneration runs) or "miss" (generated during this request).
+        """
+        key = self.key_for(exp)
+        entry, status = self._cached(exp, key)
+        if entry is not None:
+            record_content_request(status)
+            return entry, status
+
+        record_content_request("miss")
+        entry = await self.flight.do(key, lambda: self._generate(exp, key))
+        return entry, "miss"
+
+    async def get_localized(self, exp: dict, lang: str) -> Tuple[dict, str]:
+        """Like `get`, in language `lang` (a code from the experience's `languages`).
+
+        The localized entry follows the base content: it is "stale" while the
+        base is, and regenerating the base content invalidates it. On a miss
+        every uncached language of the experience is localized in one call.
+        """
+        lang = lang.upper()
+        entry, status = await self.get(exp)
+        if lang == BASE_LANGUAGE:
+            return entry, status
+        if self.localizer is None:
+            raise LookupError("Localization is not configured")
+
+        base_key = self.base_key(entry)
+        localized = self.cache.get(localized_key(base_key, lang, self.localization_model))
+        if localized is not None:
+            return localized, status
+        failed = self.localization_failed(exp["slug"], lang)
+        if failed:
+            raise LookupError(f"Localization into {lang} failed recently: {failed}")
+
+        entries = await self.flight.do(
+            make_key("localize", base_key), lambda: self._localize(exp, entry, base_key)
+        )
+        if lang not in entries:
+            failed = self.localization_failures.get((exp["slug"], lang), (None, "not attempted"))
+            raise LookupError(f"Localization into {lang} failed: {failed[1]}")
+        return entries[lang], "miss"
+
+    def localization_failed(self, slug: str, lang: str) -> Optional[str]:
+        """Error of a localization into `lang` within the last `retry_after_failure`, or None."""
+        failed = self.localization_failures.get((slug, lang.upper()))
+        if failed and time.time() - failed[0] < self.retry_after_failure:
+            return failed[1]
+        return None
+
+    @staticmethod
+    def base_key(entry: dict) -> str:
+        """Content key an entry was generated under (the latest alias records it separately)."""
+        return entry.get("content_key") or entry["key"]
+
+    async def _localize(self, exp: dict, base: dict, base_key: str) -> Dict[str, dict]:
+        """Localize the languages neither cached nor recently failed; record the failures."""
+        slug = exp["slug"]
+        languages = [
+            lang for lang in target_languages(exp)
+            if self.cache.get(localized_key(base_key, lang, self.localization_model)) is None
+            and not self.localization_failed(slug, lang)
+        ]
+        if not languages:
+            return {}
+        print(f"🌍 Localizing {exp['title']} into {', '.join(languages)}")
+        try:
+            localized = await self.localizer.acall(content=base["content"], languages=languages)
+        except Exception as e:
+            record_generation_error("localizer", e)
+            failed_at = time.time()
+            for lang in languages:
+                self.localization_failures[(slug, lang)] = (failed_at, f"{type(e).__name__}: {e}")
+            raise
+        failed_at = time.time()
+        for lang in languages:
+            if lang not in localized:
+                self.localization_failures[(slug, lang)] = (failed_at, "missing from the localizer output")
+        return self.store_localized(slug, base_key, base["generated_at"], localized)
+
+    def store_localized(self, slug: str, base_key: str, generated_at: float,
+                        localized: Dict[str, dict]) -> Dict[str, dict]:
+        """Cache each language's content; it shares the base content's age."""
+        for lang in localized:
+            self.localization_failures.pop((slug, lang), None)
+        return {
+            lang: self.cache.set(localized_key(base_key, lang, self.localization_model), content,
+                                 generated_at=generated_at, slug=slug, lang=lang, content_key=base_key)
+            for lang, content in localized.items()
+        }
+
+    def _cached(self, exp: dict, key: str) -> Tuple[dict, str]:
+        """Cached `(entry, status)` for `exp`, or `(None, "miss")`."""
+        entry = self.cache.get(key)
+        if entry is not None and self.is_fresh(entry):
+            return entry, "fresh"
+
+        # Expired, or inputs/prompt changed since the last generation:
+        # serve the last good content and refresh it in the background
+        if entry is None:
+            entry = self.latest(exp["slug"])
+        if entry is not None:
+            self.revalidate(exp, key)
+            return entry, "stale"
+        return None, "miss"
+
+    def seed(self, items: Dict[str, dict]) -> int:
+        """Load pregenerated content (see pregenerate.py) into the cache.
+
+        Returns how many entries were new. Items whose key no longer matches
+        the current inputs/prompt still become the slug's last good content,
+        so they are served stale until regenerated. Localized versions are
+        loaded when they were made with the current localization model.
+        """
+        loaded = 0
+        for slug, item in items.items():
+            if item["key"] not in self.cache:
+                self.cache.set(item["key"], item["content"],
+                               generated_at=item["generated_at"], slug=slug)
+                loaded += 1
+            latest = self.latest(slug)
+            if latest is None or latest["generated_at"] < item["generated_at"]:
+                latest = self.cache.set(self.latest_key(slug), item["content"],
+                                        generated_at=item["generated_at"], slug=slug,
+                                        content_key=item["key"])
+                self._notify(slug, latest)
+            if item.get("localized") and item.get("localization_model") == self.localization_model:
+                self.store_localized(slug, item["key"], item["generated_at"], item["localized"])
+        return loaded
+
+    def is_fresh(self, entry: dict) -> bool:
+        return self.age(entry) < self.ttl_seconds
+
+    @staticmethod
+    def age(entry: dict) -> float:
+        return max(0.0, time.time() - entry["generated_at"])
+
+    def revalidate(self, exp: dict, key: str):
+        """Schedule a background regeneration unless one is running or just failed."""
+        if self.flight.in_flight(key):
+            return
+        failed = self.failures.get(exp["slug"])
+        if failed and time.time() - failed[0] < self.retry_after_failure:
+            return
+
+        task = asyncio.ensure_future(self.flight.do(key, lambda: self._generate(exp, key)))
+        self._background.add(task)
+        task.add_done_callback(lambda t: self._revalidated(exp, t))
+
+    def _revalidated(self, exp: dict, task: asyncio.Task):
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            print(f"⚠️  Regeneration failed for {exp['slug']}, keeping last good content: {error}")
+
+    async def stream(self, exp: dict, refresh: bool = False):
+        """Stream content for `exp` as `(event, data)` pairs.
+
+        Yields "tagline" and "description" text chunks while the LM writes
+        them, then "highlights" and "stimulus_scores", then
+        `("done", (entry, status))`. Cached content (fresh or stale) is
+        replayed at once unless `refresh` forces a new generation. If a
+        generation for the same content is already running, the stream joins
+        it and emits its result when it lands.
+
+        `refresh` is ignored while the content is younger than
+        `refresh_min_age` or the last generation just failed, so it costs at
+        most one LM call per slug per window.
+        """
+        key = self.key_for(exp)
+        if refresh and not self.flight.in_flight(key) and self._refresh_throttled(exp, key):
+            refresh = False
+        if not refresh:
+            entry, status = self._cached(exp, key)
+            if entry is not None:
+                record_content_request(status)
+                for event in self._content_events(entry["content"]):
+                    yield event
+                yield "done", (entry, status)
+                return
+
+        record_content_request("miss")
+        chunks = asyncio.Queue()
+        task = asyncio.ensure_future(
+            self.flight.do(key, lambda: self._generate_streaming(exp, key, chunks))
+        )
+        streamed = set()
+        try:
+            while True:
+                next_chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({next_chunk, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_chunk.done():
+                    next_chunk.cancel()
+                    break
+                field, chunk = next_chunk.result()
+                streamed.add(field)
+                yield field, chunk
+            while not chunks.empty():
+                field, chunk = chunks.get_nowait()
+                streamed.add(field)
+                yield field, chunk
+        finally:
+            if not task.done():
+                task.cancel()
+
+        entry = task.result()
+        for event in self._content_events(entry["content"], skip=streamed):
+            yield event
+        yield "done", (entry, "miss")
+
+    def _refresh_throttled(self, exp: dict, key: str) -> bool:
+        entry = self.cache.get(key)
+        if entry is not None and self.age(entry) < self.refresh_min_age:
+            return True
+        failed = self.failures.get(exp["slug"])
+        return bool(failed) and time.time() - failed[0] < self.retry_after_failure
+
+    @staticmethod
+    def _content_events(content: dict, skip=()):
+        """Events for already-generated content (text fields as a single chunk)."""
+        for field in (*STREAMED_FIELDS, "highlights", "stimulus_scores"):
+            if field not in skip:
+                yield field, content[field]
+
+    async def _generate_streaming(self, exp: dict, key: str, chunks: asyncio.Queue) -> dict:
+        print(f"📝 Streaming AI content for: {exp['title']}")
+        content = None
+        try:
+            async for field, chunk in self.copywriter.stream(**copywriter_inputs(exp)):
+                if field == "done":
+                    content = chunk
+                else:
+                    chunks.put_nowait((field, chunk))
+            if content is None:
+                raise RuntimeError("Stream ended without a final prediction")
+        except Exception as e:
+            record_generation_error("copywriter", e)
+            self.failures[exp["slug"]] = (time.time(), f"{type(e).__name__}: {e}")
+            raise
+        return self.store(exp, key, content)
+
+    async def _generate(self, exp: dict, key: str) -> dict:
+        print(f"📝 Generating AI content for: {exp['title']}")
+        try:
+            content = await self.copywriter.acall(**copywriter_inputs(exp))
+        except Exception as e:
+            record_generation_error("copywriter", e)
+            self.failures[exp["slug"]] = (time.time(), f"{type(e).__name__}: {e}")
+            raise
+        return self.store(exp, key, content)
+
+    def store(self, exp: dict, key: str, content: dict) -> dict:
+        """Cache fresh content under its key and as the slug's last good content.
+
+        Also used for content generated elsewhere (background jobs).
+        """
+        entry = self.cache.set(key, content, slug=exp["slug"])
+        latest = self.cache.set(self.latest_key(exp["slug"]), content,
+                                generated_at=entry["generated_at"], slug=exp["slug"], content_key=key)
+        self.failures.pop(exp["slug"], None)
+        print(f"✅ AI content generated for: {exp['title']}")
+        self._notify(exp["slug"], latest)
+        return entry
+
+    def freshness_headers(self, entry: dict, status: str, slug: str) -> Dict[str, str]:
+        """Per-slug freshness metadata for the response."""
+        generated_at = entry["generated_at"]
+        headers = {
+            "X-Content-Status": status,
+            "X-Content-Generated-At": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(generated_at)),
+            "X-Content-Age": str(int(self.age(entry))),
+            "X-Content-TTL": str(int(self.ttl_seconds)),
+            "X-Content-Expires-At": time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime(generated_at + self.ttl_seconds)
+            ),
+        }
+        failed = self.failures.get(slug)
+        if failed:
+            # Header values must be single-line latin-1
+            message = " ".join(failed[1].split())[:200]
+            headers["X-Content-Last-Error"] = message.encode("ascii", "replace").decode()
+        return headers
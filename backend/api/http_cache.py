@@ -0,0 +1,112 @@
+"""
+HTTP caching for read-only responses
+
+Static bodies are serialized once, precompressed (gzip, plus brotli when the
+`brotli` package is installed) and given a strong ETag per encoding, so
+repeat requests cost a header comparison and a 304.
+"""
+
+import gzip
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json fallback
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+def dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class DefaultResponse(Response):
+    """JSON response serialized with `dumps` (FastAPI's ORJSONResponse is deprecated)."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def accepted_encodings(header: str) -> dict:
+    """Parse Accept-Encoding into {encoding: q}."""
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+
+class StaticPayload:
+    """A response body that never changes for the lifetime of the process."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json", max_age: int = 300):
+        self.media_type = media_type
+        self.cache_control = f"public, max-age={max_age}"
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        # Each representation gets its own strong validator
+        self.variants = {"identity": (body, f'"{digest}"')}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"')
+            if brotli is not None:
+                self.variants["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+
+    @classmethod
+    def from_obj(cls, obj, **kwargs) -> "StaticPayload":
+        return cls(dumps(obj), **kwargs)
+
+    @property
+    def body(self) -> bytes:
+        return self.variants["identity"][0]
+
+    def negotiate(self, accept_encoding: str) -> str:
+        """Pick the smallest variant the client accepts."""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        """Serve the payload, honouring If-None-Match and Accept-Encoding."""
+        encoding = self.negotiate(request.headers.get("accept-encoding", ""))
+        body, etag = self.variants[encoding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
@@ -0,0 +1,257 @@
+"""
+Job Queue - background generation and audit jobs on a worker-process pool
+
+LM-bound work submitted here runs in separate processes (api/tasks.py), so
+however slow the model is, the API process only holds a queue entry and a
+future, never a connection or a thread per job.
+
+- Priorities: "high" jobs leave the queue before "normal" before "low";
+  FIFO within a priority.
+- Dedup: submitting a job identical (same kind and params) to one that is
+  still queued or running returns the existing job instead; a higher
+  priority on the duplicate promotes the queued job.
+- Results of finished jobs are kept for JOB_RESULT_TTL_SECONDS.
+- A worker process that dies (e.g. OOM) fails its jobs, and the pool is
+  rebuilt for the next ones.
+"""
+
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from workers.cache import make_key
+from workers.telemetry import record_job
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+PENDING = ("queued", "running")
+
+# Finished jobs kept at most, whatever their age
+MAX_FINISHED = 1000
+
+
+class Job:
+    """One queued/running/finished job. `params` are the task's keyword arguments."""
+
+    def __init__(self, kind: str, params: dict, priority: str, key: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.priority = priority
+        self.key = key
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result = None
+        self.error: Optional[str] = None
+        self.listeners: List[Callable[["Job"], None]] = []
+
+    @property
+    def done(self) -> bool:
+        return self.status not in PENDING
+
+    def to_dict(self) -> dict:
+        """Status metadata (without the result)."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Priority queue of jobs executed by a process pool.
+
+    Args:
+        tasks: kind -> picklable module-level function taking the job params
+        workers: Worker processes (and so jobs running at once)
+        initializer: Runs once in each worker process (e.g. configure DSPy)
+        initargs: Arguments for `initializer`
+        result_ttl: Seconds a finished job (and its result) stays available
+    """
+
+    def __init__(self, tasks: Dict[str, Callable], workers: int = 2,
+                 initializer: Optional[Callable] = None, initargs: tuple = (),
+                 result_ttl: float = 3600):
+        self.tasks = tasks
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.result_ttl = result_ttl
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.pending: Dict[str, Job] = {}
+        self.deduplicated = 0
+        self._heap: List[Tuple[int, int, str]] = []
+        self._order = itertools.count()
+        self._running = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: the API process has threads (and DSPy state) a fork would copy mid-flight
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        return self._pool
+
+    def submit(self, kind: str, params: dict, priority: str = "normal",
+               on_done: Optional[Callable[[Job], None]] = None) -> Tuple[Job, bool]:
+        """Queue a job; returns `(job, created)`.
+
+        `created` is False when an identical job was already queued or
+        running; that job is returned (and promoted if `priority` is higher).
+        `on_done(job)` is called in the event loop once a newly created job
+        finishes; a duplicate's is dropped, since the job already has the
+        first submitter's. Must be called from the event loop.
+        """
+        if kind not in self.tasks:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (use {', '.join(PRIORITIES)})")
+        self._prune()
+
+        key = make_key("job", kind, params)
+        job = self.pending.get(key)
+        created = job is None
+        if job is None:
+            job = Job(kind, params, priority, key)
+            self.jobs[job.id] = job
+            self.pending[key] = job
+            self._push(job)
+        else:
+            self.deduplicated += 1
+            record_job(kind, "deduplicated")
+            if job.status == "queued" and PRIORITIES[priority] < PRIORITIES[job.priority]:
+                job.priority = priority
+                self._push(job)  # the old heap entry is skipped when popped
+        if created and on_done is not None:
+            job.listeners.append(on_done)
+        self._dispatch()
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def position(self, job: Job) -> Optional[int]:
+        """Jobs ahead of a queued `job` (0 = next to run), None once it left the queue."""
+        if job.status != "queued":
+            return None
+        rank = (PRIORITIES[job.priority], job.created_at)
+        return sum(
+            1 for other in self.pending.values()
+            if other.status == "queued" and other is not job
+            and (PRIORITIES[other.priority], other.created_at) < rank
+        )
+
+    def stats(self) -> dict:
+        statuses = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "jobs": statuses,
+            "deduplicated": self.deduplicated,
+        }
+
+    def shutdown(self):
+        """Cancel queued work and stop the worker processes (running jobs are abandoned)."""
+        self._closed = True
+        for task in list(self._running):
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # -- scheduling -----------------------------------------------------------
+
+    def _push(self, job: Job):
+        heapq.heappush(self._heap, (PRIORITIES[job.priority], next(self._order), job.id))
+
+    def _pop(self) -> Optional[Job]:
+        while self._heap:
+            rank, _, job_id = heapq.heappop(self._heap)
+            job = self.jobs.get(job_id)
+            # Skip entries for jobs since promoted (re-pushed) or pruned
+            if job is not None and job.status == "queued" and rank == PRIORITIES[job.priority]:
+                return job
+        return None
+
+    def _dispatch(self):
+        while not self._closed and len(self._running) < self.workers:
+            job = self._pop()
+            if job is None:
+                return
+            task = asyncio.ensure_future(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self._running.discard(task)
+        self._dispatch()
+
+    async def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = time.time()
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        try:
+            job.result = await loop.run_in_executor(pool, _call, self.tasks[job.kind], job.params)
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Cancelled (shutting down)"
+            raise
+        except BrokenProcessPool as e:
+            # A worker died; every job on this pool fails, the next ones get a new pool
+            job.status = "failed"
+            job.error = f"Worker process died: {e}"
+            if self._pool is pool:
+                self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = time.time()
+            self.pending.pop(job.key, None)
+            record_job(job.kind, job.status, job.finished_at - job.started_at)
+            if job.status == "failed":
+                print(f"❌ Job {job.kind} {job.id} failed: {job.error}")
+            for listener in job.listeners:
+                try:
+                    listener(job)
+                except Exception as e:
+                    print(f"⚠️  Job listener failed for {job.id}: {e}")
+            job.listeners.clear()
+
+    def _prune(self):
+        """Forget finished jobs past their TTL (or beyond MAX_FINISHED)."""
+        cutoff = time.time() - self.result_ttl
+        finished = [job for job in self.jobs.values() if job.done]
+        excess = len(finished) - MAX_FINISHED
+        for i, job in enumerate(finished):
+            if i < excess or job.finished_at < cutoff:
+                del self.jobs[job.id]
+
+
+def _call(fn: Callable, params: dict):
+    """Runs in the worker process."""
+    return fn(**params)
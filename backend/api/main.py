@@ -1,19 +1,39 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
 import json
-import dspy
+import time
 from pathlib import Path
+from typing import List, Optional
 
-# Import workers
+# Import workers (DSPy itself is only imported by the background startup)
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from workers.copywriter import ExperienceCopywriter
-from config import GROQ_API_KEY, DSPY_LM_MODEL
+from workers.telemetry import METRICS_CONTENT_TYPE, record_http_request, render_metrics
+from api.http_cache import DefaultResponse, StaticPayload
+from api.jobs import PRIORITIES, Job
+from api.repository import ExperienceQuery
+from api.runtime import RETRY_AFTER_SECONDS, NotReady, Runtime
+from api.similarity import METRICS, SENSES, parse_weights
+from config import DSPY_LM_MODEL, BASE_LANGUAGE, BULK_GENERATION_CONCURRENCY, CATALOG_CACHE_MAX_AGE
+
+# Repository, LM, copywriter and caches are built in the background (see api/runtime.py)
+runtime = Runtime()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    runtime.start()
+    yield
+    await runtime.stop()
 
 app = FastAPI(
     title="Stimulus Collective API",
     description="AI-powered experience content generation",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan,
 )
 
 # CORS for local development
@@ -25,25 +45,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure DSPy with Groq
-try:
-    lm = dspy.LM(DSPY_LM_MODEL, api_key=GROQ_API_KEY)
-    dspy.configure(lm=lm)
-    print(f"✅ DSPy configured with {DSPY_LM_MODEL}")
-except Exception as e:
-    print(f"❌ Error configuring DSPy: {e}")
-    raise
+@app.middleware("http")
+async def record_route_latency(request: Request, call_next):
+    """Per-route latency histogram (labelled by route template, not raw path)."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        record_http_request(request.method, getattr(route, "path", "unmatched"),
+                            status, time.perf_counter() - started)
 
-# Load experiences data
-data_path = Path(__file__).parent.parent / "data" / "experiences.json"
-with open(data_path) as f:
-    EXPERIENCES = json.load(f)
+@app.exception_handler(NotReady)
+async def not_ready(request: Request, exc: NotReady):
+    """503 while (or because) the startup phase a route depends on isn't done."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "phase": exc.phase},
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
 
-print(f"✅ Loaded {len(EXPERIENCES)} experiences")
+def require_content(slug: str):
+    """Content service for `slug`; during warmup, only if it has content to serve.
 
-# Initialize AI worker
-copywriter = ExperienceCopywriter()
-print("✅ AI Copywriter initialized")
+    Generating during warmup would pay for content the pregenerated artifact
+    may be about to provide, so misses wait for readiness instead.
+    """
+    content_service = runtime.require("content_service")
+    if not runtime.ready and content_service.latest(slug) is None:
+        raise NotReady("content_service", runtime.phase, runtime.error)
+    return content_service
 
 @app.get("/")
 def health():
@@ -52,129 +86,437 @@ def health():
         "status": "ok",
         "message": "Stimulus Collective API",
         "ai_model": DSPY_LM_MODEL,
-        "experiences_loaded": len(EXPERIENCES)
+        "phase": runtime.phase,
+        "experiences_loaded": len(runtime.catalog) if runtime.catalog is not None else 0,
     }
 
+@app.get("/healthz", include_in_schema=False)
+def liveness():
+    """Liveness: the process is up and serving (regardless of startup progress)."""
+    return {"status": "ok"}
+
+@app.get("/readyz", include_in_schema=False)
+def readiness():
+    """Readiness: 200 once catalog, LM and cache warmup are done, 503 (with progress) until then."""
+    if runtime.ready:
+        return runtime.status()
+    return JSONResponse(status_code=503, content=runtime.status(),
+                        headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+
+@app.get("/api/lm/stats")
+def get_lm_stats():
+    """LM client counters: requests, retries, 429s, tokens, concurrency, cache activity."""
+    content_service = runtime.require("content_service")
+    from workers.lm_client import lm_stats  # loaded by startup by now
+    return {
+        "lm": lm_stats(),
+        "content_cache": content_service.cache.stats(),
+        "generation": content_service.flight.stats(),
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics: LM latency/tokens/errors, cache hit rates, route latency."""
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/api/experiences")
-def list_experiences():
-    """List all experiences (basic info only)."""
-    return [
-        {
-            "slug": exp["slug"],
-            "title": exp["title"],
-            "price": exp["price"],
-            "category": exp["category"],
-            "duration": exp["duration"],
-            "hero_image": exp["hero_image"]
+def list_experiences(request: Request):
+    """List all experiences (basic info only).
+
+    Served with an ETag (304 on If-None-Match), Cache-Control and a
+    precompressed body when the client accepts gzip/brotli.
+    """
+    return runtime.require("catalog").list_payload.response(request)
+
+@app.get("/api/experiences/search")
+def search_experiences(
+    category: Optional[str] = None,
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    language: Optional[str] = Query(None, description="Language code, e.g. EN"),
+    group_size: Optional[int] = Query(None, ge=1, description="Party size that must fit"),
+    max_duration: Optional[int] = Query(None, ge=1, description="Max duration in minutes"),
+    after: Optional[str] = Query(None, description="Cursor: next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    include_content: bool = False,
+):
+    """Filter experiences, ordered by slug, with keyset pagination.
+
+    Pass `next_cursor` back as `after` to get the following page. With
+    `include_content=true` each item carries its last generated content
+    (if any) without triggering generation.
+    """
+    items, next_cursor = runtime.require("repository").query(ExperienceQuery(
+        category=category,
+        min_price=min_price,
+        max_price=max_price,
+        language=language,
+        group_size=group_size,
+        max_duration_minutes=max_duration,
+        after=after,
+        limit=limit,
+        include_content=include_content,
+    ))
+    return {"items": items, "next_cursor": next_cursor}
+
+def ranked_summaries(ranked: list) -> list:
+    summaries = runtime.require("catalog").summary_by_slug
+    return [{**summaries[item["slug"]], "score": item["score"]} for item in ranked]
+
+@app.get("/api/experiences/rank")
+def rank_experiences(
+    request: Request,
+    k: int = Query(10, ge=1, le=100),
+    metric: str = Query("distance", description=f"One of: {', '.join(METRICS)}"),
+    weights: Optional[str] = Query(None, description="Per-sense weights, e.g. taste:2,sound:0.5"),
+):
+    """Rank experiences by closeness to a sense profile.
+
+    Pass the desired scores (1-10) as query parameters, e.g.
+    `?taste=9&connect=8`. Senses left out are ignored. Only experiences with
+    generated content (and therefore scores) are ranked.
+    """
+    score_matrix = runtime.require("score_matrix")
+    try:
+        profile = {
+            sense: float(request.query_params[sense])
+            for sense in SENSES
+            if sense in request.query_params
         }
-        for exp in EXPERIENCES
-    ]
+        if not profile:
+            raise ValueError(f"Give at least one sense score: {', '.join(SENSES)}")
+        ranked = score_matrix.rank(profile, k=k, metric=metric, weights=parse_weights(weights))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"profile": profile, "metric": metric, "results": ranked_summaries(ranked)}
+
+def experience_payload(exp: dict, ai_content: dict) -> dict:
+    """Merge an experience with its AI content and booking link."""
+    whatsapp_message = f"Hi! I'm interested in the {exp['title']} experience."
+    whatsapp_url = f"https://wa.me/41XXXXXXXXX?text={whatsapp_message.replace(' ', '%20')}"
+    return {
+        **exp,
+        **ai_content,
+        "whatsapp_url": whatsapp_url
+    }
+
+@app.get("/api/experiences/full")
+async def get_all_experiences(request: Request, stream: bool = False):
+    """Get every experience merged with its AI-generated content.
+
+    Replaces N calls to /api/experiences/{slug} (e.g. in a static build) with
+    one request. Cached content is returned as-is; missing content is
+    generated with at most BULK_GENERATION_CONCURRENCY LM calls in flight.
+
+    With `?stream=true` (or `Accept: application/x-ndjson`) the response is
+    NDJSON, one experience per line in completion order, so cached items go
+    out immediately. Failed items become `{"slug": ..., "error": ...}` lines.
+    """
+    catalog = runtime.require("catalog")
+    content_service = runtime.require("content_service")
+    if not runtime.ready:
+        # A whole-catalog request during warmup would mostly be misses
+        raise NotReady("content_service", runtime.phase, runtime.error)
+    semaphore = asyncio.Semaphore(BULK_GENERATION_CONCURRENCY)
+
+    async def load(exp):
+        async with semaphore:
+            entry, _ = await content_service.get(exp)
+        return experience_payload(exp, entry["content"])
+
+    if stream or "application/x-ndjson" in request.headers.get("accept", ""):
+        async def load_or_error(exp):
+            try:
+                return await load(exp)
+            except Exception as e:
+                print(f"❌ Error generating AI content for {exp['slug']}: {e}")
+                return {"slug": exp["slug"], "error": f"Error generating content: {str(e)}"}
+
+        async def lines():
+            tasks = [asyncio.ensure_future(load_or_error(exp)) for exp in catalog]
+            try:
+                for done in asyncio.as_completed(tasks):
+                    yield json.dumps(await done) + "\n"
+            finally:
+                # Client went away: stop waiting (generations themselves are shielded)
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*(load(exp) for exp in catalog), return_exceptions=True)
+    failed = {
+        exp["slug"]: str(result)
+        for exp, result in zip(catalog, results)
+        if isinstance(result, Exception)
+    }
+    if failed:
+        print(f"❌ Error generating AI content for: {', '.join(failed)}")
+        raise HTTPException(status_code=500, detail={"error": "Error generating content", "failed": failed})
+    return results
 
 @app.get("/api/experiences/{slug}")
-def get_experience(slug: str):
+async def get_experience(
+    slug: str,
+    response: Response,
+    lang: Optional[str] = Query(None, description="Language code from the experience's languages, e.g. DE"),
+    wait: bool = Query(True, description="On a miss, generate now (true) or queue a job and return 202 (false)"),
+):
     """Get full experience with AI-generated content.
 
     This endpoint:
     1. Finds the experience by slug
-    2. Generates AI content (tagline, description, highlights, scores)
+    2. Serves cached AI content, or generates it (tagline, description, highlights, scores)
     3. Returns combined data
 
-    Note: In production, cache AI-generated content to avoid regenerating.
+    Content is cached on the experience inputs, the signature prompt and the
+    model. Once an entry outlives CONTENT_TTL_SECONDS (or its inputs change)
+    the last good content is returned immediately and regenerated in the
+    background. Freshness is reported in the X-Content-* response headers.
+
+    `?lang=DE` serves the localized version (derived from the English content
+    in one batched call for all of the experience's languages, then cached).
+
+    With `?wait=false` a miss doesn't hold the connection for the LM call:
+    a high-priority generation job is queued and its status returned (202,
+    Location: /api/jobs/{id}). Retry once the job has succeeded. If the
+    content is already being generated in this process, the request waits
+    for that generation instead of queueing a second one.
     """
 
     # Find experience
-    exp = next((e for e in EXPERIENCES if e["slug"] == slug), None)
+    exp = runtime.require("catalog").get(slug)
     if not exp:
         raise HTTPException(status_code=404, detail="Experience not found")
 
-    print(f"📝 Generating AI content for: {exp['title']}")
+    lang = (lang or BASE_LANGUAGE).upper()
+    if lang != BASE_LANGUAGE and lang not in (code.upper() for code in exp.get("languages", [])):
+        raise HTTPException(status_code=404, detail=f"Experience not offered in {lang}")
 
+    content_service = require_content(slug)
+    if (not wait and content_service.latest(slug) is None
+            and not content_service.flight.in_flight(content_service.key_for(exp))):
+        job, created = submit_generation(exp, "high")
+        return job_accepted(job, created)
     try:
-        # Generate AI content
-        ai_content = copywriter.forward(
-            title=exp["title"],
-            category=exp["category"],
-            duration=exp["duration"],
-            price=exp["price"],
-            group_size=exp["group_size"],
-            location=exp["location"],
-            key_elements=exp["key_elements"]
-        )
-
-        print(f"✅ AI content generated successfully")
-
-        # Create WhatsApp URL
-        whatsapp_message = f"Hi! I'm interested in the {exp['title']} experience."
-        whatsapp_url = f"https://wa.me/41XXXXXXXXX?text={whatsapp_message.replace(' ', '%20')}"
-
-        # Merge and return
-        return {
-            **exp,
-            **ai_content,
-            "whatsapp_url": whatsapp_url
-        }
-
+        entry, status = await content_service.get_localized(exp, lang)
     except Exception as e:
+        # Only reachable when there is no previous content to fall back on
         print(f"❌ Error generating AI content: {e}")
+        from workers.lm_client import is_rate_limited  # loaded by startup by now
+        if is_rate_limited(e):
+            raise HTTPException(status_code=503, detail="AI model is rate limited, try again shortly",
+                                headers={"Retry-After": "30"})
         raise HTTPException(status_code=500, detail=f"Error generating content: {str(e)}")
 
-@app.get("/api/about")
-def get_about():
-    """Get About page content."""
-    return {
-        "title": "About Stimulus Collective",
-        "subtitle": "Basel experiences that stick with you",
-        "description": """We're not a tour company. We're Basel insiders who got tired of watching visitors
-        do the same predictable things. So we started creating small-group experiences that tap into what
-        makes this city genuinely interesting: the wine that sommeliers actually drink, the chocolate shops
-        locals visit, the art that challenges rather than decorates.
-
-        Each experience is capped at 8 people. Each one is led by someone who knows their subject deeply.
-        And each one is designed to give you stories worth repeating.""",
-        "values": [
-            {
-                "title": "Small Groups Only",
-                "description": "8 people maximum. No megaphones, no rushing, no getting lost in the crowd."
-            },
-            {
-                "title": "Expert Guides",
-                "description": "Sommeliers, chocolatiers, artists. People who live and breathe their craft."
-            },
-            {
-                "title": "Sensorial Focus",
-                "description": "We measure experiences across 5 dimensions: Taste, Sight, Sound, Thought, Connect."
-            }
-        ],
-        "whatsapp_url": "https://wa.me/41XXXXXXXXX?text=Hi!%20I'd%20like%20to%20know%20more%20about%20Stimulus%20Collective"
-    }
+    response.headers.update(content_service.freshness_headers(entry, status, slug))
+    response.headers["Content-Language"] = lang.lower()
+    return {**experience_payload(exp, entry["content"]), "lang": lang}
 
-@app.get("/api/pages/experiences")
-def get_experiences_page():
-    """Get Experiences page with all experiences grouped by category."""
+@app.get("/api/experiences/{slug}/similar")
+def similar_experiences(
+    slug: str,
+    k: int = Query(5, ge=1, le=100),
+    metric: str = Query("cosine", description=f"One of: {', '.join(METRICS)}"),
+    weights: Optional[str] = Query(None, description="Per-sense weights, e.g. taste:2,sound:0.5"),
+):
+    """Experiences with the most similar stimulus_scores profile."""
+    score_matrix = runtime.require("score_matrix")
+    if runtime.catalog.get(slug) is None:
+        raise HTTPException(status_code=404, detail="Experience not found")
+    if slug not in score_matrix:
+        raise HTTPException(status_code=404, detail="No generated content (scores) for this experience yet")
+    try:
+        ranked = score_matrix.similar(slug, k=k, metric=metric, weights=parse_weights(weights))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"slug": slug, "metric": metric, "results": ranked_summaries(ranked)}
+
+def sse(event: str, data) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    # Group experiences by category
-    by_category = {}
-    for exp in EXPERIENCES:
-        category = exp["category"]
-        if category not in by_category:
-            by_category[category] = []
-        by_category[category].append({
-            "slug": exp["slug"],
-            "title": exp["title"],
-            "price": exp["price"],
-            "duration": exp["duration"],
-            "hero_image": exp["hero_image"],
-            "group_size": exp["group_size"],
-            "location": exp["location"]
-        })
+@app.get("/api/experiences/{slug}/stream")
+async def stream_experience(slug: str, refresh: bool = False):
+    """Stream an experience's AI content over Server-Sent Events.
+
+    Event order:
+    1. `experience` - the static experience fields, sent immediately
+    2. `tagline`, `description` - `{"chunk": "..."}` text as the LM writes it
+    3. `highlights`, `stimulus_scores` - once the prediction completes
+    4. `done` - the full payload (same shape as /api/experiences/{slug}) plus `status`
+
+    Cached content is replayed instantly; `?refresh=true` forces a new
+    generation (for previewing prompt changes) unless the content is younger
+    than CONTENT_REFRESH_MIN_AGE_SECONDS. Failures end the stream with an
+    `error` event.
+    """
+    exp = runtime.require("catalog").get(slug)
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experience not found")
+    content_service = require_content(slug)
+    from workers.copywriter import STREAMED_FIELDS  # loaded by startup by now
 
+    async def events():
+        yield sse("experience", exp)
+        try:
+            async for event, data in content_service.stream(exp, refresh=refresh):
+                if event == "done":
+                    entry, status = data
+                    yield sse("done", {**experience_payload(exp, entry["content"]), "status": status})
+                elif event in STREAMED_FIELDS:
+                    yield sse(event, {"chunk": data})
+                else:
+                    yield sse(event, data)
+        except Exception as e:
+            print(f"❌ Error streaming AI content: {e}")
+            yield sse("error", {"detail": f"Error generating content: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def job_status(job: Job) -> dict:
     return {
-        "title": "All Experiences",
-        "subtitle": "Wine. Chocolate. Art. Pick your sensory adventure.",
-        "categories": by_category,
-        "total_experiences": len(EXPERIENCES)
+        **job.to_dict(),
+        "queue_position": runtime.jobs.position(job),
+        "status_url": f"/api/jobs/{job.id}",
+        "result_url": f"/api/jobs/{job.id}/result",
     }
 
+def job_accepted(job: Job, created: bool) -> JSONResponse:
+    """202 pointing at the job (an identical pending job counts as this one)."""
+    return JSONResponse(
+        status_code=202,
+        content={**job_status(job), "deduplicated": not created},
+        headers={"Location": f"/api/jobs/{job.id}"},
+    )
+
+def submit_generation(exp: dict, priority: str):
+    """Queue a copywriter job for `exp`; its content goes into the content cache when done."""
+    jobs = runtime.require("jobs")
+    content_service = runtime.require("content_service")
+    key = content_service.key_for(exp)
+
+    def store(job: Job):
+        if job.status == "succeeded":
+            content_service.store(exp, key, job.result)
+        else:
+            content_service.failures[exp["slug"]] = (time.time(), job.error)
+
+    return jobs.submit("generate", {"exp": exp}, priority, on_done=store)
+
+def check_priority(priority: str):
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of: {', '.join(PRIORITIES)}")
+
+@app.post("/api/jobs/generate/{slug}", status_code=202)
+def enqueue_generation(slug: str, priority: str = Query("normal", description="high, normal or low")):
+    """Queue a copywriter run for an experience (e.g. to refresh it ahead of traffic).
+
+    Returns the job (202). The generated content replaces the cached content
+    for the experience when the job succeeds. An identical job that is still
+    queued or running is returned instead of queueing another.
+    """
+    check_priority(priority)
+    exp = runtime.require("catalog").get(slug)
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experience not found")
+    job, created = submit_generation(exp, priority)
+    return job_accepted(job, created)
+
+@app.post("/api/jobs/audit", status_code=202)
+def enqueue_audit(
+    sections: Optional[List[str]] = Query(None, description="ux, visual and/or tech (default: all)"),
+    mode: str = Query("chain", description="chain or fast"),
+    priority: str = Query("low", description="high, normal or low"),
+):
+    """Queue a site audit (the analyze_site.py report); fetch it from the job's result."""
+    check_priority(priority)
+    # analyze_site pulls in the audit workers; loaded by startup by now
+    from analyze_site import SECTION_NAMES
+    from workers.fused import MODES
+    sections = sections or list(SECTION_NAMES)
+    unknown = [name for name in sections if name not in SECTION_NAMES]
+    if unknown or mode not in MODES:
+        raise HTTPException(status_code=400, detail=(
+            f"sections must be among {', '.join(SECTION_NAMES)} and mode one of {', '.join(MODES)}"
+        ))
+    jobs = runtime.require("jobs")
+    # Same sections in any order are the same job
+    job, created = jobs.submit("audit", {"sections": sorted(set(sections)), "mode": mode}, priority)
+    return job_accepted(job, created)
+
+@app.get("/api/jobs")
+def list_jobs(limit: int = Query(50, ge=1, le=1000)):
+    """Queue stats and the most recent jobs (newest first)."""
+    jobs = runtime.require("jobs")
+    recent = list(jobs.jobs.values())[-limit:]
+    return {"stats": jobs.stats(), "jobs": [job_status(job) for job in reversed(recent)]}
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    """Job status: queued (with queue_position), running, succeeded or failed."""
+    job = runtime.require("jobs").get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (or its result expired)")
+    return job_status(job)
+
+@app.get("/api/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    """The job's result once it succeeded.
+
+    202 (with Retry-After) while the job is queued or running; for a failed
+    job, 200 with `status: "failed"` and the `error`.
+    """
+    job = runtime.require("jobs").get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (or its result expired)")
+    if not job.done:
+        return JSONResponse(status_code=202, content=job_status(job),
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    return {"id": job.id, "kind": job.kind, "status": job.status,
+            "result": job.result, "error": job.error}
+
+ABOUT_PAGE = StaticPayload.from_obj({
+    "title": "About Stimulus Collective",
+    "subtitle": "Basel experiences that stick with you",
+    "description": """We're not a tour company. We're Basel insiders who got tired of watching visitors
+    do the same predictable things. So we started creating small-group experiences that tap into what
+    makes this city genuinely interesting: the wine that sommeliers actually drink, the chocolate shops
+    locals visit, the art that challenges rather than decorates.
+
+    Each experience is capped at 8 people. Each one is led by someone who knows their subject deeply.
+    And each one is designed to give you stories worth repeating.""",
+    "values": [
+        {
+            "title": "Small Groups Only",
+            "description": "8 people maximum. No megaphones, no rushing, no getting lost in the crowd."
+        },
+        {
+            "title": "Expert Guides",
+            "description": "Sommeliers, chocolatiers, artists. People who live and breathe their craft."
+        },
+        {
+            "title": "Sensorial Focus",
+            "description": "We measure experiences across 5 dimensions: Taste, Sight, Sound, Thought, Connect."
+        }
+    ],
+    "whatsapp_url": "https://wa.me/41XXXXXXXXX?text=Hi!%20I'd%20like%20to%20know%20more%20about%20Stimulus%20Collective"
+}, max_age=CATALOG_CACHE_MAX_AGE)
+
+@app.get("/api/about")
+def get_about(request: Request):
+    """Get About page content."""
+    return ABOUT_PAGE.response(request)
+
+@app.get("/api/pages/experiences")
+def get_experiences_page(request: Request):
+    """Get Experiences page with all experiences grouped by category."""
+    return runtime.require("catalog").page_payload.response(request)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,312 @@
+"""
+Experience Repository - JSON file or SQLite behind one interface
+
+data/experiences.json stays the file people edit. The JSON backend serves it
+from memory; the SQLite backend syncs it into an indexed database (with a
+languages table and the generated content alongside) so filtered, paginated
+queries are a single indexed read.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_group_max(group_size: str) -> Optional[int]:
+    """'Max 10 people' -> 10."""
+    match = re.search(r"\d+", group_size or "")
+    return int(match.group()) if match else None
+
+
+def parse_duration_minutes(duration: str) -> Optional[int]:
+    """'2.5 hours' -> 150, '90 minutes' -> 90."""
+    match = re.search(r"(\d+(?:\.\d+)?)\s*(h|hour|hours|min|mins|minutes)?", duration or "", re.I)
+    if not match:
+        return None
+    value = float(match.group(1))
+    unit = (match.group(2) or "hours").lower()
+    return int(round(value if unit.startswith("m") else value * 60))
+
+
+class ExperienceQuery:
+    """Filters for `ExperienceRepository.query`. Unset filters match everything."""
+
+    def __init__(self, category: Optional[str] = None, min_price: Optional[int] = None,
+                 max_price: Optional[int] = None, language: Optional[str] = None,
+                 group_size: Optional[int] = None, max_duration_minutes: Optional[int] = None,
+                 after: Optional[str] = None, limit: int = 20, include_content: bool = False):
+        self.category = category
+        self.min_price = min_price
+        self.max_price = max_price
+        self.language = language.upper() if language else None
+        self.group_size = group_size
+        self.max_duration_minutes = max_duration_minutes
+        self.after = after
+        self.limit = limit
+        self.include_content = include_content
+
+    def matches(self, exp: dict) -> bool:
+        if self.category is not None and exp["category"] != self.category:
+            return False
+        if self.min_price is not None and exp["price"] < self.min_price:
+            return False
+        if self.max_price is not None and exp["price"] > self.max_price:
+            return False
+        if self.language is not None and self.language not in exp.get("languages", []):
+            return False
+        if self.group_size is not None:
+            group_max = parse_group_max(exp.get("group_size"))
+            if group_max is None or group_max < self.group_size:
+                return False
+        if self.max_duration_minutes is not None:
+            minutes = parse_duration_minutes(exp.get("duration"))
+            if minutes is None or minutes > self.max_duration_minutes:
+                return False
+        return True
+
+
+class ExperienceRepository(ABC):
+    """Interface shared by the JSON and SQLite backends.
+
+    `query` returns `(items, next_cursor)`. Results are ordered by slug and
+    paginated by keyset: pass the returned cursor as `after` for the next
+    page (None when there are no more results).
+    """
+
+    @abstractmethod
+    def all(self) -> List[dict]:
+        """Every experience, in data/experiences.json order."""
+
+    @abstractmethod
+    def get(self, slug: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def query(self, q: ExperienceQuery) -> Tuple[List[dict], Optional[str]]:
+        ...
+
+    @abstractmethod
+    def save_content(self, slug: str, content_key: str, content: dict, generated_at: float):
+        ...
+
+    @abstractmethod
+    def get_content(self, slug: str) -> Optional[dict]:
+        ...
+
+
+class JsonExperienceRepository(ExperienceRepository):
+    """The JSON file, held in memory. Filters are a scan - fine for small catalogs."""
+
+    def __init__(self, path: Path):
+        with open(path) as f:
+            self.experiences = json.load(f)
+        self.sorted = sorted(self.experiences, key=lambda exp: exp["slug"])
+        self.by_slug = {exp["slug"]: exp for exp in self.experiences}
+        self.content: Dict[str, dict] = {}
+
+    def all(self) -> List[dict]:
+        return list(self.experiences)
+
+    def get(self, slug: str) -> Optional[dict]:
+        return self.by_slug.get(slug)
+
+    def query(self, q: ExperienceQuery) -> Tuple[List[dict], Optional[str]]:
+        items = []
+        for exp in self.sorted:
+            if q.after is not None and exp["slug"] <= q.after:
+                continue
+            if not q.matches(exp):
+                continue
+            if len(items) == q.limit:
+                return items, items[-1]["slug"]
+            content = self.content.get(exp["slug"]) if q.include_content else None
+            items.append({**exp, **(content or {})})
+        return items, None
+
+    def save_content(self, slug: str, content_key: str, content: dict, generated_at: float):
+        self.content[slug] = content
+
+    def get_content(self, slug: str) -> Optional[dict]:
+        return self.content.get(slug)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiences (
+    slug             TEXT PRIMARY KEY,
+    position         INTEGER NOT NULL,
+    title            TEXT NOT NULL,
+    category         TEXT NOT NULL,
+    price            INTEGER NOT NULL,
+    duration         TEXT NOT NULL,
+    duration_minutes INTEGER,
+    group_size       TEXT,
+    group_max        INTEGER,
+    location         TEXT,
+    hero_image       TEXT,
+    data             TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_experiences_category ON experiences (category, slug);
+CREATE INDEX IF NOT EXISTS idx_experiences_price ON experiences (price, slug);
+CREATE INDEX IF NOT EXISTS idx_experiences_duration ON experiences (duration_minutes, slug);
+CREATE INDEX IF NOT EXISTS idx_experiences_group_max ON experiences (group_max, slug);
+
+CREATE TABLE IF NOT EXISTS experience_languages (
+    slug     TEXT NOT NULL REFERENCES experiences (slug) ON DELETE CASCADE,
+    language TEXT NOT NULL,
+    PRIMARY KEY (language, slug)
+);
+
+CREATE TABLE IF NOT EXISTS generated_content (
+    slug         TEXT PRIMARY KEY REFERENCES experiences (slug) ON DELETE CASCADE,
+    content_key  TEXT NOT NULL,
+    content      TEXT NOT NULL,
+    generated_at REAL NOT NULL
+);
+"""
+
+
+class SqliteExperienceRepository(ExperienceRepository):
+    """SQLite store with indexes on category, price, duration and group size."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared across the threadpool, serialized by a lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def sync(self, experiences: List[dict]):
+        """Make the database match `experiences` (upsert all, delete the rest).
+
+        Generated content of experiences that still exist is kept.
+        """
+        rows = [
+            (
+                exp["slug"], position, exp["title"], exp["category"], exp["price"], exp["duration"],
+                parse_duration_minutes(exp.get("duration")), exp.get("group_size"),
+                parse_group_max(exp.get("group_size")), exp.get("location"),
+                exp.get("hero_image"), json.dumps(exp),
+            )
+            for position, exp in enumerate(experiences)
+        ]
+        languages = [
+            (exp["slug"], language.upper())
+            for exp in experiences
+            for language in exp.get("languages", [])
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """INSERT INTO experiences (slug, position, title, category, price, duration,
+                                            duration_minutes, group_size, group_max, location,
+                                            hero_image, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (slug) DO UPDATE SET
+                       position = excluded.position, title = excluded.title, category = excluded.category, price = excluded.price,
+                       duration = excluded.duration, duration_minutes = excluded.duration_minutes,
+                       group_size = excluded.group_size, group_max = excluded.group_max,
+                       location = excluded.location, hero_image = excluded.hero_image,
+                       data = excluded.data""",
+                rows,
+            )
+            existing = {row["slug"] for row in self._conn.execute("SELECT slug FROM experiences")}
+            removed = existing - {exp["slug"] for exp in experiences}
+            self._conn.executemany("DELETE FROM experiences WHERE slug = ?", [(s,) for s in removed])
+            self._conn.execute("DELETE FROM experience_languages")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO experience_languages (slug, language) VALUES (?, ?)", languages
+            )
+
+    def all(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM experiences ORDER BY position").fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get(self, slug: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM experiences WHERE slug = ?", (slug,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def query(self, q: ExperienceQuery) -> Tuple[List[dict], Optional[str]]:
+        where, params = [], []
+        if q.after is not None:
+            where.append("e.slug > ?")
+            params.append(q.after)
+        if q.category is not None:
+            where.append("e.category = ?")
+            params.append(q.category)
+        if q.min_price is not None:
+            where.append("e.price >= ?")
+            params.append(q.min_price)
+        if q.max_price is not None:
+            where.append("e.price <= ?")
+            params.append(q.max_price)
+        if q.group_size is not None:
+            where.append("e.group_max >= ?")
+            params.append(q.group_size)
+        if q.max_duration_minutes is not None:
+            where.append("e.duration_minutes <= ?")
+            params.append(q.max_duration_minutes)
+        if q.language is not None:
+            where.append("e.slug IN (SELECT slug FROM experience_languages WHERE language = ?)")
+            params.append(q.language)
+
+        content_column = ", c.content" if q.include_content else ""
+        content_join = " LEFT JOIN generated_content c ON c.slug = e.slug" if q.include_content else ""
+        sql = (
+            f"SELECT e.slug, e.data{content_column} FROM experiences e{content_join}"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY e.slug LIMIT ?"
+        )
+        # Fetch one extra row to know whether there is a next page
+        params.append(q.limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        items = []
+        for row in rows[:q.limit]:
+            exp = json.loads(row["data"])
+            if q.include_content and row["content"]:
+                exp.update(json.loads(row["content"]))
+            items.append(exp)
+        next_cursor = items[-1]["slug"] if len(rows) > q.limit else None
+        return items, next_cursor
+
+    def save_content(self, slug: str, content_key: str, content: dict, generated_at: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO generated_content (slug, content_key, content, generated_at)
+                   SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM experiences WHERE slug = ?)
+                   ON CONFLICT (slug) DO UPDATE SET
+                       content_key = excluded.content_key, content = excluded.content,
+                       generated_at = excluded.generated_at""",
+                (slug, content_key, json.dumps(content), generated_at, slug),
+            )
+
+    def get_content(self, slug: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM generated_content WHERE slug = ?", (slug,)
+            ).fetchone()
+        return json.loads(row["content"]) if row else None
+
+
+def open_repository(backend: str, json_path: Path, sqlite_path: Path) -> ExperienceRepository:
+    """Open the configured backend ("json" or "sqlite")."""
+    if backend == "json":
+        return JsonExperienceRepository(json_path)
+    if backend == "sqlite":
+        repository = SqliteExperienceRepository(sqlite_path)
+        with open(json_path) as f:
+            repository.sync(json.load(f))
+        return repository
+    raise ValueError(f"Unknown EXPERIENCE_STORE: {backend!r} (expected 'json' or 'sqlite')")
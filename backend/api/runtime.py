@@ -0,0 +1,246 @@
+"""
+Runtime - the API's services, built in the background after the server binds
+
+Importing api.main only creates the FastAPI app, so uvicorn binds and answers
+`/` and `/healthz` straight away (in every worker process). The slow parts
+run in `Runtime.start()`, launched from the app's lifespan, one phase at a
+time in a worker thread:
+
+1. catalog - load the experience repository and pre-serialize catalog responses
+2. lm      - import DSPy, configure the LM, build the copywriter (compiled, if
+             optimize.py saved a program), localizer, content service and
+             background job queue
+3. warmup  - seed the content cache from the pregenerated artifact, load each
+             experience's last content into memory, build the score matrix
+
+Routes ask for the component they need with `require()`, which raises
+NotReady (a 503 with Retry-After) until its phase is done. `/readyz` turns
+200 once all phases are, so a load balancer only sends traffic to a worker
+that won't pay cold-start latency. A phase that fails (e.g. a missing API
+key) stops startup and is reported by `/readyz` and those 503s; the process
+keeps serving whatever was already loaded.
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, Optional
+
+from config import (
+    DSPY_LM_MODEL, DSPY_LM_BACKEND, GROQ_API_KEY, LOCALIZATION_LM_MODEL,
+    CONTENT_CACHE_DIR, CONTENT_CACHE_MAX_ENTRIES, CONTENT_TTL_SECONDS,
+    CONTENT_RETRY_AFTER_FAILURE_SECONDS, CONTENT_REFRESH_MIN_AGE_SECONDS, CONTENT_ARTIFACT_PATH, CATALOG_CACHE_MAX_AGE,
+    EXPERIENCE_STORE, EXPERIENCES_PATH, SQLITE_PATH, JOB_WORKERS, JOB_RESULT_TTL_SECONDS,
+)
+
+from .catalog import ExperienceCatalog
+from .jobs import JobQueue
+from .repository import open_repository
+from .similarity import ScoreMatrix
+
+PHASES = ("catalog", "lm", "warmup")
+
+# Phase each component becomes available in
+COMPONENTS = {
+    "repository": "catalog",
+    "catalog": "catalog",
+    "content_cache": "lm",
+    "content_service": "lm",
+    "jobs": "lm",
+    "score_matrix": "warmup",
+}
+
+RETRY_AFTER_SECONDS = 5
+
+
+class NotReady(Exception):
+    """A route needs a component whose phase hasn't finished (or never will: `error`)."""
+
+    def __init__(self, component: str, phase: str, error: Optional[str] = None):
+        self.component = component
+        self.phase = phase
+        self.error = error
+        if error:
+            message = f"Service unavailable: startup failed ({error})"
+        else:
+            message = f"Service is starting up ({phase} not loaded yet), try again shortly"
+        super().__init__(message)
+
+
+class Runtime:
+    """Lazily built services behind the API (see module docstring)."""
+
+    def __init__(self):
+        self.phase = "starting"
+        self.done = set()
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.repository = None
+        self.catalog: Optional[ExperienceCatalog] = None
+        self.content_cache = None
+        self.content_service = None
+        self.jobs: Optional[JobQueue] = None
+        self.score_matrix: Optional[ScoreMatrix] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.phase == "ready"
+
+    @property
+    def error(self) -> Optional[str]:
+        """Why startup failed (it stops at the first failed phase), or None."""
+        return next(iter(self.errors.values()), None)
+
+    def require(self, component: str):
+        """The component, or NotReady if its startup phase isn't done."""
+        phase = COMPONENTS[component]
+        if phase not in self.done:
+            raise NotReady(component, phase, self.error)
+        return getattr(self, component)
+
+    def status(self) -> dict:
+        return {
+            "status": self.phase,
+            "phases": {
+                phase: ("done" if phase in self.done else "failed" if phase in self.errors
+                        else "running" if phase == self.phase else "pending")
+                for phase in PHASES
+            },
+            "seconds": self.timings,
+            "errors": self.errors,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+        }
+
+    # -- startup --------------------------------------------------------------
+
+    def start(self) -> asyncio.Task:
+        """Run the startup phases in the background; returns immediately."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def wait(self):
+        """Wait for startup to finish (successfully or not)."""
+        await asyncio.shield(self.start())
+
+    async def stop(self):
+        if self.jobs is not None:
+            self.jobs.shutdown()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        steps = {"catalog": self._load_catalog, "lm": self._load_lm, "warmup": self._warm_up}
+        for phase in PHASES:
+            self.phase = phase
+            started = time.perf_counter()
+            try:
+                # In a thread: imports, file reads and SQLite syncs would block the event loop
+                await asyncio.to_thread(steps[phase])
+            except Exception as e:
+                self.errors[phase] = f"{type(e).__name__}: {e}"
+                self.phase = "failed"
+                print(f"❌ Startup failed in {phase}: {e}")
+                return
+            self.timings[phase] = round(time.perf_counter() - started, 2)
+            self.done.add(phase)
+        self.phase = "ready"
+        self.ready_at = time.time()
+        print(f"✅ Ready in {self.ready_at - self.started_at:.1f}s")
+
+    def _load_catalog(self):
+        # Load experiences data (indexed, with catalog responses pre-serialized)
+        self.repository = open_repository(EXPERIENCE_STORE, EXPERIENCES_PATH, SQLITE_PATH)
+        self.catalog = ExperienceCatalog(self.repository.all(), page_header={
+            "title": "All Experiences",
+            "subtitle": "Wine. Chocolate. Art. Pick your sensory adventure.",
+        }, max_age=CATALOG_CACHE_MAX_AGE)
+        print(f"✅ Loaded {len(self.catalog)} experiences ({EXPERIENCE_STORE} store)")
+
+    def _load_lm(self):
+        # Imported here: DSPy and litellm take seconds to import
+        from workers.cache import ContentCache
+        from workers.lm_client import build_backend_lm, configure_lm, split_limits
+        from workers.localizer import ExperienceLocalizer
+        from workers.programs import load_copywriter
+        from .content import ContentService
+        from .tasks import TASKS, init_worker
+
+        if DSPY_LM_BACKEND == "groq" and not GROQ_API_KEY:
+            raise RuntimeError("GROQ_API_KEY is not set")
+
+        # Configure DSPy with Groq (shared, rate-limited client). The job
+        # workers are separate processes on the same tier: each gets a share
+        limits = split_limits(JOB_WORKERS + 1)
+        configure_lm(DSPY_LM_MODEL, **limits)
+        print(f"✅ DSPy configured with {DSPY_LM_MODEL}")
+
+        copywriter, copywriter_model = load_copywriter(lm_kwargs=limits)
+        print(f"✅ AI Copywriter initialized ({copywriter_model})")
+        localizer = ExperienceLocalizer(lm=build_backend_lm(LOCALIZATION_LM_MODEL, **limits))
+        print(f"✅ Localizer initialized with {LOCALIZATION_LM_MODEL}")
+
+        # Cache generated content (memory + disk) so warm requests skip the LM
+        self.content_cache = ContentCache(CONTENT_CACHE_DIR, max_entries=CONTENT_CACHE_MAX_ENTRIES)
+        self.content_service = ContentService(
+            copywriter, self.content_cache, copywriter_model,
+            ttl_seconds=CONTENT_TTL_SECONDS,
+            retry_after_failure=CONTENT_RETRY_AFTER_FAILURE_SECONDS,
+            refresh_min_age=CONTENT_REFRESH_MIN_AGE_SECONDS,
+            localizer=localizer,
+            localization_model=LOCALIZATION_LM_MODEL,
+        )
+        print(f"✅ Content cache ready at {CONTENT_CACHE_DIR}")
+
+        # Worker processes start on the first job
+        self.jobs = JobQueue(TASKS, workers=JOB_WORKERS, initializer=init_worker, initargs=(limits,),
+                             result_ttl=JOB_RESULT_TTL_SECONDS)
+        print(f"✅ Job queue ready ({JOB_WORKERS} worker processes)")
+
+    def _warm_up(self):
+        content_service = self.content_service
+
+        # Load content pregenerated by pregenerate.py
+        if CONTENT_ARTIFACT_PATH.exists():
+            with open(CONTENT_ARTIFACT_PATH) as f:
+                artifact = json.load(f)
+            loaded = content_service.seed(artifact.get("items", {}))
+            print(f"✅ Loaded pregenerated content ({loaded} new of {len(artifact.get('items', {}))})")
+
+        # Pull each experience's content into the in-memory LRU (as many as fit)
+        # and keep the repository's copy of generated content in step with it
+        warmed = 0
+        for exp in self.catalog:
+            if warmed < self.content_cache.max_entries // 2:
+                self.content_cache.preload(content_service.latest_key(exp["slug"]))
+                warmed += self.content_cache.preload(content_service.key_for(exp))
+            latest = content_service.latest(exp["slug"])
+            if latest is not None:
+                self._store_content(exp["slug"], latest)
+        content_service.subscribe(self._store_content)
+        print(f"✅ Content cache warmed ({warmed} current entries)")
+
+        # Sensory score matrix for similarity/ranking; rows update as content is regenerated
+        score_matrix = ScoreMatrix(capacity=max(64, len(self.catalog)))
+        for exp in self.catalog:
+            latest = content_service.latest(exp["slug"])
+            if latest is not None:
+                score_matrix.update(exp["slug"], latest["content"].get("stimulus_scores") or {})
+        self.score_matrix = score_matrix
+        content_service.subscribe(self._update_scores)
+        print(f"✅ Score matrix built ({len(score_matrix)} experiences with scores)")
+
+    def _store_content(self, slug: str, entry: dict):
+        self.repository.save_content(slug, entry["content_key"], entry["content"], entry["generated_at"])
+
+    def _update_scores(self, slug: str, entry: dict):
+        if self.catalog.get(slug) is not None:
+            self.score_matrix.update(slug, entry["content"].get("stimulus_scores") or {})
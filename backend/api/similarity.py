@@ -0,0 +1,126 @@
+"""
+Sensory similarity - NumPy matrix over every experience's stimulus_scores
+
+One row per experience with generated content, one column per sense. The
+"similar experiences" and "rank by sense profile" queries are single matrix
+operations over all rows, and a regenerated experience only rewrites its
+own row.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SENSES = ("taste", "sight", "sound", "thought", "connect")
+
+METRICS = ("cosine", "distance")
+
+
+def sense_vector(values: Dict[str, float], default: float = 0.0) -> np.ndarray:
+    """{'taste': 8, ...} -> array in SENSES order."""
+    return np.array([float(values.get(sense, default)) for sense in SENSES], dtype=np.float32)
+
+
+def parse_weights(spec: Optional[str]) -> np.ndarray:
+    """'taste:2,sound:0.5' -> per-sense weights (unlisted senses weigh 1)."""
+    weights = np.ones(len(SENSES), dtype=np.float32)
+    if not spec:
+        return weights
+    for part in spec.split(","):
+        sense, _, value = part.partition(":")
+        sense = sense.strip().lower()
+        if sense not in SENSES:
+            raise ValueError(f"Unknown sense {sense!r} (expected one of {', '.join(SENSES)})")
+        weights[SENSES.index(sense)] = float(value)
+    if (weights < 0).any():
+        raise ValueError("Weights must be non-negative")
+    return weights
+
+
+class ScoreMatrix:
+    """Stimulus scores of every experience, kept as a dense float32 matrix."""
+
+    def __init__(self, capacity: int = 64):
+        self.slugs: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._scores = np.zeros((capacity, len(SENSES)), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self.index
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._scores[:len(self.slugs)]
+
+    def update(self, slug: str, stimulus_scores: dict) -> bool:
+        """Insert or overwrite one experience's row. Returns False for unusable scores."""
+        try:
+            row = sense_vector(stimulus_scores)
+        except (TypeError, ValueError):
+            return False
+
+        with self._lock:
+            i = self.index.get(slug)
+            if i is None:
+                i = len(self.slugs)
+                if i == len(self._scores):
+                    # Amortized O(1) append: grow by doubling
+                    grown = np.zeros((2 * len(self._scores), len(SENSES)), dtype=np.float32)
+                    grown[:i] = self._scores
+                    self._scores = grown
+                self.slugs.append(slug)
+                self.index[slug] = i
+            self._scores[i] = row
+        return True
+
+    def _rank(self, target: np.ndarray, weights: np.ndarray, metric: str,
+              exclude: Optional[int], k: int) -> List[dict]:
+        with self._lock:
+            scores = self.scores.copy()
+            slugs = list(self.slugs)
+        if not len(slugs):
+            return []
+
+        weighted = scores * weights
+        target = target * weights
+        if metric == "cosine":
+            norms = np.linalg.norm(weighted, axis=1) * np.linalg.norm(target)
+            similarity = np.divide(weighted @ target, norms,
+                                   out=np.zeros(len(slugs), dtype=np.float32), where=norms > 0)
+        elif metric == "distance":
+            # Map weighted euclidean distance into (0, 1] so higher is always better
+            similarity = 1.0 / (1.0 + np.linalg.norm(weighted - target, axis=1))
+        else:
+            raise ValueError(f"Unknown metric {metric!r} (expected one of {', '.join(METRICS)})")
+
+        if exclude is not None:
+            similarity[exclude] = -np.inf
+
+        k = min(k, len(slugs) - (exclude is not None))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.argsort(-similarity[top], kind="stable")]
+        return [{"slug": slugs[i], "score": round(float(similarity[i]), 4)} for i in top]
+
+    def similar(self, slug: str, k: int = 5, metric: str = "cosine",
+                weights: Optional[np.ndarray] = None) -> List[dict]:
+        """Experiences whose sensory profile is closest to `slug`'s."""
+        i = self.index[slug]
+        weights = weights if weights is not None else np.ones(len(SENSES), dtype=np.float32)
+        return self._rank(self.scores[i].copy(), weights, metric, exclude=i, k=k)
+
+    def rank(self, profile: Dict[str, float], k: int = 10, metric: str = "distance",
+             weights: Optional[np.ndarray] = None) -> List[dict]:
+        """Experiences closest to a desired sense profile.
+
+        Senses missing from `profile` are ignored (weight 0).
+        """
+        mask = np.array([sense in profile for sense in SENSES], dtype=np.float32)
+        weights = mask * (weights if weights is not None else 1.0)
+        return self._rank(sense_vector(profile), weights, metric, exclude=None, k=k)
@@ -0,0 +1,50 @@
+"""
+Single-flight coalescing for async work
+
+Concurrent callers asking for the same key share one in-flight task instead
+of each starting their own, so a traffic spike on one experience costs one
+LM call.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Run at most one task per key; later callers await the same future."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        """Await `fn()` for `key`, joining an in-flight call if there is one."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        # Shield so one client disconnecting doesn't cancel everyone's generation
+        return await asyncio.shield(future)
+
+    def _done(self, key: str, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter went away
+        if not future.cancelled():
+            future.exception()
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,51 @@
+"""
+Job Tasks - what the job queue's worker processes run (see api/jobs.py)
+
+Each task takes and returns plain JSON-able data, since arguments and
+results cross a process boundary. `init_worker` runs once per process and
+configures DSPy there, so every task after the first in a process starts
+warm.
+
+Rate limits live in each process, so every worker gets its share of the
+Groq tier (see `split_limits`) rather than the whole of it. The API's
+`/api/lm/stats` only counts the API process's own calls.
+"""
+
+from typing import Optional
+
+from config import DSPY_LM_MODEL
+
+_copywriter = None
+_limits: dict = {}
+
+
+def init_worker(limits: Optional[dict] = None):
+    """Pool initializer: configure DSPy once for this worker process, within `limits`."""
+    global _limits
+    from workers.lm_client import configure_lm
+    _limits = limits or {}
+    configure_lm(DSPY_LM_MODEL, **_limits)
+
+
+def generate_content(exp: dict) -> dict:
+    """Copywriter output for one experience (same shape as ContentService content)."""
+    global _copywriter
+    from workers.copywriter import copywriter_inputs
+    from workers.programs import load_copywriter
+    if _copywriter is None:
+        # Same program as the API process, so the result matches its content key
+        _copywriter, _ = load_copywriter(lm_kwargs=_limits)
+    print(f"📝 [job] Generating AI content for: {exp['title']}")
+    return _copywriter(**copywriter_inputs(exp))
+
+
+def audit_site(sections: list, mode: str) -> dict:
+    """The analyze_site.py report for `sections` (failed sections are listed, not raised)."""
+    import analyze_site
+    return analyze_site.audit(sections, mode=mode)
+
+
+TASKS = {
+    "generate": generate_content,
+    "audit": audit_site,
+}
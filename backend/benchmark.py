@@ -0,0 +1,346 @@
+"""
+Benchmark the API under concurrency, fully offline.
+
+Each catalog size runs in a fresh subprocess. That process has its own
+synthetic catalog, empty caches and the synthetic LM (DSPY_LM_BACKEND=synthetic,
+see workers/replay_lm.py), with realistic latency. Synthetic calls go through
+the same LM client as live ones (rate limiter, adaptive concurrency, retries),
+at the configured Groq limits unless --lm-rpm / --lm-tpm / --lm-concurrency
+override them. It drives every route in-process through httpx's ASGI transport
+and reports p50/p95/p99 latency and throughput per scenario:
+
+- catalog:  list, page, about, search (incl. pagination), 304 revalidation
+- cold:     first request for an experience (LM generation)
+- warm:     cached experience reads, SSE replay, similar, rank
+- bulk:     /api/experiences/full (small catalogs only)
+- ops:      health, LM stats, metrics
+
+The LM client's counters (retries, 429s, failures, final concurrency limit)
+are reported per size next to the scenarios. Results are written as JSON to
+benchmarks/ (one file per run, named by time and git revision). Pass --compare to diff against an earlier run and flag
+regressions.
+
+Usage:
+    python benchmark.py                              # sizes 3, 100, 1000, 10000
+    python benchmark.py --sizes 3 1000 --concurrency 32
+    python benchmark.py --compare benchmarks/<previous>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+RESULTS_DIR = BACKEND_DIR / "benchmarks"
+
+DEFAULT_SIZES = [3, 100, 1000, 10000]
+
+
+# ============================================================================
+# Statistics
+# ============================================================================
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(p / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list, errors: int, wall_seconds: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round((ordered[-1] if ordered else 0) * 1000, 2),
+        "throughput_rps": round(len(latencies) / wall_seconds, 1) if wall_seconds else 0.0,
+    }
+
+
+# ============================================================================
+# Catalog generation
+# ============================================================================
+
+def synthetic_catalog(base: list, size: int) -> list:
+    """`size` experiences cycled from `base`, each with distinct copywriter inputs."""
+    catalog = []
+    for i in range(size):
+        exp = dict(base[i % len(base)])
+        if i >= len(base):
+            exp["slug"] = f"{exp['slug']}-{i}"
+            exp["title"] = f"{exp['title']} #{i}"
+            exp["price"] = exp["price"] + i % 50
+        catalog.append(exp)
+    return catalog
+
+
+# ============================================================================
+# Load generation (runs inside the per-size subprocess)
+# ============================================================================
+
+async def drive(client, requests: list, concurrency: int) -> dict:
+    """Send `requests` [(path, headers), ...] with `concurrency` in flight."""
+    queue = asyncio.Queue()
+    for item in requests:
+        queue.put_nowait(item)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                path, headers = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                await response.aread()
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_size(size: int, args) -> dict:
+    import httpx
+    from api.main import app, runtime
+
+    slugs = [exp["slug"] for exp in json.load(open(os.environ["EXPERIENCES_PATH"]))]
+    rng = random.Random(size)
+    cold_slugs = rng.sample(slugs, min(len(slugs), args.cold_requests))
+    results = {}
+
+    def repeat(paths: list, n: int, headers=None) -> list:
+        return [(paths[i % len(paths)], headers or {}) for i in range(n)]
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        await runtime.wait()
+        if not runtime.ready:
+            raise RuntimeError(f"API failed to start: {runtime.errors}")
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+            n = args.requests
+            list_etag = (await client.get("/api/experiences")).headers.get("etag", "")
+
+            scenarios = {
+                "catalog.list": repeat(["/api/experiences"], n),
+                "catalog.list_gzip": repeat(["/api/experiences"], n, {"Accept-Encoding": "gzip"}),
+                "catalog.list_304": repeat(["/api/experiences"], n, {"If-None-Match": list_etag}),
+                "catalog.page": repeat(["/api/pages/experiences"], n),
+                "catalog.about": repeat(["/api/about"], n),
+                "catalog.search": repeat([
+                    "/api/experiences/search?category=tours",
+                    "/api/experiences/search?min_price=50&max_price=90",
+                    "/api/experiences/search?language=DE&group_size=4",
+                    "/api/experiences/search?max_duration=150&limit=50",
+                ], n),
+                "catalog.search_deep_page": repeat([f"/api/experiences/search?after={slugs[len(slugs) // 2]}"], n),
+                "cold.experience": [(f"/api/experiences/{slug}", {}) for slug in cold_slugs],
+                "cold.stream": [(f"/api/experiences/{slug}/stream?refresh=true", {})
+                                for slug in cold_slugs[:max(1, len(cold_slugs) // 5)]],
+                "warm.experience": repeat([f"/api/experiences/{slug}" for slug in cold_slugs], n),
+                "warm.stream": repeat([f"/api/experiences/{slug}/stream" for slug in cold_slugs], n),
+                "warm.similar": repeat([f"/api/experiences/{slug}/similar" for slug in cold_slugs], n),
+                "warm.rank": repeat(["/api/experiences/rank?taste=9&connect=7",
+                                     "/api/experiences/rank?sight=8&metric=cosine"], n),
+                "ops.health": repeat(["/"], n),
+                "ops.lm_stats": repeat(["/api/lm/stats"], n),
+                "ops.metrics": repeat(["/metrics"], max(1, n // 10)),
+            }
+            if size <= args.bulk_max_size:
+                scenarios["bulk.full"] = repeat(["/api/experiences/full"], args.bulk_requests)
+                scenarios["bulk.full_ndjson"] = repeat(["/api/experiences/full?stream=true"], args.bulk_requests)
+
+            for name, requests in scenarios.items():
+                results[name] = await drive(client, requests, args.concurrency)
+                print(f"  {name:<26} {results[name]['p50_ms']:>9.1f} {results[name]['p95_ms']:>9.1f} "
+                      f"{results[name]['p99_ms']:>9.1f} {results[name]['throughput_rps']:>9.1f} "
+                      f"{results[name]['errors']:>6}", file=sys.stderr)
+    return {"scenarios": results, "lm": lm_client_summary()}
+
+
+def lm_client_summary() -> dict:
+    """Limits and counters of the LM client over the whole run (all models)."""
+    from config import JOB_WORKERS
+    from workers.lm_client import lm_stats, split_limits
+
+    stats = lm_stats().values()
+    summary = {
+        # The API process's share of the tier (see api/runtime.py)
+        **split_limits(JOB_WORKERS + 1),
+        **{name: sum(s.get(name, 0) for s in stats)
+           for name in ("requests", "successes", "retries", "rate_limited", "failures")},
+        "concurrency_limit": {s["model"]: s["concurrency_limit"] for s in stats},
+    }
+    print(f"  LM client: {summary['requests']} attempts, {summary['retries']} retries, "
+          f"{summary['rate_limited']} rate limited, {summary['failures']} failed", file=sys.stderr)
+    return summary
+
+
+def child_main(args):
+    """Entry point of the per-size subprocess."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    results = asyncio.run(run_size(args.run_size, args))
+    with open(args.result_file, "w") as f:
+        json.dump(results, f)
+
+
+# ============================================================================
+# Orchestration
+# ============================================================================
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_in_subprocess(size: int, args, base: list) -> dict:
+    with tempfile.TemporaryDirectory(prefix=f"bench-{size}-") as tmp:
+        tmp = Path(tmp)
+        catalog_path = tmp / "experiences.json"
+        with open(catalog_path, "w") as f:
+            json.dump(synthetic_catalog(base, size), f)
+        result_file = tmp / "result.json"
+
+        env = {
+            **os.environ,
+            "DSPY_LM_BACKEND": "synthetic",
+            "SYNTHETIC_LATENCY_SECONDS": str(args.lm_latency),
+            "SYNTHETIC_LATENCY_JITTER": str(args.lm_jitter),
+            "SYNTHETIC_ERROR_RATE": str(args.lm_error_rate),
+            "EXPERIENCES_PATH": str(catalog_path),
+            "EXPERIENCE_STORE": args.store,
+            "SQLITE_PATH": str(tmp / "experiences.db"),
+            "CONTENT_CACHE_DIR": str(tmp / "cache"),
+            "CONTENT_ARTIFACT_PATH": str(tmp / "no-artifact.json"),
+            "LM_CASSETTE_DIR": str(tmp / "cassettes"),
+            # cold.stream refreshes content cold.experience just generated
+            "CONTENT_REFRESH_MIN_AGE_SECONDS": "0",
+        }
+        for option, variable in (("lm_rpm", "GROQ_REQUESTS_PER_MINUTE"), ("lm_tpm", "GROQ_TOKENS_PER_MINUTE"),
+                                 ("lm_concurrency", "LM_MAX_CONCURRENCY")):
+            if getattr(args, option) is not None:
+                env[variable] = str(getattr(args, option))
+        command = [
+            sys.executable, str(Path(__file__).resolve()),
+            "--run-size", str(size), "--result-file", str(result_file),
+            "--concurrency", str(args.concurrency), "--requests", str(args.requests),
+            "--cold-requests", str(args.cold_requests), "--bulk-max-size", str(args.bulk_max_size),
+            "--bulk-requests", str(args.bulk_requests),
+        ]
+        print(f"\n📦 Catalog size {size} ({args.store} store)", file=sys.stderr)
+        print(f"  {'scenario':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>6}",
+              file=sys.stderr)
+        subprocess.run(command, env=env, cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL)
+        with open(result_file) as f:
+            return json.load(f)
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Scenarios whose p95 grew or throughput fell by more than `threshold`."""
+    regressions = []
+    for size, scenarios in current["results"].items():
+        for name, now in scenarios.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(f"size {size} {name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+            if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+                regressions.append(f"size {size} {name}: throughput {before['throughput_rps']} -> "
+                                   f"{now['throughput_rps']} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of the API")
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="Catalog sizes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per warm/catalog scenario")
+    parser.add_argument("--cold-requests", type=int, default=50, help="Distinct experiences generated cold")
+    parser.add_argument("--bulk-max-size", type=int, default=100, help="Largest catalog to run /full on")
+    parser.add_argument("--bulk-requests", type=int, default=5, help="Requests per bulk scenario")
+    parser.add_argument("--lm-latency", type=float, default=0.8, help="Mean synthetic LM latency (s)")
+    parser.add_argument("--lm-jitter", type=float, default=0.5, help="Latency jitter (fraction)")
+    parser.add_argument("--lm-error-rate", type=float, default=0.0, help="Synthetic 429/503 rate")
+    parser.add_argument("--lm-rpm", type=int, help="LM requests/minute limit (default GROQ_REQUESTS_PER_MINUTE)")
+    parser.add_argument("--lm-tpm", type=int, help="LM tokens/minute limit (default GROQ_TOKENS_PER_MINUTE)")
+    parser.add_argument("--lm-concurrency", type=int, help="LM concurrency cap (default LM_MAX_CONCURRENCY)")
+    parser.add_argument("--store", choices=["json", "sqlite"], default="json", help="Experience store")
+    parser.add_argument("--output", help="Result file (default benchmarks/<time>-<rev>.json)")
+    parser.add_argument("--compare", help="Earlier result file to diff against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regression threshold (fraction)")
+    # Internal: run one size in this process
+    parser.add_argument("--run-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size is not None:
+        child_main(args)
+        return
+
+    with open(BACKEND_DIR / "data" / "experiences.json") as f:
+        base = json.load(f)
+
+    revision = git_revision()
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {name: getattr(args, name) for name in (
+            "concurrency", "requests", "cold_requests", "bulk_max_size", "bulk_requests",
+            "lm_latency", "lm_jitter", "lm_error_rate", "lm_rpm", "lm_tpm", "lm_concurrency", "store",
+        )},
+        "results": {},
+        "lm_client": {},
+    }
+    for size in args.sizes:
+        result = run_in_subprocess(size, args, base)
+        report["results"][str(size)] = result["scenarios"]
+        report["lm_client"][str(size)] = result["lm"]
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{revision}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results: {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        print(f"\n📊 Compared with {args.compare} (revision {baseline.get('revision', '?')})",
+              file=sys.stderr)
+        for line in regressions:
+            print(f"  ⚠️  {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("  ✅ No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
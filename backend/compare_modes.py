@@ -0,0 +1,129 @@
+"""
+Compare chain and fast mode for the UX and visual workers.
+
+Runs each worker on the same inputs as analyze_site.py in both modes and
+reports latency, LM tokens and output-field coverage side by side, so we can
+pick a mode per use case. Stage and LM caches are bypassed so every run pays
+for its calls; runs are sequential so token counts can be attributed.
+
+Usage:
+    python compare_modes.py                 # both workers, 1 run per mode
+    python compare_modes.py --runs 3 --workers ux
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from config import DSPY_LM_MODEL
+from analyze_site import STAGE_CACHE, run_ux, run_visual
+from workers.fused import MODES
+from workers.lm_client import configure_lm, lm_stats
+from workers.ux_designer import UX_STEPS
+from workers.visual_designer import VISUAL_STEPS
+
+WORKERS = {
+    "ux": (run_ux, UX_STEPS),
+    "visual": (run_visual, VISUAL_STEPS),
+}
+
+
+def token_count() -> int:
+    stats = lm_stats().get(DSPY_LM_MODEL, {})
+    return stats.get("prompt_tokens", 0) + stats.get("completion_tokens", 0)
+
+
+def is_filled(value) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, (str, list, dict)):
+        return bool(value)
+    return True
+
+
+def coverage(result: dict, steps: dict) -> tuple:
+    """(filled output fields, expected output fields) across all steps."""
+    expected = filled = 0
+    for name, step in steps.items():
+        prediction = result[name]
+        for field in step.output_fields:
+            expected += 1
+            filled += is_filled(prediction.get(field))
+    return filled, expected
+
+
+def measure(run, steps: dict, mode: str) -> dict:
+    tokens_before = token_count()
+    started = time.perf_counter()
+    try:
+        result = run(mode)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}",
+                "seconds": time.perf_counter() - started,
+                "tokens": token_count() - tokens_before}
+    filled, expected = coverage(result, steps)
+    return {
+        "seconds": time.perf_counter() - started,
+        "tokens": token_count() - tokens_before,
+        "filled": filled,
+        "expected": expected,
+    }
+
+
+def summarize(runs: list) -> dict:
+    ok = [run for run in runs if "error" not in run]
+    summary = {"runs": len(runs), "errors": len(runs) - len(ok)}
+    if ok:
+        summary.update({
+            "median_seconds": round(statistics.median(run["seconds"] for run in ok), 2),
+            "median_tokens": int(statistics.median(run["tokens"] for run in ok)),
+            "coverage": round(sum(run["filled"] for run in ok) / sum(run["expected"] for run in ok), 3),
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare chain vs fast mode for the audit workers")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per worker per mode")
+    parser.add_argument("--workers", nargs="*", choices=list(WORKERS), default=list(WORKERS))
+    parser.add_argument("--output", default="mode_comparison.json", help="Where to write the results")
+    args = parser.parse_args()
+
+    print(f"📡 Connecting to {DSPY_LM_MODEL}...")
+    # No LM response cache: every run has to pay for its own calls
+    configure_lm(DSPY_LM_MODEL, cache=False)
+    STAGE_CACHE.refresh = True
+    print("✅ DSPy configured\n")
+
+    results = {}
+    for name in args.workers:
+        run, steps = WORKERS[name]
+        results[name] = {}
+        for mode in MODES:
+            runs = []
+            for i in range(args.runs):
+                print(f"⏳ {name} / {mode} run {i + 1}/{args.runs}...")
+                runs.append(measure(run, steps, mode))
+            results[name][mode] = {**summarize(runs), "samples": runs}
+
+    print("\n" + "=" * 72)
+    print(f"{'worker':<8} {'mode':<6} {'median s':>9} {'tokens':>8} {'coverage':>9} {'errors':>7}")
+    print("-" * 72)
+    for name, modes in results.items():
+        for mode, summary in modes.items():
+            if "median_seconds" in summary:
+                print(f"{name:<8} {mode:<6} {summary['median_seconds']:>9.1f} "
+                      f"{summary['median_tokens']:>8} {summary['coverage']:>8.0%} "
+                      f"{summary['errors']:>7}")
+            else:
+                print(f"{name:<8} {mode:<6} {'-':>9} {'-':>8} {'-':>9} {summary['errors']:>7}")
+    print("=" * 72)
+
+    with open(args.output, "w") as f:
+        json.dump({"model": DSPY_LM_MODEL, "timestamp": time.time(), "results": results}, f, indent=2)
+    print(f"\n💾 Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,3 +10,128 @@ GROQ_MODEL = "groq/llama-3.3-70b-versatile"
 
 # DSPy configuration
 DSPY_LM_MODEL = GROQ_MODEL
+
+# Language the copywriter writes in; the others are derived from it
+BASE_LANGUAGE = "EN"
+# Cheaper model for deriving other languages from the base (English) content
+LOCALIZATION_LM_MODEL = os.getenv("LOCALIZATION_LM_MODEL", "groq/llama-3.1-8b-instant")
+
+# Smaller, faster tier that compiled programs can target (optimize.py --model)
+FAST_LM_MODEL = os.getenv("FAST_LM_MODEL", "groq/llama-3.1-8b-instant")
+
+# LM backend: "groq" (live), or "record" / "replay" / "synthetic" for offline,
+# deterministic runs (see workers/replay_lm.py)
+DSPY_LM_BACKEND = os.getenv("DSPY_LM_BACKEND", "groq")
+
+DATA_DIR = Path(__file__).parent / "data"
+# Everything generated (caches, artifact, SQLite store, audit logs, training
+# examples, compiled programs) defaults to here. Other backends get their own
+# tree, so recorded, replayed or synthetic output never lands in the caches a
+# live server serves from
+GENERATED_DIR = DATA_DIR if DSPY_LM_BACKEND == "groq" else DATA_DIR / "offline" / DSPY_LM_BACKEND
+
+# Content cache (in-memory LRU + one JSON file per entry on disk)
+CONTENT_CACHE_DIR = Path(os.getenv(
+    "CONTENT_CACHE_DIR", GENERATED_DIR / "cache" / "content"
+))
+CONTENT_CACHE_MAX_ENTRIES = int(os.getenv("CONTENT_CACHE_MAX_ENTRIES", "512"))
+
+# Per-step cache for the multi-step audit workers (UX, visual)
+STAGE_CACHE_DIR = Path(os.getenv(
+    "STAGE_CACHE_DIR", GENERATED_DIR / "cache" / "stages"
+))
+STAGE_CACHE_MAX_ENTRIES = int(os.getenv("STAGE_CACHE_MAX_ENTRIES", "256"))
+
+# Stale-while-revalidate: content older than the TTL is served immediately
+# and regenerated in the background
+CONTENT_TTL_SECONDS = float(os.getenv("CONTENT_TTL_SECONDS", str(7 * 24 * 3600)))
+CONTENT_RETRY_AFTER_FAILURE_SECONDS = float(os.getenv("CONTENT_RETRY_AFTER_FAILURE_SECONDS", "60"))
+# `?refresh=true` on the stream endpoint is ignored for content younger than this,
+# so anonymous clients can't force a paid generation on every request
+CONTENT_REFRESH_MIN_AGE_SECONDS = float(os.getenv("CONTENT_REFRESH_MIN_AGE_SECONDS", "300"))
+
+# Pregenerated content artifact (written by pregenerate.py, loaded by the API at startup)
+CONTENT_ARTIFACT_PATH = Path(os.getenv(
+    "CONTENT_ARTIFACT_PATH", GENERATED_DIR / "generated_content.json"
+))
+
+# Shared by record and replay, so not under GENERATED_DIR
+LM_CASSETTE_DIR = Path(os.getenv(
+    "LM_CASSETTE_DIR", DATA_DIR / "cassettes"
+))
+# Replay: synthesize unrecorded requests instead of failing; sleep for the recorded duration
+LM_REPLAY_FALLBACK = os.getenv("LM_REPLAY_FALLBACK", "false").lower() == "true"
+LM_REPLAY_REALTIME = os.getenv("LM_REPLAY_REALTIME", "false").lower() == "true"
+# Synthetic: mean latency in seconds (+/- jitter fraction) and injected 429/503 rate
+SYNTHETIC_LATENCY_SECONDS = float(os.getenv("SYNTHETIC_LATENCY_SECONDS", "0.8"))
+SYNTHETIC_LATENCY_JITTER = float(os.getenv("SYNTHETIC_LATENCY_JITTER", "0.5"))
+SYNTHETIC_ERROR_RATE = float(os.getenv("SYNTHETIC_ERROR_RATE", "0"))
+SYNTHETIC_SEED_FILES = [
+    Path(__file__).parent / "generated_content_sample.json",
+    Path(__file__).parent / "site_analysis_report.json",
+]
+
+# Groq rate limits for our tier
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))
+
+# Max parallel generations for the bulk /api/experiences/full endpoint
+BULK_GENERATION_CONCURRENCY = int(os.getenv("BULK_GENERATION_CONCURRENCY", "4"))
+
+# Cache-Control max-age (seconds) for the read-only catalog endpoints
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "300"))
+
+# Experience store: "json" (data/experiences.json in memory) or "sqlite"
+# (synced from the JSON file into an indexed database at startup)
+EXPERIENCE_STORE = os.getenv("EXPERIENCE_STORE", "json")
+EXPERIENCES_PATH = Path(os.getenv(
+    "EXPERIENCES_PATH", DATA_DIR / "experiences.json"
+))
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", GENERATED_DIR / "experiences.db"))
+
+# Shared LM client (workers/lm_client.py)
+LM_MAX_CONCURRENCY = int(os.getenv("LM_MAX_CONCURRENCY", "8"))
+LM_MAX_RETRIES = int(os.getenv("LM_MAX_RETRIES", "5"))
+LM_HTTP_MAX_CONNECTIONS = int(os.getenv("LM_HTTP_MAX_CONNECTIONS", "32"))
+
+# How many audit workers analyze_site.py runs at once
+AUDIT_PARALLELISM = int(os.getenv("AUDIT_PARALLELISM", "3"))
+# Append-only log of every audit run, one JSON-lines file per run (workers/audit_log.py)
+AUDIT_LOG_DIR = Path(os.getenv("AUDIT_LOG_DIR", GENERATED_DIR / "audits"))
+# Latest audit report; the live one is also a seed file for synthetic completions
+AUDIT_REPORT_PATH = Path(os.getenv(
+    "AUDIT_REPORT_PATH",
+    Path(__file__).parent / "site_analysis_report.json" if DSPY_LM_BACKEND == "groq"
+    else GENERATED_DIR / "site_analysis_report.json"
+))
+
+# Background job queue (api/jobs.py): worker processes for generation and audit
+# jobs, and how long finished jobs' results stay available
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+
+# Targeted re-requests of copywriter fields that fail validation (0 = accept as-is)
+COPYWRITER_REPAIR_ATTEMPTS = int(os.getenv("COPYWRITER_REPAIR_ATTEMPTS", "1"))
+
+# Per-field model routing (workers/routing.py): each copywriter call is split
+# into concurrent sub-requests, one per field group, each on its own model tier
+COPYWRITER_ROUTING = os.getenv("COPYWRITER_ROUTING", "false").lower() == "true"
+COPYWRITER_ROUTE_MODELS = {
+    "copy": os.getenv("COPYWRITER_COPY_MODEL", DSPY_LM_MODEL),        # description, highlights
+    "tagline": os.getenv("COPYWRITER_TAGLINE_MODEL", FAST_LM_MODEL),
+    "scores": os.getenv("COPYWRITER_SCORES_MODEL", FAST_LM_MODEL),    # the five *_score fields
+}
+
+# Approved copywriter examples (optimize.py approve) and the compiled program
+# built from them (optimize.py compile). The server loads the program at
+# startup if it exists, on the model it was compiled for
+TRAINING_EXAMPLES_PATH = Path(os.getenv(
+    "TRAINING_EXAMPLES_PATH", GENERATED_DIR / "training" / "copywriter.json"
+))
+COPYWRITER_PROGRAM_PATH = Path(os.getenv(
+    "COPYWRITER_PROGRAM_PATH", GENERATED_DIR / "programs" / "copywriter.json"
+))
+
+# Copywriter candidates generated per experience (at spread temperatures); the
+# one the brand-voice linter scores best is kept (1 = single generation)
+COPYWRITER_CANDIDATES = int(os.getenv("COPYWRITER_CANDIDATES", "1"))
@@ -0,0 +1,72 @@
+"""
+Lint generated content against the brand voice (no LM calls).
+
+Checks content files - a single content dict like generated_content_sample.json
+or a pregenerate.py artifact - for banned phrases, cliché density and length
+targets (workers/brand_voice.py), and exits non-zero if any banned phrase is
+found, so it can gate a pregenerated artifact before it ships.
+
+Usage:
+    python lint_content.py                                  # sample + artifact
+    python lint_content.py data/generated_content.json
+    python lint_content.py --min-score 80 generated_content_sample.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from config import CONTENT_ARTIFACT_PATH
+from workers.brand_voice import lint
+
+SAMPLE_PATH = Path(__file__).parent / "generated_content_sample.json"
+
+
+def contents(path: Path) -> dict:
+    """{name: content} for a content file or a pregenerate.py artifact."""
+    with open(path) as f:
+        data = json.load(f)
+    if "items" in data:
+        return {slug: item["content"] for slug, item in data["items"].items()}
+    return {path.name: data}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lint generated content against the brand voice")
+    parser.add_argument("paths", nargs="*", help="Content files or artifacts (default: sample and artifact)")
+    parser.add_argument("--min-score", type=float, default=0, help="Also fail items scoring below this")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or [p for p in (SAMPLE_PATH, CONTENT_ARTIFACT_PATH) if p.exists()]
+    failed = 0
+    linted = 0
+    seconds = 0.0
+    for path in paths:
+        print(f"📄 {path}")
+        for name, content in contents(path).items():
+            started = time.perf_counter()
+            report = lint(content)
+            seconds += time.perf_counter() - started
+            linted += 1
+
+            bad = report.banned or report.score < args.min_score
+            failed += bool(bad)
+            print(f"  {'❌' if bad else '✅'} {name}: {report.score}")
+            if report.banned:
+                print(f"     banned:  {', '.join(report.banned)}")
+            if report.cliches:
+                print(f"     clichés: {', '.join(report.cliches)} ({report.cliche_density:.1f} per 100 words)")
+            if report.length:
+                print(f"     length:  {', '.join(report.length)} off target")
+
+    if linted:
+        print(f"\n⏱️  {linted} items in {seconds * 1000:.2f}ms ({seconds / linted * 1e6:.0f}µs per item)")
+    if failed:
+        print(f"❌ {failed} of {linted} items failed the brand-voice lint")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Compile the copywriter into an optimized program, and measure what it buys.
+
+1. approve - copy pregenerated content that passes validation and the brand
+             voice lint into the approved examples (data/training/copywriter.json;
+             edit by hand to curate)
+2. compile - BootstrapFewShot over the approved examples, with DSPY_LM_MODEL
+             as the teacher, for `--model` (default: same model; `--fast` for
+             FAST_LM_MODEL); saved to data/programs/copywriter.json, which the
+             API, job workers and pregenerate.py load at startup
+3. eval    - run the baseline (uncompiled, DSPY_LM_MODEL), the uncompiled
+             copywriter on the compiled program's model, and the compiled
+             program over the held-out examples, and report latency, tokens
+             and metric side by side. LM caches are bypassed, as in
+             compare_modes.py
+
+Usage:
+    python optimize.py approve --min-score 90
+    python optimize.py compile --fast
+    python optimize.py eval
+    rm data/programs/copywriter.json       # back to the uncompiled copywriter
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+
+from config import (
+    DSPY_LM_MODEL, FAST_LM_MODEL, CONTENT_ARTIFACT_PATH, COPYWRITER_PROGRAM_PATH,
+    EXPERIENCES_PATH, TRAINING_EXAMPLES_PATH,
+)
+from workers.brand_voice import lint
+from workers.copywriter import ExperienceCopywriter, content_values, copywriter_inputs
+from workers.lm_client import build_backend_lm, configure_lm, lm_stats
+from workers.programs import (
+    compile_copywriter, copywriter_metric, load_examples, load_program, save_program,
+)
+from workers.validation import validate_fields
+
+EVAL_REPORT_PATH = COPYWRITER_PROGRAM_PATH.with_name("copywriter_eval.json")
+
+
+def split(examples: list, dev_fraction: float) -> tuple:
+    """Deterministic (trainset, devset); with too few examples both are everything."""
+    examples = list(examples)
+    random.Random(0).shuffle(examples)
+    dev_size = round(len(examples) * dev_fraction)
+    if dev_size == 0 or dev_size == len(examples):
+        print(f"⚠️  Only {len(examples)} examples: training and evaluating on the same ones")
+        return examples, examples
+    return examples[dev_size:], examples[:dev_size]
+
+
+def approve(args):
+    """Add artifact content that passes every check to the approved examples."""
+    with open(EXPERIENCES_PATH) as f:
+        experiences = {exp["slug"]: exp for exp in json.load(f)}
+    with open(args.artifact) as f:
+        items = json.load(f)["items"]
+
+    path = Path(args.examples)
+    training = {"examples": {}}
+    if path.exists():
+        with open(path) as f:
+            training = json.load(f)
+
+    added = 0
+    for slug, item in sorted(items.items()):
+        exp = experiences.get(slug)
+        if exp is None or (slug in training["examples"] and not args.replace):
+            continue
+        report = lint(item["content"])
+        failures = validate_fields(content_values(item["content"]))
+        if failures or report.banned or report.score < args.min_score:
+            reasons = [problem for _, problem in failures.values()] or [f"lint score {report.score}"]
+            print(f"  ⏭️  {slug}: {'; '.join(reasons)}")
+            continue
+        training["examples"][slug] = {
+            "inputs": copywriter_inputs(exp),
+            "content": item["content"],
+            "approved_at": time.time(),
+        }
+        added += 1
+        print(f"  ✅ {slug} ({report.score})")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(training, f, indent=2)
+    os.replace(tmp_path, path)
+    print(f"\n💾 {added} added, {len(training['examples'])} approved examples in {path}")
+
+
+def compile_program(args):
+    examples = load_examples(Path(args.examples))
+    if not examples:
+        raise SystemExit(f"No approved examples in {args.examples} (run: python optimize.py approve)")
+    trainset, devset = split(examples, args.dev_fraction)
+    model = FAST_LM_MODEL if args.fast else args.model
+
+    print(f"📡 Teacher {DSPY_LM_MODEL}, compiling for {model}...")
+    teacher = configure_lm(DSPY_LM_MODEL)
+    started = time.perf_counter()
+    compiled = compile_copywriter(trainset, teacher_lm=teacher, max_demos=args.max_demos)
+    demos = {name: len(predictor.demos) for name, predictor in compiled.named_predictors()}
+
+    save_program(
+        compiled, Path(args.output), model,
+        teacher=DSPY_LM_MODEL,
+        optimizer="BootstrapFewShot",
+        trainset=[example.slug for example in trainset],
+        devset=[example.slug for example in devset],
+        demos=demos,
+    )
+    print(f"✅ Compiled in {time.perf_counter() - started:.1f}s: {demos}")
+    print(f"💾 Program: {args.output} (run: python optimize.py eval)")
+
+
+def token_count(model: str) -> int:
+    stats = lm_stats().get(model, {})
+    return stats.get("prompt_tokens", 0) + stats.get("completion_tokens", 0)
+
+
+def measure(copywriter: ExperienceCopywriter, model: str, devset: list) -> dict:
+    """Sequential runs over `devset`, so tokens can be attributed per call."""
+    runs = []
+    for example in devset:
+        tokens_before = token_count(model)
+        started = time.perf_counter()
+        try:
+            content = copywriter(**example.inputs())
+        except Exception as e:
+            runs.append({"slug": example.slug, "error": f"{type(e).__name__}: {e}"})
+            continue
+        runs.append({
+            "slug": example.slug,
+            "seconds": round(time.perf_counter() - started, 3),
+            "tokens": token_count(model) - tokens_before,
+            "metric": copywriter_metric(example, content),
+        })
+
+    ok = [run for run in runs if "error" not in run]
+    summary = {"model": model, "runs": len(runs), "errors": len(runs) - len(ok)}
+    if ok:
+        summary.update({
+            "median_seconds": round(statistics.median(run["seconds"] for run in ok), 2),
+            "mean_tokens": int(statistics.mean(run["tokens"] for run in ok)),
+            "mean_metric": round(statistics.mean(run["metric"] for run in ok), 3),
+        })
+    return {**summary, "samples": runs}
+
+
+def evaluate(args):
+    compiled = ExperienceCopywriter()
+    program = load_program(compiled, Path(args.program))
+    if program is None:
+        raise SystemExit(f"No usable compiled program at {args.program} (run: python optimize.py compile)")
+    model = program["model"]
+    devset = [example for example in load_examples(Path(args.examples)) if example.slug in program["devset"]]
+    if not devset:
+        raise SystemExit("None of the program's held-out examples are still approved")
+
+    print(f"📡 Evaluating on {len(devset)} held-out examples (LM caches off)...")
+    # No LM response cache: every run has to pay for its own calls. Every
+    # variant gets its own LM built the same way, whichever model it runs on
+    configure_lm(DSPY_LM_MODEL, cache=False)
+    variants = {"baseline": (ExperienceCopywriter(), DSPY_LM_MODEL)}
+    if model != DSPY_LM_MODEL:
+        variants["uncompiled"] = (ExperienceCopywriter(), model)
+    variants["compiled"] = (compiled, model)
+    for copywriter, variant_model in variants.values():
+        copywriter.set_lm(build_backend_lm(variant_model, cache=False))
+
+    results = {}
+    for name, (copywriter, variant_model) in variants.items():
+        print(f"⏳ {name} ({variant_model})...")
+        results[name] = measure(copywriter, variant_model, devset)
+
+    print("\n" + "=" * 78)
+    print(f"{'variant':<11} {'model':<32} {'median s':>9} {'tokens':>7} {'metric':>7} {'errors':>7}")
+    print("-" * 78)
+    for name, summary in results.items():
+        if "median_seconds" in summary:
+            print(f"{name:<11} {summary['model']:<32} {summary['median_seconds']:>9.2f} "
+                  f"{summary['mean_tokens']:>7} {summary['mean_metric']:>7.3f} {summary['errors']:>7}")
+        else:
+            print(f"{name:<11} {summary['model']:<32} {'-':>9} {'-':>7} {'-':>7} {summary['errors']:>7}")
+    print("=" * 78)
+
+    baseline, candidate = results["baseline"], results["compiled"]
+    if "median_seconds" in baseline and "median_seconds" in candidate:
+        print(f"Compiled vs baseline: latency {candidate['median_seconds'] / baseline['median_seconds'] - 1:+.0%}, "
+              f"tokens {candidate['mean_tokens'] / max(baseline['mean_tokens'], 1) - 1:+.0%}, "
+              f"metric {candidate['mean_metric'] - baseline['mean_metric']:+.3f}")
+
+    with open(args.output, "w") as f:
+        json.dump({"program": args.program, "timestamp": time.time(), "results": results}, f, indent=2)
+    print(f"\n💾 Report: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and evaluate the copywriter program")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    approve_parser = commands.add_parser("approve", help="Approve pregenerated content as examples")
+    approve_parser.add_argument("--artifact", default=str(CONTENT_ARTIFACT_PATH), help="pregenerate.py artifact")
+    approve_parser.add_argument("--min-score", type=float, default=90, help="Minimum brand-voice lint score")
+    approve_parser.add_argument("--replace", action="store_true", help="Replace examples already approved")
+    approve_parser.set_defaults(run=approve)
+
+    compile_parser = commands.add_parser("compile", help="Compile and save the copywriter program")
+    compile_parser.add_argument("--model", default=DSPY_LM_MODEL, help="Model the program will run on")
+    compile_parser.add_argument("--fast", action="store_true", help=f"Compile for {FAST_LM_MODEL}")
+    compile_parser.add_argument("--max-demos", type=int, default=4, help="Bootstrapped (and labeled) demos")
+    compile_parser.add_argument("--dev-fraction", type=float, default=0.3, help="Examples held out for eval")
+    compile_parser.add_argument("--output", default=str(COPYWRITER_PROGRAM_PATH), help="Program path")
+    compile_parser.set_defaults(run=compile_program)
+
+    eval_parser = commands.add_parser("eval", help="Compare the compiled program against the baseline")
+    eval_parser.add_argument("--program", default=str(COPYWRITER_PROGRAM_PATH), help="Program path")
+    eval_parser.add_argument("--output", default=str(EVAL_REPORT_PATH), help="Where to write the report")
+    eval_parser.set_defaults(run=evaluate)
+
+    for command in (approve_parser, compile_parser, eval_parser):
+        command.add_argument("--examples", default=str(TRAINING_EXAMPLES_PATH), help="Approved examples")
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
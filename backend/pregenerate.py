@@ -0,0 +1,205 @@
+"""
+Pregenerate AI content for the whole experience catalog.
+
+Runs ExperienceCopywriter over every entry in data/experiences.json with
+bounded concurrency, inside Groq's requests/minute and tokens/minute limits.
+Results are written after every experience to a content artifact that
+api/main.py loads at startup, so an interrupted run resumes where it stopped.
+A compiled copywriter program (optimize.py) is used, on its model, if saved.
+
+Usage:
+    python pregenerate.py                      # generate everything missing
+    python pregenerate.py --concurrency 8      # more parallel calls
+    python pregenerate.py --only wine-cheese-basel --force
+    python pregenerate.py --localize           # also derive every experience's other languages
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from config import (
+    DSPY_LM_MODEL, LOCALIZATION_LM_MODEL, CONTENT_ARTIFACT_PATH, GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE,
+    LM_MAX_RETRIES, EXPERIENCES_PATH,
+)
+from workers.copywriter import content_key, copywriter_inputs, program_fingerprint
+from workers.localizer import ExperienceLocalizer, target_languages
+from workers.lm_client import build_backend_lm, configure_lm, lm_stats
+from workers.programs import copywriter_models, load_copywriter
+
+DATA_PATH = EXPERIENCES_PATH
+
+
+def load_artifact(path: Path) -> dict:
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return {"model": DSPY_LM_MODEL, "items": {}, "failed": {}}
+
+
+def save_artifact(path: Path, artifact: dict):
+    """Atomic write so an interrupted run never corrupts the artifact."""
+    artifact["updated_at"] = time.time()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(artifact, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class Pregenerator:
+    """Generates content for a batch of experiences and records it in the artifact.
+
+    Rate limits, adaptive concurrency and 429/5xx retries are handled by the
+    shared LM client; the semaphore only caps how many experiences are in
+    progress at once. With a localizer, each experience's other languages
+    are derived in one extra call, reusing base content that is up to date.
+    """
+
+    def __init__(self, copywriter, artifact: dict, artifact_path: Path, concurrency: int,
+                 localizer=None, force: bool = False, model: str = DSPY_LM_MODEL):
+        self.copywriter = copywriter
+        self.model = model
+        self.program = program_fingerprint(copywriter)
+        self.localizer = localizer
+        self.force = force
+        self.artifact = artifact
+        self.artifact_path = artifact_path
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(self, exp: dict):
+        inputs = copywriter_inputs(exp)
+        key = content_key(inputs, self.model, self.program)
+
+        async with self.semaphore:
+            started = time.perf_counter()
+            item = self.artifact["items"].get(exp["slug"])
+            try:
+                if item is None or item["key"] != key or self.force:
+                    item = {
+                        "key": key,
+                        "content": await self.copywriter.acall(**inputs),
+                        "generated_at": time.time(),
+                    }
+                if self.localizer is not None and needs_localization(exp, item):
+                    # One call for all of the experience's other languages
+                    item["localized"] = await self.localizer.acall(
+                        content=item["content"], languages=target_languages(exp)
+                    )
+                    item["localization_model"] = LOCALIZATION_LM_MODEL
+            except Exception as e:
+                print(f"❌ {exp['slug']}: {e}")
+                self.artifact["failed"][exp["slug"]] = f"{type(e).__name__}: {e}"
+                save_artifact(self.artifact_path, self.artifact)
+                return False
+
+            self.artifact["items"][exp["slug"]] = item
+            self.artifact["failed"].pop(exp["slug"], None)
+            save_artifact(self.artifact_path, self.artifact)
+            print(f"✅ {exp['slug']} ({time.perf_counter() - started:.1f}s)")
+            return True
+
+
+def needs_localization(exp: dict, item: dict) -> bool:
+    """True if the item lacks one of the experience's languages or used another model."""
+    if not target_languages(exp):
+        return False
+    return (item.get("localization_model") != LOCALIZATION_LM_MODEL
+            or set(target_languages(exp)) - set(item.get("localized") or {}))
+
+
+def pending_experiences(experiences: list, artifact: dict, force: bool, localize: bool = False,
+                        model: str = DSPY_LM_MODEL, program: Optional[str] = None) -> list:
+    """Experiences without up-to-date content (new, failed, inputs/prompt changed,
+    or, with `localize`, missing a language)."""
+    if force:
+        return experiences
+    pending = []
+    for exp in experiences:
+        item = artifact["items"].get(exp["slug"])
+        if (item is None or item["key"] != content_key(copywriter_inputs(exp), model, program)
+                or (localize and needs_localization(exp, item))):
+            pending.append(exp)
+    return pending
+
+
+async def run(args):
+    with open(DATA_PATH) as f:
+        experiences = json.load(f)
+    if args.only:
+        experiences = [exp for exp in experiences if exp["slug"] in args.only]
+
+    artifact_path = Path(args.output)
+    artifact = load_artifact(artifact_path)
+    # Limits are per model and fixed by its first LM, so every tier gets them from the start
+    limits = dict(
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_concurrency=args.concurrency,
+        max_retries=args.max_retries,
+    )
+    copywriter, model = load_copywriter(lm_kwargs=limits)
+    artifact["model"] = model
+    todo = pending_experiences(experiences, artifact, args.force, args.localize,
+                               model, program_fingerprint(copywriter))
+
+    print(f"📦 {len(experiences)} experiences, {len(experiences) - len(todo)} up to date, "
+          f"{len(todo)} to generate")
+    if not todo:
+        return
+
+    print(f"📡 Connecting to {DSPY_LM_MODEL}...")
+    configure_lm(DSPY_LM_MODEL, **limits)
+    print(f"✅ DSPy configured (concurrency {args.concurrency}, "
+          f"{args.rpm} req/min, {args.tpm} tokens/min)\n")
+
+    pregenerator = Pregenerator(
+        copywriter=copywriter,
+        artifact=artifact,
+        artifact_path=artifact_path,
+        concurrency=args.concurrency,
+        localizer=ExperienceLocalizer(lm=build_backend_lm(LOCALIZATION_LM_MODEL)) if args.localize else None,
+        force=args.force,
+        model=model,
+    )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(pregenerator.generate(exp) for exp in todo))
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "=" * 60)
+    print(f"Generated: {sum(results)}/{len(todo)} in {elapsed:.1f}s")
+    if artifact["failed"]:
+        print(f"Failed: {', '.join(sorted(artifact['failed']))} (re-run to retry)")
+    # Summed over every model the copywriter calls (one per tier when routed)
+    stats = [lm_stats().get(name, {}) for name in copywriter_models(copywriter, model)]
+    total = {
+        counter: sum(s.get(counter, 0) for s in stats)
+        for counter in ("requests", "retries", "rate_limited", "prompt_tokens", "completion_tokens")
+    }
+    print(f"LM: {total['requests']} requests, {total['retries']} retries, "
+          f"{total['rate_limited']} rate-limited, "
+          f"{total['prompt_tokens'] + total['completion_tokens']} tokens")
+    print(f"💾 Artifact: {artifact_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pregenerate AI content for all experiences")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max parallel LM calls")
+    parser.add_argument("--rpm", type=int, default=GROQ_REQUESTS_PER_MINUTE, help="Requests per minute")
+    parser.add_argument("--tpm", type=int, default=GROQ_TOKENS_PER_MINUTE, help="Tokens per minute")
+    parser.add_argument("--max-retries", type=int, default=LM_MAX_RETRIES, help="Retries on 429/5xx")
+    parser.add_argument("--output", default=str(CONTENT_ARTIFACT_PATH), help="Artifact path")
+    parser.add_argument("--only", nargs="*", help="Only these slugs")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if up to date")
+    parser.add_argument("--localize", action="store_true",
+                        help=f"Also localize into each experience's languages ({LOCALIZATION_LM_MODEL})")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 """Test the DSPy copywriter worker."""
 
-import dspy
 from workers.copywriter import ExperienceCopywriter
-from config import GROQ_API_KEY, DSPY_LM_MODEL
+from workers.lm_client import configure_lm
+from config import DSPY_LM_MODEL
 import json
 
 def main():
@@ -10,8 +10,7 @@ def main():
 
     # Configure DSPy
     print(f"📡 Connecting to {DSPY_LM_MODEL}...")
-    lm = dspy.LM(DSPY_LM_MODEL, api_key=GROQ_API_KEY)
-    dspy.configure(lm=lm)
+    configure_lm(DSPY_LM_MODEL)
     print("✅ DSPy configured\n")
 
     # Initialize copywriter
@@ -0,0 +1,192 @@
+"""
+Audit Log - append-only record of site audit runs, and diffs between them
+
+Each analyze_site.py run gets a JSON-lines file in AUDIT_LOG_DIR, named by
+start time so the files sort chronologically. A line is written (and
+fsynced) as each section finishes, so a run that dies part-way keeps every
+section it completed, and a resumed run only redoes the rest:
+
+    {"event": "start", "run_id": ..., "mode": ..., "sections": [...], ...}
+    {"event": "section", "name": "ux_analysis", "fingerprint": ..., "report": {...}, ...}
+    {"event": "failed", "name": "tech_analysis", "error": ...}
+    {"event": "finish", "timestamp": ...}
+
+`diff_reports` compares two runs' reports list field by list field. LM
+wording drifts between runs, so items are matched with difflib rather than
+by equality: an item at least DIFF_SIMILARITY alike to one from the older
+run is "persisting", the rest are "new" or "resolved".
+"""
+
+import difflib
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# How alike two issues must be (difflib ratio) to count as the same one
+DIFF_SIMILARITY = 0.75
+
+
+class AuditLog:
+    """One run's log file (see module docstring)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.run_id = self.path.stem
+
+    @classmethod
+    def create(cls, directory: Path, **meta) -> "AuditLog":
+        """Start a new run; `meta` (mode, sections, ...) goes in its start event."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        log = cls(directory / f"{run_id}.jsonl")
+        log.append({"event": "start", "run_id": run_id, "timestamp": datetime.now().isoformat(), **meta})
+        return log
+
+    def append(self, event: dict):
+        """Write one event and make it durable before returning."""
+        line = json.dumps(event, default=str)
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def events(self) -> List[dict]:
+        events = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn last line of a run killed mid-write
+                    break
+        return events
+
+    @property
+    def meta(self) -> dict:
+        return self.events()[0]
+
+    @property
+    def finished(self) -> bool:
+        return any(event["event"] == "finish" for event in self.events())
+
+    def sections(self) -> Dict[str, dict]:
+        """Completed sections' events by report key (the last one wins)."""
+        return {event["name"]: event for event in self.events() if event["event"] == "section"}
+
+    def failures(self) -> Dict[str, str]:
+        """Sections whose last attempt failed."""
+        failed = {}
+        for event in self.events():
+            if event["event"] == "failed":
+                failed[event["name"]] = event["error"]
+            elif event["event"] == "section":
+                failed.pop(event["name"], None)
+        return failed
+
+    def report(self) -> dict:
+        """The run's report as analyze_site.py writes it."""
+        meta = self.meta
+        report = {
+            "run_id": self.run_id,
+            "timestamp": meta["timestamp"],
+            "site_url": meta.get("site_url"),
+            "mode": meta.get("mode"),
+            **{name: event["report"] for name, event in self.sections().items()},
+        }
+        failed = self.failures()
+        if failed:
+            report["failed_sections"] = failed
+        return report
+
+
+def list_runs(directory: Path) -> List[AuditLog]:
+    """Every logged run, oldest first."""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    return [AuditLog(path) for path in sorted(directory.glob("*.jsonl"))]
+
+
+def find_run(directory: Path, run_id: str) -> AuditLog:
+    log = AuditLog(Path(directory) / f"{run_id}.jsonl")
+    if not log.path.exists():
+        raise FileNotFoundError(f"No audit run {run_id} in {directory}")
+    return log
+
+
+def latest_run(directory: Path, finished: bool, exclude: Optional[str] = None) -> Optional[AuditLog]:
+    """Most recent run that is (or isn't) finished."""
+    for log in reversed(list_runs(directory)):
+        if log.run_id != exclude and log.finished == finished:
+            return log
+    return None
+
+
+def item_text(item) -> str:
+    """Comparable text for a report item (issues are strings or small dicts)."""
+    if isinstance(item, dict):
+        return " ".join(str(value) for _, value in sorted(item.items()))
+    return str(item)
+
+
+def diff_items(old: list, new: list, similarity: float = DIFF_SIMILARITY) -> Dict[str, list]:
+    """{"new": [...], "resolved": [...], "persisting": [...]} between two lists of issues.
+
+    Each new item is paired with the most similar unpaired old item, if
+    that one is at least `similarity` alike.
+    """
+    old_texts = [item_text(item).lower() for item in old]
+    unmatched = set(range(len(old)))
+    result = {"new": [], "resolved": [], "persisting": []}
+    for item in new:
+        matcher = difflib.SequenceMatcher(None, "", item_text(item).lower())
+        best, best_ratio = None, similarity
+        for i in sorted(unmatched):
+            matcher.set_seq1(old_texts[i])
+            # quick_ratio is an upper bound on ratio and much cheaper
+            if matcher.quick_ratio() >= best_ratio and matcher.ratio() >= best_ratio:
+                best, best_ratio = i, matcher.ratio()
+        if best is None:
+            result["new"].append(item)
+        else:
+            unmatched.discard(best)
+            result["persisting"].append(item)
+    result["resolved"] = [old[i] for i in sorted(unmatched)]
+    return result
+
+
+def diff_reports(old: dict, new: dict) -> Dict[str, dict]:
+    """Per section present in both reports: list fields diffed, changed scalars as {old, new}."""
+    changes = {}
+    for name, section in new.items():
+        previous = old.get(name)
+        if not name.endswith("_analysis") or not isinstance(section, dict) or not isinstance(previous, dict):
+            continue
+        fields = {}
+        for field, value in section.items():
+            if field == "stages" or field not in previous:
+                continue
+            if isinstance(value, list) and isinstance(previous[field], list):
+                fields[field] = diff_items(previous[field], value)
+            elif isinstance(value, (int, float, str)) and value != previous[field]:
+                fields[field] = {"old": previous[field], "new": value}
+        changes[name] = fields
+    return changes
+
+
+def count_changes(changes: Dict[str, dict]) -> Dict[str, Dict[str, int]]:
+    """Per section: how many issues are new, resolved and persisting.
+
+    Only list fields count; a changed scalar (`{"old", "new"}`) is not an issue.
+    """
+    return {
+        name: {
+            kind: sum(len(diff[kind]) for diff in fields.values() if "persisting" in diff)
+            for kind in ("new", "resolved", "persisting")
+        }
+        for name, fields in changes.items()
+    }
@@ -0,0 +1,91 @@
+"""
+Audit Runner - runs independent audit workers concurrently
+
+Each AuditSection wraps one worker call plus how to turn its output into a
+report section. The runner executes sections on a bounded thread pool and
+hands each one back as soon as it finishes, so wall time is roughly the
+slowest worker's chain instead of the sum of all of them.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+
+class AuditSection:
+    """One independent step of the site audit.
+
+    Args:
+        name: Report key (e.g. "ux_analysis")
+        title: Heading printed above the section
+        run: Calls the worker and returns its raw output
+        report: Turns the raw output into a JSON-serializable dict
+        render: Prints a report dict
+        fingerprint: Hash of everything the result depends on (inputs,
+            prompts, model); equal fingerprints mean a logged result can be
+            reused instead of running the section again
+    """
+
+    def __init__(self, name: str, title: str, run: Callable[[], Any],
+                 report: Callable[[Any], dict], render: Callable[[dict], None],
+                 fingerprint: Optional[str] = None):
+        self.name = name
+        self.title = title
+        self.run = run
+        self.report = report
+        self.render = render
+        self.fingerprint = fingerprint
+
+    def execute(self) -> dict:
+        return self.report(self.run())
+
+
+class SectionResult:
+    """Outcome of one section: its report or the error that stopped it.
+
+    `reused_from` is the audit run the report was taken from, when the
+    section didn't run at all (see workers/audit_log.py).
+    """
+
+    def __init__(self, section: AuditSection, report: Optional[dict] = None,
+                 error: Optional[Exception] = None, seconds: float = 0.0,
+                 reused_from: Optional[str] = None):
+        self.section = section
+        self.report = report
+        self.error = error
+        self.seconds = seconds
+        self.reused_from = reused_from
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_audit(sections: List[AuditSection], parallelism: int = 3,
+              on_complete: Optional[Callable[[SectionResult], None]] = None) -> Dict[str, SectionResult]:
+    """Run `sections` with at most `parallelism` at a time.
+
+    `on_complete` is called from the calling thread, in completion order, so
+    sections print whole rather than interleaved. A failing section does not
+    stop the others.
+    """
+    results = {}
+
+    def timed(section: AuditSection):
+        started = time.perf_counter()
+        try:
+            return section.execute(), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, parallelism)) as pool:
+        futures = {pool.submit(timed, section): section for section in sections}
+        for future in as_completed(futures):
+            section = futures[future]
+            report, error, seconds = future.result()
+            result = SectionResult(section, report, error, seconds)
+            results[section.name] = result
+            if on_complete is not None:
+                on_complete(result)
+
+    return results
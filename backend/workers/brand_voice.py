@@ -0,0 +1,154 @@
+"""
+Brand Voice Linter - local, regex-based scoring of copywriter output
+
+GenerateExperienceContent's instructions ban phrases ("hidden gem",
+"journey", "curated", "indulge", ...) that the LM still produces now and
+then. `lint` checks generated content against one compiled pattern (the
+phrase lists folded into a character trie) covering every banned phrase and
+softer cliché, plus the length targets, and scores it in microseconds -
+cheap enough to gate every generation and to pick the best of several
+candidates without an LM review call.
+
+Scoring (100 = clean):
+- each banned phrase:              -BANNED_PENALTY
+- clichés per 100 words of text:   -CLICHE_PENALTY each (density, so long copy isn't punished for length)
+- each field off its length target: -LENGTH_PENALTY
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from .signatures import HIGHLIGHT_COUNT, WORD_TARGETS
+
+# Banned outright by the signature, with their inflections
+BANNED = (
+    "hidden gem", "hidden gems", "off the beaten path", "off the beaten track", "like a local",
+    "intoxicating", "mesmerize", "mesmerizes", "mesmerized", "mesmerizing", "mesmerise", "mesmerising",
+    "unforgettable", "don't miss", "dont miss", "once in a lifetime", "once-in-a-lifetime",
+    "curate", "curates", "curated", "curating", "curation", "journey", "journeys", "tapestry", "tapestries",
+    "treasure", "treasures", "gem", "gems", "discover", "discovers", "discovered", "discovering",
+    "indulge", "indulges", "indulged", "indulging", "indulgence", "savor", "savors", "savored", "savoring",
+    "savour", "savours", "savoured", "savouring", "embark", "embarks", "embarked", "embarking",
+)
+# Brochure language the voice avoids; tolerated once in a while, so scored by density
+CLICHES = (
+    "best", "unique", "amazing", "stunning", "breathtaking", "nestled", "vibrant", "must-see", "must see",
+    "bustling", "charming", "picturesque", "world-class", "world class", "exquisite", "delight", "delights",
+    "delightful", "immerse", "immersed", "immersive", "authentic", "iconic", "unparalleled",
+)
+
+
+def trie_regex(phrases) -> str:
+    """Alternation of `phrases` nested as a character trie.
+
+    A flat "a|b|c|..." makes the regex engine try every phrase at every
+    position; nested by shared prefix, a position fails after one character
+    unless some phrase starts there.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            return f"(?:{'|'.join(branches)})?" if branches else ""
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return build(trie)
+
+
+PHRASES = frozenset(BANNED) | frozenset(CLICHES)
+_BANNED = frozenset(BANNED)
+
+# One pass over lowercased text finds both kinds (IGNORECASE would make the
+# engine fold case at every step); the lookahead skips word starts no phrase
+# begins with before entering the trie
+PATTERN = re.compile(r"\b(?=[{}])(?:{})\b".format(
+    "".join(sorted({phrase[0] for phrase in PHRASES})), trie_regex(PHRASES),
+))
+
+TEXT_FIELDS = ("tagline", "description", "highlights")
+
+BANNED_PENALTY = 15
+CLICHE_PENALTY = 5
+LENGTH_PENALTY = 10
+
+
+def text_of(value) -> str:
+    return " ".join(value) if isinstance(value, list) else str(value or "")
+
+
+def find_phrases(text: str) -> List[Tuple[str, str]]:
+    """[(kind, phrase), ...] for every banned phrase / cliché in `text`, in order."""
+    return [("banned" if phrase in _BANNED else "cliche", phrase) for phrase in PATTERN.findall(text.lower())]
+
+
+def length_problems(content: Dict[str, object]) -> List[str]:
+    """Fields outside the signature's targets (strict, unlike validation's slack)."""
+    problems = []
+    for name, (low, high) in WORD_TARGETS.items():
+        words = len(text_of(content.get(name)).split())
+        if not low <= words <= high:
+            problems.append(name)
+    highlights = content.get("highlights") or []
+    low, high = HIGHLIGHT_COUNT
+    if not low <= len(highlights) <= high:
+        problems.append("highlights")
+    return problems
+
+
+class LintReport:
+    """Findings and score for one piece of content."""
+
+    def __init__(self, findings: Dict[str, List[Tuple[str, str]]], length: List[str], words: int):
+        self.findings = findings
+        self.length = length
+        self.words = words
+
+    def phrases(self, kind: str) -> List[str]:
+        return [phrase for found in self.findings.values() for k, phrase in found if k == kind]
+
+    @property
+    def banned(self) -> List[str]:
+        return self.phrases("banned")
+
+    @property
+    def cliches(self) -> List[str]:
+        return self.phrases("cliche")
+
+    @property
+    def cliche_density(self) -> float:
+        """Clichés per 100 words."""
+        return 100 * len(self.cliches) / max(self.words, 1)
+
+    @property
+    def score(self) -> float:
+        score = (100 - BANNED_PENALTY * len(self.banned) - CLICHE_PENALTY * self.cliche_density
+                 - LENGTH_PENALTY * len(self.length))
+        return round(max(score, 0.0), 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "score": self.score,
+            "banned": self.banned,
+            "cliches": self.cliches,
+            "cliche_density": round(self.cliche_density, 2),
+            "length": self.length,
+        }
+
+
+def lint(content: Dict[str, object]) -> LintReport:
+    """Lint copywriter output (the values dict or the API payload: same text fields)."""
+    findings = {}
+    words = 0
+    for name in TEXT_FIELDS:
+        text = text_of(content.get(name))
+        words += len(text.split())
+        found = find_phrases(text)
+        if found:
+            findings[name] = found
+    return LintReport(findings, length_problems(content), words)
@@ -0,0 +1,142 @@
+"""
+Content Cache - Two-tier cache for AI worker output
+
+Entries live in a size-capped in-memory LRU and are written through to one
+JSON file per key on disk, so warm reads skip the LM entirely and survive
+restarts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .telemetry import record_cache_lookup
+
+
+def signature_hash(signature) -> str:
+    """Stable hash of a DSPy signature's instructions and field descriptions.
+
+    Editing the docstring, a field description or a field type changes the
+    hash, which invalidates every cache entry produced under the old prompt.
+    """
+    parts = [signature.instructions]
+    for name, field in {**signature.input_fields, **signature.output_fields}.items():
+        extra = field.json_schema_extra or {}
+        parts.append(
+            f"{name}|{extra.get('__dspy_field_type')}|{extra.get('desc')}|{field.annotation}"
+        )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def make_key(*parts) -> str:
+    """Hash arbitrary JSON-serializable parts into a cache key."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ContentCache:
+    """Size-capped in-memory LRU backed by a directory of JSON files.
+
+    Each entry is a dict with at least `key`, `content` and `generated_at`
+    (unix seconds). Extra metadata passed to `set` is stored alongside.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 512, name: str = "content"):
+        self.name = name
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the entry for `key`, or None. Disk hits are promoted to memory."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            record_cache_lookup(self.name, hit=True)
+            return entry
+
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            record_cache_lookup(self.name, hit=False)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, entry)
+        record_cache_lookup(self.name, hit=True)
+        return entry
+
+    def preload(self, key: str) -> bool:
+        """Load `key` from disk into memory without counting a lookup (cache warmup)."""
+        with self._lock:
+            if key in self._memory:
+                return True
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        with self._lock:
+            self._remember(key, entry)
+        return True
+
+    def set(self, key: str, content, generated_at: Optional[float] = None, **meta) -> dict:
+        """Store `content` under `key` in memory and on disk."""
+        entry = {
+            **meta,
+            "key": key,
+            "content": content,
+            "generated_at": generated_at if generated_at is not None else time.time(),
+        }
+
+        # Atomic write so a crash never leaves a half-written entry behind
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or self._path(key).exists()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory footprint."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+        }
@@ -1,16 +1,121 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import dspy
+from dspy.streaming import StreamListener, StreamResponse
+
+from config import COPYWRITER_CANDIDATES, COPYWRITER_REPAIR_ATTEMPTS
+
+from .brand_voice import lint
+from .cache import make_key, signature_hash
 from .signatures import GenerateExperienceContent
+from .telemetry import record_brand_voice, record_field_failure, record_field_repair
+from .validation import OUTPUT_FIELDS, clamp_scores, repair_inputs, validate_fields
+
+# Experience fields the copywriter reads, in signature order
+COPYWRITER_INPUTS = list(GenerateExperienceContent.input_fields)
+
+# Text fields streamed token by token; the rest arrive with the final prediction
+STREAMED_FIELDS = ("tagline", "description")
+
+# Sampling temperatures best-of-N candidates are spread over
+CANDIDATE_TEMPERATURES = (0.7, 1.0)
+
+
+def threaded_map(fn, items: list) -> list:
+    """`[fn(item) for item in items]`, all at once on threads.
+
+    Each thread runs in a copy of the caller's context, so a surrounding
+    `dspy.context(lm=...)` and the telemetry labels still apply (a bare
+    ThreadPoolExecutor would drop them).
+    """
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+
+def candidate_temperatures(n: int) -> list:
+    """`n` temperatures evenly spread over CANDIDATE_TEMPERATURES."""
+    low, high = CANDIDATE_TEMPERATURES
+    if n == 1:
+        return [low]
+    return [round(low + (high - low) * i / (n - 1), 3) for i in range(n)]
+
+
+def sampling(temperature: Optional[float]) -> dict:
+    """Predictor call kwargs overriding the temperature (none for the LM's default)."""
+    return {} if temperature is None else {"config": {"temperature": temperature}}
+
+
+def copywriter_inputs(exp: dict) -> dict:
+    """Pick the signature inputs out of an experience record."""
+    return {name: exp[name] for name in COPYWRITER_INPUTS}
+
+
+def content_values(content: dict) -> dict:
+    """GenerateExperienceContent output fields from an API payload (inverse of `_format`)."""
+    scores = content.get("stimulus_scores") or {}
+    return {
+        "tagline": content.get("tagline"),
+        "description": content.get("description"),
+        "highlights": content.get("highlights"),
+        **{f"{sense}_score": scores.get(sense) for sense in ("taste", "sight", "sound", "thought", "connect")},
+    }
+
+
+def program_fingerprint(copywriter: "ExperienceCopywriter") -> str:
+    """The prompt part of a content key: the signature hash, plus a hash of
+    the demos and instructions a compiled program (optimize.py) adds.
+
+    An uncompiled copywriter gets the bare signature hash, so its keys don't
+    change.
+    """
+    prompt = signature_hash(GenerateExperienceContent)
+    compiled = [
+        (name, predictor.signature.instructions, [dict(demo) for demo in predictor.demos])
+        for name, predictor in copywriter.named_predictors()
+        if predictor.demos or predictor.signature.instructions != GenerateExperienceContent.instructions
+    ]
+    return f"{prompt}-{make_key(compiled)[:16]}" if compiled else prompt
+
+
+def content_key(inputs: dict, model: str, program: Optional[str] = None) -> str:
+    """Cache key for generated content.
+
+    Covers the input fields, the GenerateExperienceContent prompt (or the
+    compiled program's `program_fingerprint`) and the model, so changing any
+    of them forces a regeneration.
+    """
+    return make_key("copywriter", program or signature_hash(GenerateExperienceContent), model, inputs)
+
 
 class ExperienceCopywriter(dspy.Module):
     """AI worker that generates compelling experience content.
 
     Uses DSPy ChainOfThought to reason about the best way to present
     each experience based on its unique characteristics.
+
+    Every output field is validated (workers/validation.py). Fields that
+    fail are re-requested together in one Predict call that asks for just
+    those fields, up to `repair_attempts` times; the fields that passed are
+    kept. Scores still out of range after that are clamped.
+
+    With `candidates` > 1, that many generations run in parallel at spread
+    temperatures and only the best goes on to validation: one that passes
+    it if any does, then the highest brand-voice lint score
+    (workers/brand_voice.py). Streaming always generates a single candidate.
     """
 
-    def __init__(self):
+    def __init__(self, repair_attempts: int = COPYWRITER_REPAIR_ATTEMPTS,
+                 candidates: int = COPYWRITER_CANDIDATES):
         super().__init__()
         self.generate = dspy.ChainOfThought(GenerateExperienceContent)
+        # Signature is cut down to the failed fields on each call
+        self.repair = dspy.Predict(GenerateExperienceContent)
+        self.repair_attempts = repair_attempts
+        self.candidates = max(1, candidates)
 
     def forward(self, **kwargs):
         """Generate content for an experience.
@@ -27,18 +132,134 @@ class ExperienceCopywriter(dspy.Module):
         Returns:
             dict with tagline, description, highlights, stimulus_scores
         """
-        result = self.generate(**kwargs)
+        if self.candidates == 1:
+            predictions = [self._draft(kwargs)]
+        else:
+            predictions = threaded_map(lambda t: self._draft(kwargs, t), candidate_temperatures(self.candidates))
+        values = self._select(predictions)
+        failures = self._check(values)
+        for _ in range(self.repair_attempts):
+            if not failures:
+                break
+            repaired = self.repair(**repair_inputs(kwargs, values, failures))
+            values, failures = self._merge(values, failures, repaired)
+        return self._format(self._settle(values, failures))
+
+    async def aforward(self, **kwargs):
+        """Async variant of `forward` (used via `await copywriter.acall(...)`).
+
+        Awaits the LM call instead of blocking a thread for its duration.
+        """
+        if self.candidates == 1:
+            predictions = [await self._adraft(kwargs)]
+        else:
+            predictions = await asyncio.gather(*(
+                self._adraft(kwargs, t) for t in candidate_temperatures(self.candidates)
+            ))
+        return await self._avalidated(kwargs, self._select(predictions))
+
+    def _draft(self, inputs: dict, temperature: Optional[float] = None) -> dspy.Prediction:
+        """One complete generation (a candidate), before validation."""
+        return self.generate(**inputs, **sampling(temperature))
+
+    async def _adraft(self, inputs: dict, temperature: Optional[float] = None) -> dspy.Prediction:
+        return await self.generate.acall(**inputs, **sampling(temperature))
+
+    async def _avalidated(self, inputs: dict, values: dict) -> dict:
+        """Validate (and repair) generated values without blocking the event loop."""
+        failures = self._check(values)
+        for _ in range(self.repair_attempts):
+            if not failures:
+                break
+            repaired = await self.repair.acall(**repair_inputs(inputs, values, failures))
+            values, failures = self._merge(values, failures, repaired)
+        return self._format(self._settle(values, failures))
+
+    async def stream(self, **kwargs):
+        """Stream content while it is generated.
+
+        Async generator yielding `(field, chunk)` for each piece of tagline and
+        description text as the LM produces it, then `("done", content)` with
+        the same dict `forward` returns.
+        """
+        # Listeners keep per-stream state, so build a fresh program per call
+        program = dspy.streamify(
+            self.generate,
+            stream_listeners=[StreamListener(signature_field_name=name) for name in STREAMED_FIELDS],
+        )
+        async for item in program(**kwargs):
+            if isinstance(item, StreamResponse):
+                yield item.signature_field_name, item.chunk
+            elif isinstance(item, dspy.Prediction):
+                # Streamed text is provisional: fields that fail validation are replaced here
+                yield "done", await self._avalidated(kwargs, self._select([item]))
+
+    @staticmethod
+    def _values(prediction) -> dict:
+        return {name: prediction.get(name) for name in OUTPUT_FIELDS}
+
+    def _select(self, predictions: list) -> dict:
+        """Values of the best candidate: passing validation first, then by lint score."""
+        candidates = [self._values(prediction) for prediction in predictions]
+        ranked = [((not validate_fields(values), lint(values).score), values) for values in candidates]
+        best = max(range(len(ranked)), key=lambda i: ranked[i][0])
+        for i, ((_, score), _) in enumerate(ranked):
+            record_brand_voice(score, selected=i == best)
+        if len(ranked) > 1:
+            scores = ", ".join(str(score) for (_, score), _ in ranked)
+            print(f"🎯 Picked candidate {best + 1} of {len(ranked)} (brand-voice scores: {scores})")
+        return ranked[best][1]
+
+    @staticmethod
+    def _check(values: dict) -> dict:
+        """Failures of a first attempt, counted per field."""
+        failures = validate_fields(values)
+        for name, (reason, _) in failures.items():
+            record_field_failure(name, reason)
+        if failures:
+            print(f"⚠️  Invalid fields: {'; '.join(problem for _, problem in failures.values())}")
+        return failures
+
+    @staticmethod
+    def _merge(values: dict, failures: dict, repaired) -> tuple:
+        """Take the repaired fields that now pass; returns `(values, remaining failures)`.
+
+        A field whose repair still fails keeps its earlier value (and failure),
+        so a worse repair never replaces it.
+        """
+        merged = dict(values)
+        for name in failures:
+            merged[name] = repaired.get(name, values[name])
+        problems = validate_fields(merged)
+        remaining = {}
+        for name, failure in failures.items():
+            if name in problems:
+                merged[name] = values[name]
+                remaining[name] = failure
+            else:
+                record_field_repair(name, repaired=True)
+        return merged, remaining
+
+    @staticmethod
+    def _settle(values: dict, failures: dict) -> dict:
+        """Accept what's left after the repair attempts, clamping scores into range."""
+        for name in failures:
+            record_field_repair(name, repaired=False)
+        if failures:
+            print(f"⚠️  Keeping fields that failed validation: {', '.join(failures)}")
+        return clamp_scores(values)
 
-        # Format output
+    def _format(self, values: dict):
+        """Shape GenerateExperienceContent outputs into the API payload."""
         return {
-            "tagline": result.tagline,
-            "description": result.description,
-            "highlights": result.highlights,
+            "tagline": values["tagline"],
+            "description": values["description"],
+            "highlights": values["highlights"],
             "stimulus_scores": {
-                "taste": result.taste_score,
-                "sight": result.sight_score,
-                "sound": result.sound_score,
-                "thought": result.thought_score,
-                "connect": result.connect_score,
+                "taste": values["taste_score"],
+                "sight": values["sight_score"],
+                "sound": values["sound_score"],
+                "thought": values["thought_score"],
+                "connect": values["connect_score"],
             }
         }
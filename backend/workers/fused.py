@@ -0,0 +1,46 @@
+"""
+Fused Signatures - one-call variants of the multi-step workers
+
+The UX and visual workers normally chain three ChainOfThought steps, three
+sequential round trips each with its own rationale. A fused signature asks
+for every step's outputs in a single structured Predict call; the result is
+split back into per-step predictions so callers see the same shape in both
+modes.
+"""
+
+from typing import Dict, Sequence
+
+import dspy
+
+MODES = ("chain", "fast")
+
+
+def fuse_signatures(summary: str, steps: Sequence[type]) -> type:
+    """Signature with the first step's inputs and every step's outputs.
+
+    `summary` replaces the first line of the first step's instructions; the
+    rest of them (brand context, design philosophy) is kept. Later steps'
+    inputs are dropped: they only carried the previous step's summary, which
+    the fused call produces itself.
+    """
+    first = steps[0]
+    _, _, context = first.instructions.partition("\n")
+    fused = first
+    for step in steps[1:]:
+        for name, field in step.output_fields.items():
+            fused = fused.append(name, field, type_=field.annotation)
+    return fused.with_instructions(f"{summary}\n{context}".strip())
+
+
+def split_prediction(prediction: dspy.Prediction, steps: Dict[str, type]) -> Dict[str, dspy.Prediction]:
+    """{'analysis': Step1, ...} -> {'analysis': Prediction(step1 outputs), ...}"""
+    return {
+        name: dspy.Prediction(**{field: prediction.get(field) for field in step.output_fields})
+        for name, step in steps.items()
+    }
+
+
+def check_mode(mode: str) -> str:
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r} (expected one of {', '.join(MODES)})")
+    return mode
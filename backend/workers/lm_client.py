@@ -0,0 +1,392 @@
+"""
+LM Client - the one place workers get their language model from
+
+Every script and the API build their LM through `configure_lm()` /
+`build_lm()`, which returns a `ManagedLM`: a `dspy.LM` that goes through
+
+- pooled HTTP connections (one keep-alive httpx client per process for litellm)
+- a requests/minute + tokens/minute token bucket sized to our Groq tier
+- AIMD adaptive concurrency (grow slowly on success, halve on 429/5xx)
+- jittered exponential backoff on 429/5xx, honouring Retry-After
+
+Limits are shared by every LM built for the same model, including copies
+DSPy makes internally, but not across processes: processes that share one
+Groq tier each take a `split_limits()` share of it. `lm_stats()` exposes the counters for monitoring;
+latency and token usage also go to Prometheus (see telemetry.py).
+
+With DSPY_LM_BACKEND set to record/replay/synthetic, `configure_lm()` returns
+the offline ReplayLM instead (see replay_lm.py). Its replayed and synthetic
+completions go through the same limiter, concurrency control and retries.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+import dspy
+import httpx
+import litellm
+from dspy.utils.callback import BaseCallback
+
+from config import (
+    GROQ_API_KEY, DSPY_LM_MODEL, DSPY_LM_BACKEND, GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE,
+    LM_MAX_CONCURRENCY, LM_MAX_RETRIES, LM_HTTP_MAX_CONNECTIONS,
+)
+
+from .rate_limit import RateLimiter
+from .telemetry import (
+    CURRENT_STEP, CURRENT_STEPS, CURRENT_WORKER, predictor_names, record_lm_call, record_lm_error,
+)
+
+# build_lm() arguments that configure the shared controls rather than the LM
+LIMIT_KWARGS = ("requests_per_minute", "tokens_per_minute", "max_concurrency", "max_retries")
+
+RETRYABLE_ERRORS = (
+    "RateLimitError", "ServiceUnavailableError", "InternalServerError",
+    "APIConnectionError", "Timeout", "APITimeoutError",
+)
+
+
+def error_status(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    return error_status(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: Exception) -> bool:
+    """429s, 5xx, timeouts and dropped connections are worth retrying."""
+    status = error_status(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header on the provider's response, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, error: Exception, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff, never shorter than Retry-After."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    hinted = retry_after(error)
+    return max(delay, hinted) if hinted is not None else delay
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit.
+
+    Each success raises the limit by 1/limit (about +1 per limit's worth of
+    calls); each 429/5xx halves it. Callers block while in-flight calls are
+    at the limit.
+    """
+
+    def __init__(self, initial: float, minimum: float = 1, maximum: float = 64):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def _try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def aacquire(self):
+        # Waiting on the Condition would block the event loop; poll instead
+        delay = 0.01
+        while not self._try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    def release(self, overloaded: Optional[bool] = False):
+        """Free a slot; `overloaded` None (e.g. a cancelled call) leaves the limit as is."""
+        with self._cond:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif overloaded is not None:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class LMControls:
+    """Limiter, concurrency control and counters shared by all LMs of one model."""
+
+    def __init__(self, model: str, requests_per_minute: int, tokens_per_minute: int,
+                 max_concurrency: int, max_retries: int):
+        self.model = model
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(
+            initial=max(1, max_concurrency // 2), maximum=max_concurrency
+        )
+        self.max_retries = max_retries
+        self.counters = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        # DSPy deep-copies programs (and their LMs); copies must share limits
+        return self
+
+    def count(self, **increments):
+        with self._lock:
+            self.counters.update(increments)
+
+    def count_error(self, error: Exception):
+        with self._lock:
+            self.errors[type(error).__name__] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            errors = dict(self.errors)
+        return {
+            "model": self.model,
+            **counters,
+            "errors": errors,
+            "in_flight": self.concurrency.in_flight,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "tokens_per_call_estimate": self.limiter.tokens_per_call,
+        }
+
+
+def response_usage(response) -> Dict[str, int]:
+    """Token usage of a litellm response (dict or object), {} if unknown."""
+    usage = getattr(response, "usage", None)
+    if not usage:
+        return {}
+    if not isinstance(usage, dict):
+        usage = {name: getattr(usage, name, 0) for name in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    return {name: int(usage.get(name) or 0) for name in ("prompt_tokens", "completion_tokens", "total_tokens")}
+
+
+class ControlledCalls:
+    """The call path every LM of ours goes through (see module docstring).
+
+    `_controlled(call, ...)` runs `call` under `self.controls`: it waits for
+    the token bucket and a concurrency slot, retries 429/5xx with backoff,
+    and records usage. ManagedLM wraps litellm with it; ReplayLM wraps its
+    replayed and synthetic completions, so offline runs exercise the same
+    limiter, AIMD and retries.
+    """
+
+    controls: LMControls
+
+    def _record(self, response, estimate: int, started: float):
+        usage = response_usage(response)
+        cache_hit = bool(getattr(response, "cache_hit", False))
+        self.controls.limiter.settle(estimate, 0 if cache_hit else usage.get("total_tokens"))
+        record_lm_call(self.model, time.perf_counter() - started, usage, cache_hit)
+        self.controls.count(
+            successes=1,
+            cache_hits=int(cache_hit),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            latency_ms_total=int((time.perf_counter() - started) * 1000),
+        )
+
+    def _failed(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failure; return the backoff delay, or None to give up."""
+        self.controls.count_error(error)
+        record_lm_error(self.model, error)
+        self.controls.count(rate_limited=int(is_rate_limited(error)))
+        if attempt >= self.controls.max_retries or not is_retryable(error):
+            self.controls.count(failures=1)
+            return None
+        self.controls.count(retries=1)
+        return backoff_delay(attempt, error)
+
+    def _controlled(self, call, *args, **kwargs):
+        controls = self.controls
+        for attempt in range(controls.max_retries + 1):
+            estimate = controls.limiter.acquire()
+            controls.concurrency.acquire()
+            controls.count(requests=1)
+            started = time.perf_counter()
+            # None: cancelled (client gone, timeout), so the slot comes back without
+            # moving the limit; finally makes sure it comes back at all
+            overloaded = None
+            try:
+                response = call(*args, **kwargs)
+            except Exception as e:
+                overloaded = is_retryable(e)
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                overloaded = False
+                self._record(response, estimate, started)
+                return response
+            finally:
+                controls.concurrency.release(overloaded=overloaded)
+            time.sleep(delay)
+
+    async def _acontrolled(self, call, *args, **kwargs):
+        controls = self.controls
+        for attempt in range(controls.max_retries + 1):
+            estimate = await controls.limiter.aacquire()
+            await controls.concurrency.aacquire()
+            controls.count(requests=1)
+            started = time.perf_counter()
+            overloaded = None
+            try:
+                response = await call(*args, **kwargs)
+            except Exception as e:
+                overloaded = is_retryable(e)
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+            else:
+                overloaded = False
+                self._record(response, estimate, started)
+                return response
+            finally:
+                controls.concurrency.release(overloaded=overloaded)
+            await asyncio.sleep(delay)
+
+
+class ManagedLM(ControlledCalls, dspy.LM):
+    """dspy.LM that respects shared rate limits, adapts concurrency and retries."""
+
+    def __init__(self, model: str, controls: LMControls, **kwargs):
+        # Retries are ours (with limiter-aware backoff), not litellm's
+        super().__init__(model, num_retries=0, **kwargs)
+        self.controls = controls
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        return self._controlled(super().forward, prompt=prompt, messages=messages, **kwargs)
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        return await self._acontrolled(super().aforward, prompt=prompt, messages=messages, **kwargs)
+
+
+_controls: Dict[str, LMControls] = {}
+_controls_lock = threading.Lock()
+_http_pool_ready = False
+
+
+def _configure_http_pool():
+    """Give litellm one keep-alive connection pool per process (sync + async)."""
+    global _http_pool_ready
+    if _http_pool_ready:
+        return
+    limits = httpx.Limits(
+        max_connections=LM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LM_HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=60,
+    )
+    litellm.client_session = httpx.Client(limits=limits, timeout=120)
+    litellm.aclient_session = httpx.AsyncClient(limits=limits, timeout=120)
+    _http_pool_ready = True
+
+
+def get_controls(model: str, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 max_retries: Optional[int] = None) -> LMControls:
+    """Shared controls for `model`; overrides only apply when first created."""
+    with _controls_lock:
+        if model not in _controls:
+            _controls[model] = LMControls(
+                model,
+                requests_per_minute=requests_per_minute or GROQ_REQUESTS_PER_MINUTE,
+                tokens_per_minute=tokens_per_minute or GROQ_TOKENS_PER_MINUTE,
+                max_concurrency=max_concurrency or LM_MAX_CONCURRENCY,
+                max_retries=LM_MAX_RETRIES if max_retries is None else max_retries,
+            )
+        return _controls[model]
+
+
+def split_limits(processes: int) -> Dict[str, int]:
+    """Rate limits for one of `processes` processes sharing the Groq tier (LIMIT_KWARGS overrides)."""
+    return {
+        "requests_per_minute": max(1, GROQ_REQUESTS_PER_MINUTE // processes),
+        "tokens_per_minute": max(1, GROQ_TOKENS_PER_MINUTE // processes),
+        "max_concurrency": max(1, LM_MAX_CONCURRENCY // processes),
+    }
+
+
+def build_lm(model: Optional[str] = None, api_key: Optional[str] = None,
+             requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+             max_concurrency: Optional[int] = None, max_retries: Optional[int] = None,
+             **kwargs) -> ManagedLM:
+    """Build a managed LM for `model` (default DSPY_LM_MODEL)."""
+    model = model or DSPY_LM_MODEL
+    _configure_http_pool()
+    controls = get_controls(model, requests_per_minute, tokens_per_minute, max_concurrency, max_retries)
+    return ManagedLM(model, controls, api_key=api_key or GROQ_API_KEY, **kwargs)
+
+
+def build_backend_lm(model: Optional[str] = None, backend: Optional[str] = None, **kwargs) -> dspy.BaseLM:
+    """Build an LM for `model` on `backend` without making it the default.
+
+    `backend` (default DSPY_LM_BACKEND) is "groq" for the managed live LM, or
+    "record" / "replay" / "synthetic" for the offline ReplayLM. Use this for
+    secondary models (e.g. a cheaper one pinned to a single predictor).
+    """
+    backend = backend or DSPY_LM_BACKEND
+    if backend == "groq":
+        return build_lm(model, **kwargs)
+    # Imported here: replay_lm builds on this module
+    from .replay_lm import build_replay_lm
+    return build_replay_lm(model, backend, **kwargs)
+
+
+class TelemetryCallback(BaseCallback):
+    """Tags LM calls with the worker and step that made them (see telemetry.py)."""
+
+    def __init__(self):
+        self._tokens = {}
+
+    def on_module_start(self, call_id: str, instance, inputs: dict):
+        tokens = []
+        if isinstance(instance, dspy.Predict):
+            names = CURRENT_STEPS.get() or {}
+            tokens.append((CURRENT_STEP, CURRENT_STEP.set(names.get(id(instance), instance.signature.__name__))))
+        elif CURRENT_WORKER.get() is None:
+            tokens.append((CURRENT_WORKER, CURRENT_WORKER.set(type(instance).__name__)))
+            tokens.append((CURRENT_STEPS, CURRENT_STEPS.set(predictor_names(instance))))
+        if tokens:
+            self._tokens[call_id] = tokens
+
+    def on_module_end(self, call_id: str, outputs, exception: Optional[Exception] = None):
+        for var, token in reversed(self._tokens.pop(call_id, [])):
+            try:
+                var.reset(token)
+            except ValueError:
+                # Ended in a different context than it started; nothing to undo here
+                var.set(None)
+
+
+def configure_lm(model: Optional[str] = None, backend: Optional[str] = None, **kwargs) -> dspy.BaseLM:
+    """Build the LM (see `build_backend_lm`) and make it DSPy's default, with telemetry callbacks."""
+    lm = build_backend_lm(model, backend, **kwargs)
+    dspy.configure(lm=lm, callbacks=[TelemetryCallback()])
+    return lm
+
+
+def lm_stats() -> Dict[str, dict]:
+    """Counters for every model used in this process."""
+    with _controls_lock:
+        controls = list(_controls.values())
+    return {c.model: c.stats() for c in controls}
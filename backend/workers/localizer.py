@@ -0,0 +1,84 @@
+"""
+Experience Localizer - derives other languages from the base (English) copy
+
+The expensive ChainOfThought generation runs once per experience in the base
+language. Every other language comes from one batched Predict call (all of an
+experience's languages at once) on a cheaper model: localization needs no
+reasoning about the experience itself.
+"""
+
+from typing import Dict, List, Optional
+
+import dspy
+
+from config import BASE_LANGUAGE
+
+from .cache import make_key, signature_hash
+from .signatures import LocalizeExperienceContent
+
+
+def target_languages(exp: dict) -> List[str]:
+    """Languages an experience is offered in, other than the base language."""
+    return [lang.upper() for lang in exp.get("languages", []) if lang.upper() != BASE_LANGUAGE]
+
+
+def localized_key(base_key: str, lang: str, model: str) -> str:
+    """Cache key for one language of the content generated under `base_key`.
+
+    Regenerating the base content (new key), editing the localization prompt
+    or switching the localization model all force a new localization.
+    """
+    return make_key("localized", signature_hash(LocalizeExperienceContent), model, base_key, lang.upper())
+
+
+class ExperienceLocalizer(dspy.Module):
+    """Localize copywriter output into several languages in one LM call.
+
+    Args:
+        lm: LM for the localization pass (a cheaper model); None uses DSPy's default
+    """
+
+    def __init__(self, lm: Optional[dspy.BaseLM] = None):
+        super().__init__()
+        self.localize = dspy.Predict(LocalizeExperienceContent)
+        if lm is not None:
+            self.localize.lm = lm
+
+    def forward(self, content: dict, languages: List[str]) -> Dict[str, dict]:
+        """Return {lang: content}, same shape as the copywriter's output.
+
+        Languages the LM left out are missing from the result.
+        """
+        result = self.localize(**self._inputs(content, languages))
+        return self._split(content, languages, result)
+
+    async def aforward(self, content: dict, languages: List[str]) -> Dict[str, dict]:
+        result = await self.localize.acall(**self._inputs(content, languages))
+        return self._split(content, languages, result)
+
+    @staticmethod
+    def _inputs(content: dict, languages: List[str]) -> dict:
+        return {
+            "tagline": content["tagline"],
+            "description": content["description"],
+            "highlights": content["highlights"],
+            "languages": [lang.upper() for lang in languages],
+        }
+
+    @staticmethod
+    def _split(content: dict, languages: List[str], result) -> Dict[str, dict]:
+        """Per-language content; scores are language-independent and copied over."""
+        localized = {}
+        for lang in (lang.upper() for lang in languages):
+            tagline = (result.taglines or {}).get(lang)
+            description = (result.descriptions or {}).get(lang)
+            highlights = (result.localized_highlights or {}).get(lang)
+            if not (tagline and description and highlights):
+                continue
+            localized[lang] = {
+                "tagline": tagline,
+                "description": description,
+                "highlights": highlights,
+                "stimulus_scores": content["stimulus_scores"],
+            }
+        return localized
@@ -0,0 +1,167 @@
+"""
+Compiled Programs - optimized ExperienceCopywriter prompts, saved to disk
+
+ExperienceCopywriter otherwise runs its bare signature on the 70B model for
+every call. `compile_copywriter` runs DSPy's BootstrapFewShot over the
+approved examples in TRAINING_EXAMPLES_PATH: the teacher model writes
+content for each example, and the runs that score at least
+METRIC_THRESHOLD on `copywriter_metric` become few-shot demos. Together with
+the approved examples themselves, they are attached to the copywriter's
+prompt. The compiled program can target a smaller model than its teacher
+(FAST_LM_MODEL); the demos carry the big model's output into the small
+model's prompt.
+
+`save_program` writes the program state with the model it was compiled for
+and the signature hash it was compiled against. `load_copywriter` builds the
+copywriter the server runs: the RoutedCopywriter with COPYWRITER_ROUTING,
+else compiled on that model if a program is saved and still matches the
+signature, else the plain one on DSPY_LM_MODEL.
+"""
+
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import dspy
+from dspy.teleprompt import BootstrapFewShot
+
+from config import COPYWRITER_PROGRAM_PATH, COPYWRITER_ROUTING, DSPY_LM_MODEL
+
+from .brand_voice import lint
+from .cache import signature_hash
+from .copywriter import COPYWRITER_INPUTS, ExperienceCopywriter, content_values
+from .lm_client import build_backend_lm
+from .routing import RoutedCopywriter
+from .signatures import SCORE_RANGE, GenerateExperienceContent
+from .validation import OUTPUT_FIELDS, SCORE_FIELDS, validate_fields
+
+# Share of the metric for: fields passing validation, brand-voice lint score,
+# stimulus scores agreeing with the approved example's
+METRIC_WEIGHTS = {"valid": 0.4, "voice": 0.4, "scores": 0.2}
+# Teacher runs scoring at least this become demos
+METRIC_THRESHOLD = 0.9
+
+
+def copywriter_metric(example: dspy.Example, prediction, trace=None) -> float:
+    """Quality of copywriter output (the API payload) for `example`, 0-1."""
+    values = content_values(prediction)
+    valid = 1 - len(validate_fields(values)) / len(OUTPUT_FIELDS)
+    voice = lint(prediction).score / 100
+
+    low, high = SCORE_RANGE
+    distances = [
+        abs(values[name] - example[name]) / (high - low)
+        for name in SCORE_FIELDS
+        if isinstance(values[name], int) and isinstance(example.get(name), int)
+    ]
+    scores = 1 - statistics.mean(distances) if distances else 0.0
+
+    return round(
+        METRIC_WEIGHTS["valid"] * valid + METRIC_WEIGHTS["voice"] * voice + METRIC_WEIGHTS["scores"] * scores, 4
+    )
+
+
+def load_examples(path: Path) -> List[dspy.Example]:
+    """Approved examples (see optimize.py approve) as DSPy examples, inputs marked."""
+    if not path.exists():
+        return []
+    with open(path) as f:
+        examples = json.load(f)["examples"]
+    return [
+        dspy.Example(**item["inputs"], **content_values(item["content"]), slug=slug).with_inputs(*COPYWRITER_INPUTS)
+        for slug, item in sorted(examples.items())
+    ]
+
+
+def compile_copywriter(trainset: List[dspy.Example], teacher_lm: Optional[dspy.BaseLM] = None,
+                       max_demos: int = 4) -> ExperienceCopywriter:
+    """BootstrapFewShot-compiled copywriter (no LM attached; see module docstring).
+
+    The teacher runs without repairs or extra candidates, so a demo is
+    exactly what one `generate` call produced.
+    """
+    optimizer = BootstrapFewShot(
+        metric=copywriter_metric,
+        metric_threshold=METRIC_THRESHOLD,
+        teacher_settings={"lm": teacher_lm} if teacher_lm is not None else {},
+        max_bootstrapped_demos=max_demos,
+        max_labeled_demos=max_demos,
+    )
+    compiled = optimizer.compile(ExperienceCopywriter(repair_attempts=0, candidates=1), trainset=trainset)
+    # Repair prompts ask for a different set of fields on every call; whole-content demos don't fit them
+    compiled.repair.demos = []
+    return compiled
+
+
+def save_program(program: ExperienceCopywriter, path: Path, model: str, **metadata):
+    """Write the compiled program's state (atomically) with what it was compiled for."""
+    data = {
+        "program": "copywriter",
+        "model": model,
+        "signature": signature_hash(GenerateExperienceContent),
+        "compiled_at": time.time(),
+        **metadata,
+        "state": program.dump_state(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_program(program: ExperienceCopywriter, path: Path) -> Optional[dict]:
+    """Load a saved program's state into `program`; returns its metadata.
+
+    None if nothing is saved, or if GenerateExperienceContent changed since
+    it was compiled (its demos would teach the old prompt).
+    """
+    if not path.exists():
+        return None
+    with open(path) as f:
+        data = json.load(f)
+    if data["signature"] != signature_hash(GenerateExperienceContent):
+        print(f"⚠️  {path} was compiled for an older GenerateExperienceContent; "
+              f"using the uncompiled copywriter (re-run optimize.py compile)")
+        return None
+    program.load_state(data.pop("state"))
+    return data
+
+
+def load_copywriter(path: Path = COPYWRITER_PROGRAM_PATH, lm_kwargs: Optional[dict] = None,
+                    **kwargs) -> Tuple[ExperienceCopywriter, str]:
+    """`(copywriter, model)` for the copywriter the server runs (see module docstring).
+
+    `lm_kwargs` go to every LM built for a model other than DSPY_LM_MODEL
+    (e.g. rate limits, which apply per model from its first LM on); `kwargs`
+    go to the copywriter. The model is what content keys use; for the
+    routed copywriter it names every group's model.
+    """
+    if COPYWRITER_ROUTING:
+        copywriter = RoutedCopywriter(lm_kwargs=lm_kwargs, **kwargs)
+        if path.exists():
+            # Its demos were bootstrapped for the single-call signature
+            print(f"⚠️  COPYWRITER_ROUTING is on; not loading the compiled program at {path}")
+        print(f"✅ Routed copywriter ({', '.join(f'{g}: {m}' for g, m in copywriter.models.items())})")
+        return copywriter, copywriter.model
+
+    copywriter = ExperienceCopywriter(**kwargs)
+    program = load_program(copywriter, path)
+    if program is None:
+        return copywriter, DSPY_LM_MODEL
+    model = program["model"]
+    if model != DSPY_LM_MODEL:
+        copywriter.set_lm(build_backend_lm(model, **(lm_kwargs or {})))
+    demos = sum(len(predictor.demos) for _, predictor in copywriter.named_predictors())
+    print(f"✅ Loaded compiled copywriter ({demos} demos, {model})")
+    return copywriter, model
+
+
+def copywriter_models(copywriter: ExperienceCopywriter, model: str) -> List[str]:
+    """Every model `copywriter` (as returned by `load_copywriter`) calls."""
+    if isinstance(copywriter, RoutedCopywriter):
+        return sorted(set(copywriter.models.values()))
+    return [model]
@@ -0,0 +1,96 @@
+"""
+Rate Limiting - token buckets sized to the Groq tier
+
+Groq enforces requests/minute and tokens/minute separately, so a call has to
+fit both budgets before it goes out. Buckets refill continuously and can be
+shared between threads and asyncio tasks.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Continuous-refill bucket holding up to `capacity` units per `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` units and return how many seconds to wait before using them.
+
+        Requests larger than the capacity are clamped so they can still go out
+        once the bucket is full.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.rate
+
+    def refund(self, amount: float):
+        """Return unused units (e.g. when the real token count came in under the estimate)."""
+        with self._lock:
+            self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """Requests/minute + tokens/minute limiter.
+
+    Token usage is not known before a call, so callers reserve an estimate and
+    report the real count afterwards with `settle`. The running estimate
+    follows observed usage.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 tokens_per_call: int = 2500):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.tokens_per_call = tokens_per_call
+
+    def _reserve(self, tokens: Optional[int]) -> tuple:
+        estimate = tokens if tokens is not None else self.tokens_per_call
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimate))
+        return estimate, wait
+
+    def acquire(self, tokens: Optional[int] = None) -> int:
+        """Block until a call fits both budgets. Returns the reserved token estimate."""
+        estimate, wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return estimate
+
+    async def aacquire(self, tokens: Optional[int] = None) -> int:
+        """Async variant of `acquire`."""
+        estimate, wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return estimate
+
+    def settle(self, estimate: int, actual: Optional[int]):
+        """Reconcile a reservation with the real token count of the call.
+
+        `actual` of 0 (e.g. a cached response) refunds the whole estimate;
+        None means unknown and leaves the reservation as is.
+        """
+        if actual is None:
+            return
+        if actual == 0:
+            self.tokens.refund(estimate)
+            return
+        if actual < estimate:
+            self.tokens.refund(estimate - actual)
+        else:
+            self.tokens.reserve(actual - estimate)
+        # Exponential moving average keeps the per-call estimate honest
+        self.tokens_per_call = int(0.8 * self.tokens_per_call + 0.2 * actual)
@@ -0,0 +1,404 @@
+"""
+Replay LM - offline, deterministic stand-in for the Groq LM
+
+A dspy.BaseLM with three modes, picked by DSPY_LM_BACKEND in config.py:
+
+- record:    calls the real (managed) LM and stores every completion in a
+             cassette store, one JSON file per request
+- replay:    answers from the cassettes; a request that was never recorded
+             raises CassetteMiss (or falls back to synthetic)
+- synthetic: fabricates well-formed completions without any network,
+             with configurable latency and error rate
+
+Cassettes are keyed on model, messages and call kwargs, so a prompt or
+signature change is a miss rather than a silently wrong answer. Synthetic
+completions parse the output fields out of DSPy's prompt and fill them from
+seed files (generated_content_sample.json, site_analysis_report.json), so
+every worker gets valid, typed outputs; the same request always gets the
+same answer.
+
+Replayed and synthetic calls run through the same LMControls path as the
+live ManagedLM (lm_client.ControlledCalls): the model's token bucket, AIMD
+concurrency and 429/5xx backoff, so injected errors are retried like real
+ones and offline runs measure the real client. Record mode leaves that to
+the live LM it records from.
+"""
+
+import asyncio
+import copy
+import json
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import dspy
+import litellm
+
+from config import (
+    DSPY_LM_MODEL, LM_CASSETTE_DIR, LM_REPLAY_FALLBACK, LM_REPLAY_REALTIME,
+    SYNTHETIC_LATENCY_SECONDS, SYNTHETIC_LATENCY_JITTER, SYNTHETIC_ERROR_RATE,
+    SYNTHETIC_SEED_FILES,
+)
+
+from .cache import ContentCache, make_key
+from .lm_client import LIMIT_KWARGS, ControlledCalls, build_lm, get_controls
+
+MODES = ("record", "replay", "synthetic")
+
+# Call kwargs that don't change the completion
+IGNORED_KWARGS = {"cache", "api_key", "api_base", "num_retries", "callbacks"}
+
+# Audit report field names from older report versions -> current signature fields
+SEED_ALIASES = {
+    "critical_issues": "issues_found",
+    "quick_wins": "recommendations",
+    "mobile_optimizations": "mobile_fixes",
+    "accessibility_fixes": "accessibility_issues",
+    "hierarchy_problems": "hierarchy_issues",
+    "brand_misalignments": "brand_deviations",
+    "major_redesign_ideas": "design_recommendations",
+    "color_issues": "color_improvements",
+    "typography_improvements": "typography_fixes",
+    "estimated_score_improvement": "estimated_improvement",
+}
+
+OUTPUT_FIELDS = re.compile(r"^\d+\. `(\w+)` \(([^)]*)\)", re.MULTILINE)
+FIELD_VALUES = re.compile(r"\[\[ ## (\w+) ## \]\]\n(.*?)(?=\n\n\[\[ ## |\Z)", re.DOTALL)
+# Language-style codes ("DE", "pt-BR") that synthetic dict outputs get keyed by
+CODE = re.compile(r"^[A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,4})?$")
+
+
+class CassetteMiss(LookupError):
+    """Replay mode got a request that was never recorded."""
+
+
+class SyntheticLMError(Exception):
+    """Injected failure with a provider-style 429/503 status, retried by ControlledCalls."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Synthetic LM error ({status_code})")
+        self.status_code = status_code
+        self.response = None
+
+
+def cassette_key(model: str, prompt, messages, kwargs: dict) -> str:
+    kwargs = {k: v for k, v in kwargs.items() if k not in IGNORED_KWARGS and v is not None}
+    return make_key("cassette", model, prompt, messages, kwargs)
+
+
+def model_response(model: str, text: str, usage: Dict[str, int]) -> litellm.ModelResponse:
+    return litellm.ModelResponse(
+        model=model,
+        choices=[{"index": 0, "finish_reason": "stop",
+                  "message": {"role": "assistant", "content": text}}],
+        usage=usage,
+    )
+
+
+def approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# ----------------------------------------------------------------------------
+# Synthetic completions
+# ----------------------------------------------------------------------------
+
+def load_seeds(paths: Sequence[Path]) -> Dict[str, object]:
+    """Field name -> example value, flattened out of the seed JSON files."""
+    seeds = {}
+
+    def collect(value):
+        if not isinstance(value, dict):
+            return
+        for name, item in value.items():
+            if name == "stimulus_scores" and isinstance(item, dict):
+                seeds.update({f"{sense}_score": score for sense, score in item.items()})
+            if isinstance(item, dict) and not all(isinstance(v, str) for v in item.values()):
+                collect(item)
+            elif item not in (None, "", [], {}):
+                seeds.setdefault(name, item)
+
+    for path in paths:
+        try:
+            with open(path) as f:
+                collect(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+    for field, alias in SEED_ALIASES.items():
+        if field not in seeds and alias in seeds:
+            seeds[field] = seeds[alias]
+    return seeds
+
+
+def sentence_pool(seeds: Dict[str, object]) -> List[str]:
+    pool = []
+    for value in seeds.values():
+        if isinstance(value, str) and len(value) < 300:
+            pool.append(value)
+        elif isinstance(value, list):
+            pool.extend(item for item in value if isinstance(item, str))
+    return pool or ["Synthetic output."]
+
+
+def output_fields(messages: Optional[list]) -> List[tuple]:
+    """[(name, type), ...] from DSPy's system message ("Your output fields are: ...")."""
+    system = next((m["content"] for m in messages or [] if m.get("role") == "system"), "")
+    _, _, section = system.partition("Your output fields are:")
+    section = section.split("All interactions will be structured", 1)[0]
+    return OUTPUT_FIELDS.findall(section)
+
+
+def dict_keys(messages: Optional[list]) -> Optional[List[str]]:
+    """Keys for synthetic dict outputs: the first list input of codes (e.g. languages).
+
+    Signatures like LocalizeExperienceContent return one entry per item of
+    such an input, so synthetic output has to be keyed the same way.
+    """
+    user = next((m["content"] for m in reversed(messages or []) if m.get("role") == "user"), "")
+    for _, raw in FIELD_VALUES.findall(user or ""):
+        # The last input field runs on into DSPy's "Respond with ..." paragraph
+        try:
+            value = json.loads(raw.strip().split("\n\n", 1)[0])
+        except ValueError:
+            continue
+        if (isinstance(value, list) and value
+                and all(isinstance(item, str) and CODE.match(item) for item in value)):
+            return value
+    return None
+
+
+def synthesize(type_: str, seed, rng: random.Random, pool: List[str], keys: Optional[List[str]] = None):
+    """A value of DSPy type string `type_` (e.g. 'list[dict[str, str]]'), preferring `seed`.
+
+    Top-level dicts are keyed by `keys` when given.
+    """
+    type_ = type_.replace(" ", "")
+    if type_.startswith("list["):
+        inner = type_[5:-1]
+        items = seed if isinstance(seed, list) and seed else [None] * rng.randint(3, 5)
+        return [synthesize(inner, item, rng, pool) for item in items]
+    if type_.startswith("dict["):
+        value_type = type_[5:-1].split(",", 1)[1] if "," in type_ else "str"
+        if keys:
+            return {key: synthesize(value_type, None, rng, pool) for key in keys}
+        if isinstance(seed, dict) and seed:
+            return {k: synthesize(value_type, v, rng, pool) for k, v in seed.items()}
+        if isinstance(seed, str):
+            return {"item": seed, "detail": rng.choice(pool)}
+        return {f"item_{i + 1}": synthesize(value_type, None, rng, pool) for i in range(3)}
+    if type_ in ("int", "float"):
+        if isinstance(seed, (int, float)) and not isinstance(seed, bool):
+            return int(seed) if type_ == "int" else float(seed)
+        return rng.randint(5, 9) if type_ == "int" else round(rng.uniform(5, 9), 1)
+    if type_ == "bool":
+        return seed if isinstance(seed, bool) else rng.random() < 0.5
+    if isinstance(seed, str):
+        return seed
+    if isinstance(seed, dict):
+        return next(iter(seed.values()), rng.choice(pool))
+    return rng.choice(pool)
+
+
+def format_completion(values: Dict[str, object], as_json: bool) -> str:
+    if as_json:
+        return json.dumps(values)
+    parts = []
+    for name, value in values.items():
+        text = value if isinstance(value, str) else json.dumps(value)
+        parts.append(f"[[ ## {name} ## ]]\n{text}")
+    parts.append("[[ ## completed ## ]]")
+    return "\n\n".join(parts)
+
+
+# ----------------------------------------------------------------------------
+# The LM
+# ----------------------------------------------------------------------------
+
+class ReplayLM(ControlledCalls, dspy.BaseLM):
+    """Record, replay or synthesize completions for `model`.
+
+    Args:
+        model: Model name completions are recorded/replayed under
+        mode: "record", "replay" or "synthetic"
+        cassettes: Cassette store (a ContentCache)
+        inner: The real LM to record from (record mode only)
+        controls: The model's shared LMControls; replayed and synthetic calls
+            run under its limits and retries and count into lm_stats()
+        seeds: Seed JSON files for synthetic output
+        latency: Mean synthetic latency in seconds (±`jitter` fraction)
+        error_rate: Fraction of synthetic calls that fail with a 429/503
+        fallback: In replay mode, synthesize cassette misses instead of raising
+        realtime: In replay mode, wait as long as the recorded call took
+    """
+
+    def __init__(self, model: str, mode: str, cassettes: ContentCache, inner=None, controls=None,
+                 seeds: Sequence[Path] = (), latency: float = 0.0, jitter: float = 0.5,
+                 error_rate: float = 0.0, fallback: bool = False, realtime: bool = False,
+                 **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LM mode {mode!r} (expected one of {', '.join(MODES)})")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs the real LM to record from")
+        if mode != "record" and controls is None:
+            raise ValueError(f"{mode.capitalize()} mode needs the model's LMControls")
+        super().__init__(model, **kwargs)
+        self.mode = mode
+        self.cassettes = cassettes
+        self.inner = inner
+        self.controls = controls
+        self.seed_paths = list(seeds)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fallback = fallback
+        self.realtime = realtime
+        self._seeds = None
+
+    def __deepcopy__(self, memo):
+        # Programs deep-copy their LM. A copy gets its own kwargs and history, so
+        # copy(temperature=...) and set_lm don't touch this one, but shares the
+        # cassette store, controls and the recorded LM by reference
+        clone = copy.copy(self)
+        memo[id(self)] = clone
+        clone.kwargs = copy.deepcopy(self.kwargs, memo)
+        clone.callbacks = list(self.callbacks)
+        clone.history = []
+        return clone
+
+    def _key(self, prompt, messages, kwargs: dict) -> str:
+        return cassette_key(self.model, prompt, messages, {**self.kwargs, **kwargs})
+
+    # -- synthetic ------------------------------------------------------------
+
+    def _synthetic_delay(self, rng: random.Random) -> float:
+        return max(0.0, self.latency * (1 + rng.uniform(-self.jitter, self.jitter)))
+
+    def _synthetic_error(self, rng: random.Random) -> Optional[SyntheticLMError]:
+        # Whether to fail is not keyed on the request, so a retry can succeed
+        if self.error_rate and random.random() < self.error_rate:
+            return SyntheticLMError(rng.choice((429, 503)))
+        return None
+
+    def _synthesize(self, key: str, prompt, messages, kwargs: dict) -> litellm.ModelResponse:
+        if self._seeds is None:
+            self._seeds = load_seeds(self.seed_paths)
+        rng = random.Random(key)
+        pool = sentence_pool(self._seeds)
+        fields = output_fields(messages)
+        keys = dict_keys(messages)
+        values = {name: synthesize(type_, self._seeds.get(name), rng, pool, keys) for name, type_ in fields}
+        if not values:
+            values = {"output": rng.choice(pool)}
+        as_json = kwargs.get("response_format") is not None
+        text = format_completion(values, as_json)
+        prompt_text = json.dumps(messages, default=str) if messages else str(prompt)
+        prompt_tokens, completion_tokens = approx_tokens(prompt_text), approx_tokens(text)
+        return model_response(self.model, text, {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        })
+
+    # -- replay ---------------------------------------------------------------
+
+    def _replay(self, key: str):
+        """(response, recorded seconds) for `key`, or None."""
+        entry = self.cassettes.get(key)
+        if entry is None:
+            return None
+        return litellm.ModelResponse(**entry["content"]), entry.get("seconds", 0.0)
+
+    def _store(self, key: str, response, seconds: float):
+        data = response.model_dump() if hasattr(response, "model_dump") else dict(response)
+        self.cassettes.set(key, json.loads(json.dumps(data, default=str)),
+                           model=self.model, seconds=round(seconds, 3))
+
+    # -- dspy.BaseLM ----------------------------------------------------------
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        if self.mode == "record":
+            key = self._key(prompt, messages, kwargs)
+            started = time.perf_counter()
+            response = self.inner.forward(prompt=prompt, messages=messages, **kwargs)
+            self._store(key, response, time.perf_counter() - started)
+            return response
+        return self._controlled(self._offline, prompt, messages, kwargs)
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        if self.mode == "record":
+            key = self._key(prompt, messages, kwargs)
+            started = time.perf_counter()
+            response = await self.inner.aforward(prompt=prompt, messages=messages, **kwargs)
+            self._store(key, response, time.perf_counter() - started)
+            return response
+        return await self._acontrolled(self._aoffline, prompt, messages, kwargs)
+
+    def _offline(self, prompt, messages, kwargs: dict) -> litellm.ModelResponse:
+        """One replayed or synthetic attempt (retries are the caller's)."""
+        key = self._key(prompt, messages, kwargs)
+        if self.mode == "replay":
+            replayed = self._replay(key)
+            if replayed is not None:
+                response, seconds = replayed
+                if self.realtime:
+                    time.sleep(seconds)
+                self.controls.count(replayed=1)
+                return response
+            if not self.fallback:
+                raise CassetteMiss(f"No cassette for this {self.model} request (key {key[:12]})")
+
+        rng = random.Random(key)
+        time.sleep(self._synthetic_delay(rng))
+        error = self._synthetic_error(rng)
+        if error is not None:
+            raise error
+        self.controls.count(synthetic=1)
+        return self._synthesize(key, prompt, messages, kwargs)
+
+    async def _aoffline(self, prompt, messages, kwargs: dict) -> litellm.ModelResponse:
+        key = self._key(prompt, messages, kwargs)
+        if self.mode == "replay":
+            replayed = self._replay(key)
+            if replayed is not None:
+                response, seconds = replayed
+                if self.realtime:
+                    await asyncio.sleep(seconds)
+                self.controls.count(replayed=1)
+                return response
+            if not self.fallback:
+                raise CassetteMiss(f"No cassette for this {self.model} request (key {key[:12]})")
+
+        rng = random.Random(key)
+        await asyncio.sleep(self._synthetic_delay(rng))
+        error = self._synthetic_error(rng)
+        if error is not None:
+            raise error
+        self.controls.count(synthetic=1)
+        return self._synthesize(key, prompt, messages, kwargs)
+
+
+def build_replay_lm(model: Optional[str] = None, mode: str = "synthetic", **kwargs) -> ReplayLM:
+    """Offline LM for `model` (default DSPY_LM_MODEL) in `mode`.
+
+    Rate-limit overrides (requests_per_minute, ...) configure the model's
+    shared controls, which the real LM uses in record mode and the ReplayLM
+    itself otherwise; other kwargs go to the LM as usual.
+    """
+    model = model or DSPY_LM_MODEL
+    limits = {name: kwargs.pop(name) for name in LIMIT_KWARGS if name in kwargs}
+    inner = build_lm(model, **limits, **kwargs) if mode == "record" else None
+    return ReplayLM(
+        model, mode,
+        cassettes=ContentCache(LM_CASSETTE_DIR, name="cassettes"),
+        inner=inner,
+        controls=get_controls(model, **limits),
+        seeds=SYNTHETIC_SEED_FILES,
+        latency=SYNTHETIC_LATENCY_SECONDS,
+        jitter=SYNTHETIC_LATENCY_JITTER,
+        error_rate=SYNTHETIC_ERROR_RATE,
+        fallback=LM_REPLAY_FALLBACK,
+        realtime=LM_REPLAY_REALTIME,
+        **kwargs,
+    )
@@ -0,0 +1,143 @@
+"""
+Routed Copywriter - one copywriter call split across model tiers
+
+ExperienceCopywriter asks a single 70B ChainOfThought call for every field of
+GenerateExperienceContent, but the five scores and the 5-8 word tagline need
+neither its reasoning nor its size. RoutedCopywriter asks for each field
+group in its own sub-request, cut down from the same signature, on the
+group's tier in COPYWRITER_ROUTE_MODELS, all at the same time:
+
+- copy     description, highlights  ChainOfThought  (default DSPY_LM_MODEL)
+- tagline  tagline                  Predict         (default FAST_LM_MODEL)
+- scores   the five *_score fields   Predict         (default FAST_LM_MODEL)
+
+The sub-predictions are merged back into one, so validation, targeted
+repairs, best-of-N candidates and the `{tagline, description, highlights,
+stimulus_scores}` payload all work as in ExperienceCopywriter. Wall time is
+the slowest group's instead of one call generating everything.
+"""
+
+import asyncio
+import functools
+from typing import Dict, Optional
+
+import dspy
+from dspy.streaming import StreamListener, StreamResponse
+
+from config import COPYWRITER_ROUTE_MODELS, DSPY_LM_MODEL
+
+from .copywriter import STREAMED_FIELDS, ExperienceCopywriter, sampling, threaded_map
+from .lm_client import build_backend_lm
+from .signatures import GenerateExperienceContent
+from .validation import OUTPUT_FIELDS, SCORE_FIELDS
+
+# group -> (output fields, reason first, instructions); None keeps the brand-voice
+# docstring, which the scores don't need
+ROUTES = {
+    "copy": (("description", "highlights"), True, None),
+    "tagline": (("tagline",), False, None),
+    "scores": (SCORE_FIELDS, False, "Score how strongly this Stimulus Collective experience engages each sense."),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def route_signature(group: str) -> type:
+    """GenerateExperienceContent asking only for `group`'s fields."""
+    fields, _, instructions = ROUTES[group]
+    signature = GenerateExperienceContent
+    for name in OUTPUT_FIELDS:
+        if name not in fields:
+            signature = signature.delete(name)
+    return signature.with_instructions(instructions) if instructions else signature
+
+
+def routing_key(models: Dict[str, str]) -> str:
+    """The routing as one string, used where content keys take a model name."""
+    return "routed:" + ",".join(f"{group}={models[group]}" for group in ROUTES)
+
+
+class RoutedCopywriter(ExperienceCopywriter):
+    """ExperienceCopywriter whose generation is split per field group (see module docstring).
+
+    Args:
+        models: group -> model for that group's sub-request (default COPYWRITER_ROUTE_MODELS)
+        lm_kwargs: Extra `build_backend_lm` arguments for the tier LMs (e.g. rate limits)
+        **kwargs: repair_attempts / candidates, as for ExperienceCopywriter
+    """
+
+    def __init__(self, models: Optional[Dict[str, str]] = None, lm_kwargs: Optional[dict] = None, **kwargs):
+        super().__init__(**kwargs)
+        # One predictor per group instead
+        del self.generate
+        self.models = {**COPYWRITER_ROUTE_MODELS, **(models or {})}
+        for group, (_, reasoning, _) in ROUTES.items():
+            predictor = (dspy.ChainOfThought if reasoning else dspy.Predict)(route_signature(group))
+            if self.models[group] != DSPY_LM_MODEL:
+                predictor.set_lm(build_backend_lm(self.models[group], **(lm_kwargs or {})))
+            # Attributes, not a dict, so telemetry labels the steps generate_copy, ...
+            setattr(self, f"generate_{group}", predictor)
+
+    @property
+    def model(self) -> str:
+        return routing_key(self.models)
+
+    def route(self, group: str) -> dspy.Module:
+        return getattr(self, f"generate_{group}")
+
+    @staticmethod
+    def _merged(predictions) -> dspy.Prediction:
+        return dspy.Prediction(**{
+            name: prediction.get(name)
+            for (fields, _, _), prediction in zip(ROUTES.values(), predictions) for name in fields
+        })
+
+    def _draft(self, inputs: dict, temperature: Optional[float] = None) -> dspy.Prediction:
+        predictions = threaded_map(lambda group: self.route(group)(**inputs, **sampling(temperature)), list(ROUTES))
+        return self._merged(predictions)
+
+    async def _adraft(self, inputs: dict, temperature: Optional[float] = None) -> dspy.Prediction:
+        predictions = await asyncio.gather(*(
+            self.route(group).acall(**inputs, **sampling(temperature)) for group in ROUTES
+        ))
+        return self._merged(predictions)
+
+    async def stream(self, **kwargs):
+        """Like ExperienceCopywriter.stream; each streamed field comes from its own group's call."""
+        chunks = asyncio.Queue()
+
+        async def run(group: str) -> dspy.Prediction:
+            fields = [name for name in STREAMED_FIELDS if name in ROUTES[group][0]]
+            if not fields:
+                return await self.route(group).acall(**kwargs)
+            # Listeners keep per-stream state, so build a fresh program per call
+            program = dspy.streamify(
+                self.route(group), stream_listeners=[StreamListener(signature_field_name=name) for name in fields],
+            )
+            prediction = None
+            # Read to the end: leaving early would close the stream from another task
+            async for item in program(**kwargs):
+                if isinstance(item, StreamResponse):
+                    chunks.put_nowait((item.signature_field_name, item.chunk))
+                elif isinstance(item, dspy.Prediction):
+                    prediction = item
+            if prediction is None:
+                raise RuntimeError(f"Stream for {group} ended without a final prediction")
+            return prediction
+
+        routes = asyncio.ensure_future(asyncio.gather(*(run(group) for group in ROUTES)))
+        try:
+            while not routes.done():
+                next_chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({next_chunk, routes}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_chunk.done():
+                    next_chunk.cancel()
+                    break
+                yield next_chunk.result()
+            while not chunks.empty():
+                yield chunks.get_nowait()
+        finally:
+            if not routes.done():
+                routes.cancel()
+
+        # Streamed text is provisional: fields that fail validation are replaced here
+        yield "done", await self._avalidated(kwargs, self._select([self._merged(routes.result())]))
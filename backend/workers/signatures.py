@@ -45,3 +45,30 @@ class GenerateExperienceContent(dspy.Signature):
     sound_score: int = dspy.OutputField(desc="Auditory richness score 1-10 (ambient sounds, music, silence)")
     thought_score: int = dspy.OutputField(desc="Cognitive challenge score 1-10 (learning, deep conversations)")
     connect_score: int = dspy.OutputField(desc="Human connection score 1-10 (intimacy, personal interaction)")
+
+# Targets stated in the output field descriptions above (checked by
+# workers/validation.py and workers/brand_voice.py; keep them in sync)
+WORD_TARGETS = {"tagline": (5, 8), "description": (180, 220)}
+HIGHLIGHT_COUNT = (5, 7)
+SCORE_RANGE = (1, 10)
+
+class LocalizeExperienceContent(dspy.Signature):
+    """Localize finished Stimulus Collective copy into other languages.
+
+    This is localization, not literal translation. Keep the brand voice: concrete,
+    understated, warm, no tourism clichés in any language. Keep proper nouns,
+    wine names, street names and numbers exactly as they are. Use the informal
+    register a Basel local would use with a friend (du/tú/tu). Match the length
+    and structure of the source: same number of highlights, same order.
+    """
+
+    # Inputs
+    tagline: str = dspy.InputField(desc="Source tagline (English)")
+    description: str = dspy.InputField(desc="Source description (English)")
+    highlights: list[str] = dspy.InputField(desc="Source highlights (English)")
+    languages: list[str] = dspy.InputField(desc="Target language codes, e.g. ['DE', 'FR']")
+
+    # Outputs, one entry per requested language code
+    taglines: dict[str, str] = dspy.OutputField(desc="Language code -> localized tagline")
+    descriptions: dict[str, str] = dspy.OutputField(desc="Language code -> localized description")
+    localized_highlights: dict[str, list[str]] = dspy.OutputField(desc="Language code -> localized highlights, same count and order as the source")
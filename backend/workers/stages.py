@@ -0,0 +1,78 @@
+"""
+Stage Cache - memoized steps for multi-step workers
+
+UXDesignerWorker and VisualDesignerWorker chain three ChainOfThought steps,
+each fed a summary of the previous step's output. Every step's prediction
+is cached under its own key (stage name, signature hash, model, inputs), so
+a re-run only pays for the steps whose inputs or prompt actually changed:
+editing step 3's signature recomputes step 3 alone, and an unchanged layout
+is served entirely from cache.
+"""
+
+import time
+from typing import List, Optional
+
+import dspy
+
+from config import STAGE_CACHE_DIR, STAGE_CACHE_MAX_ENTRIES
+
+from .cache import ContentCache, make_key, signature_hash
+
+
+def current_model() -> Optional[str]:
+    lm = dspy.settings.lm
+    return getattr(lm, "model", None)
+
+
+class StageCache:
+    """Prediction cache for individual worker steps.
+
+    Args:
+        cache: Backing ContentCache (default: STAGE_CACHE_DIR on disk)
+        refresh: Recompute every stage but still store the results
+    """
+
+    def __init__(self, cache: Optional[ContentCache] = None, refresh: bool = False):
+        self.cache = cache if cache is not None else ContentCache(
+            STAGE_CACHE_DIR, STAGE_CACHE_MAX_ENTRIES, name="stages"
+        )
+        self.refresh = refresh
+
+    def __deepcopy__(self, memo):
+        # DSPy deep-copies modules; copies share one cache
+        return self
+
+    def key(self, worker: str, stage: str, signature, inputs: dict) -> str:
+        return make_key("stage", worker, stage, signature_hash(signature), current_model(), inputs)
+
+    def run(self, worker: str, stage: str, predictor, signature, report: List[dict], **inputs) -> dspy.Prediction:
+        """Return the cached prediction for this step, or call `predictor` and store it.
+
+        Appends {"stage", "status": "hit" | "recomputed", "seconds"} to `report`.
+        """
+        key = self.key(worker, stage, signature, inputs)
+        started = time.perf_counter()
+
+        entry = None if self.refresh else self.cache.get(key)
+        if entry is not None:
+            prediction = dspy.Prediction(**entry["content"])
+            status = "hit"
+        else:
+            prediction = predictor(**inputs)
+            self.cache.set(key, prediction.toDict(), worker=worker, stage=stage)
+            status = "recomputed"
+
+        report.append({
+            "stage": stage,
+            "status": status,
+            "seconds": round(time.perf_counter() - started, 2),
+        })
+        return prediction
+
+
+def summarize_stages(report: List[dict]) -> str:
+    """'step1 hit, step2 hit, step3 recomputed (4.1s)'"""
+    if not report:
+        return "no stages"
+    parts = ", ".join(f"{item['stage']} {item['status']}" for item in report)
+    return f"{parts} ({sum(item['seconds'] for item in report):.1f}s)"
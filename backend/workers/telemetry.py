@@ -0,0 +1,153 @@
+"""
+Telemetry - Prometheus metrics for LM calls, caches and the API
+
+Everything here lands in the default prometheus_client registry, which the
+API exposes at GET /metrics:
+
+- stimulus_lm_call_seconds{model,worker,step}       LM call latency (one sample per attempt that succeeded)
+- stimulus_lm_tokens_total{model,worker,step,kind}  prompt/completion tokens
+- stimulus_lm_errors_total{model,error}             failed LM attempts (including retried ones)
+- stimulus_generation_errors_total{worker,error}    generations that failed after retries
+- stimulus_cache_lookups_total{cache,result}        hit/miss per cache (content, stages, lm)
+- stimulus_content_requests_total{status}           fresh/stale/miss for experience content
+- stimulus_http_request_seconds{method,route,status}
+- stimulus_field_failures_total{field,reason}       copywriter output fields failing validation (first attempt)
+- stimulus_field_repairs_total{field,outcome}       targeted re-requests of failed fields: repaired/unrepaired
+- stimulus_brand_voice_score{selected}              brand-voice lint score per copywriter candidate (selected or not)
+- stimulus_jobs_total{kind,status}                  background jobs by outcome (succeeded/failed/deduplicated)
+- stimulus_job_seconds{kind}                        background job run time (excluding queueing)
+
+`worker` and `step` are set by lm_client.TelemetryCallback: the outermost
+DSPy module being called (e.g. ExperienceCopywriter) and the predictor
+inside it that made the call (e.g. "generate", "step2", "fused"). This
+module itself doesn't import DSPy, so the API can serve metrics before
+DSPy is loaded.
+"""
+
+import contextvars
+from typing import Dict, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+LM_CALL_SECONDS = Histogram(
+    "stimulus_lm_call_seconds", "LM call latency",
+    ["model", "worker", "step"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128),
+)
+LM_TOKENS = Counter(
+    "stimulus_lm_tokens_total", "LM tokens used",
+    ["model", "worker", "step", "kind"],
+)
+LM_ERRORS = Counter(
+    "stimulus_lm_errors_total", "Failed LM attempts by error type",
+    ["model", "error"],
+)
+GENERATION_ERRORS = Counter(
+    "stimulus_generation_errors_total", "Content generations that failed after retries",
+    ["worker", "error"],
+)
+CACHE_LOOKUPS = Counter(
+    "stimulus_cache_lookups_total", "Cache lookups by cache and result",
+    ["cache", "result"],
+)
+CONTENT_REQUESTS = Counter(
+    "stimulus_content_requests_total", "Experience content served by freshness status",
+    ["status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "stimulus_http_request_seconds", "API latency per route (time to response headers)",
+    ["method", "route", "status"],
+)
+
+FIELD_FAILURES = Counter(
+    "stimulus_field_failures_total", "Copywriter output fields that failed validation on the first attempt",
+    ["field", "reason"],
+)
+FIELD_REPAIRS = Counter(
+    "stimulus_field_repairs_total", "Failed copywriter fields after targeted re-requests",
+    ["field", "outcome"],
+)
+BRAND_VOICE_SCORES = Histogram(
+    "stimulus_brand_voice_score", "Brand-voice lint score of copywriter candidates (100 = clean)",
+    ["selected"],
+    buckets=(20, 40, 60, 70, 80, 90, 95, 100),
+)
+JOBS = Counter(
+    "stimulus_jobs_total", "Background jobs by kind and outcome",
+    ["kind", "status"],
+)
+JOB_SECONDS = Histogram(
+    "stimulus_job_seconds", "Background job run time in a worker process",
+    ["kind"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+CURRENT_WORKER = contextvars.ContextVar("telemetry_worker", default=None)
+CURRENT_STEPS = contextvars.ContextVar("telemetry_steps", default=None)
+CURRENT_STEP = contextvars.ContextVar("telemetry_step", default=None)
+
+
+def call_labels() -> tuple:
+    """(worker, step) of the DSPy call in progress, "none" outside one."""
+    return CURRENT_WORKER.get() or "none", CURRENT_STEP.get() or "none"
+
+
+def predictor_names(module) -> Dict[int, str]:
+    """id(predictor) -> attribute path, e.g. 'step1' for step1 = ChainOfThought(...)."""
+    return {id(predictor): name.removesuffix(".predict")
+            for name, predictor in module.named_predictors()}
+
+
+def record_lm_call(model: str, seconds: float, usage: Dict[str, int], cache_hit: bool):
+    worker, step = call_labels()
+    CACHE_LOOKUPS.labels("lm", "hit" if cache_hit else "miss").inc()
+    if cache_hit:
+        return
+    LM_CALL_SECONDS.labels(model, worker, step).observe(seconds)
+    LM_TOKENS.labels(model, worker, step, "prompt").inc(usage.get("prompt_tokens", 0))
+    LM_TOKENS.labels(model, worker, step, "completion").inc(usage.get("completion_tokens", 0))
+
+
+def record_lm_error(model: str, error: Exception):
+    LM_ERRORS.labels(model, type(error).__name__).inc()
+
+
+def record_generation_error(worker: str, error: Exception):
+    GENERATION_ERRORS.labels(worker, type(error).__name__).inc()
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_content_request(status: str):
+    CONTENT_REQUESTS.labels(status).inc()
+
+
+def record_http_request(method: str, route: str, status: int, seconds: float):
+    HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(seconds)
+
+
+def record_field_failure(field: str, reason: str):
+    FIELD_FAILURES.labels(field, reason).inc()
+
+
+def record_field_repair(field: str, repaired: bool):
+    FIELD_REPAIRS.labels(field, "repaired" if repaired else "unrepaired").inc()
+
+
+def record_brand_voice(score: float, selected: bool):
+    BRAND_VOICE_SCORES.labels("yes" if selected else "no").observe(score)
+
+
+def record_job(kind: str, status: str, seconds: Optional[float] = None):
+    JOBS.labels(kind, status).inc()
+    if seconds is not None:
+        JOB_SECONDS.labels(kind).observe(seconds)
+
+
+def render_metrics() -> bytes:
+    """Current metrics in the Prometheus text exposition format."""
+    return generate_latest()
@@ -5,6 +5,9 @@ UX/UI Designer Worker - Enhanced with brand context and multi-step reasoning
 import dspy
 from typing import List, Dict
 
+from .fused import check_mode, fuse_signatures, split_prediction
+from .stages import StageCache
+
 class UXAnalysisStep1(dspy.Signature):
     """First step: Deep analysis of current state with brand context.
 
@@ -84,21 +87,56 @@ class UXAnalysisStep3(dspy.Signature):
         desc="Overall urgency 1-10 (1=polish, 10=broken)"
     )
 
+UX_STEPS = {
+    "analysis": UXAnalysisStep1,
+    "solutions": UXAnalysisStep2,
+    "action_plan": UXAnalysisStep3,
+}
+
+# Fast mode: all three steps' outputs in one structured call
+UXAnalysisFused = fuse_signatures(
+    "Complete UX audit in one pass: analyze the current state with brand context, "
+    "brainstorm solutions for what you found, then prioritize them into an action plan.",
+    list(UX_STEPS.values()),
+)
+
 class UXDesignerWorker(dspy.Module):
     """Enhanced UX Designer with multi-step reasoning and brand awareness."""
 
-    def __init__(self):
+    def __init__(self, stage_cache: StageCache = None):
         super().__init__()
+        # Each step's prediction is memoized, so re-runs only pay for changed steps
+        self.stage_cache = stage_cache if stage_cache is not None else StageCache()
         self.step1 = dspy.ChainOfThought(UXAnalysisStep1)
         self.step2 = dspy.ChainOfThought(UXAnalysisStep2)
         self.step3 = dspy.ChainOfThought(UXAnalysisStep3)
+        self.fused = dspy.Predict(UXAnalysisFused)
 
     def forward(self, page_type: str, current_layout: str,
                 user_behavior_data: str = "No data yet",
-                device_breakdown: str = "mobile: 60%, desktop: 35%, tablet: 5%"):
+                device_breakdown: str = "mobile: 60%, desktop: 35%, tablet: 5%",
+                mode: str = "chain"):
+        """Run the audit.
+
+        mode="chain" (default) runs three ChainOfThought steps; mode="fast"
+        makes one structured call. Both return analysis/solutions/action_plan
+        predictions plus the stage report.
+        """
+        stages = []
+
+        if check_mode(mode) == "fast":
+            fused = self.stage_cache.run(
+                "ux", "fused", self.fused, UXAnalysisFused, stages,
+                page_type=page_type,
+                current_layout=current_layout,
+                user_behavior_data=user_behavior_data,
+                device_breakdown=device_breakdown
+            )
+            return {**split_prediction(fused, UX_STEPS), "stages": stages}
 
         # Step 1: Deep analysis
-        analysis = self.step1(
+        analysis = self.stage_cache.run(
+            "ux", "step1", self.step1, UXAnalysisStep1, stages,
             page_type=page_type,
             current_layout=current_layout,
             user_behavior_data=user_behavior_data,
@@ -113,7 +151,9 @@ class UXDesignerWorker(dspy.Module):
         Missed opportunities: {analysis.missed_opportunities}
         """
 
-        solutions = self.step2(analysis=analysis_summary)
+        solutions = self.stage_cache.run(
+            "ux", "step2", self.step2, UXAnalysisStep2, stages,
+            analysis=analysis_summary)
 
         # Step 3: Prioritization
         solutions_summary = f"""
@@ -123,11 +163,14 @@ class UXDesignerWorker(dspy.Module):
         Accessibility fixes: {solutions.accessibility_fixes}
         """
 
-        action_plan = self.step3(solutions=solutions_summary)
+        action_plan = self.stage_cache.run(
+            "ux", "step3", self.step3, UXAnalysisStep3, stages,
+            solutions=solutions_summary)
 
         # Combine all results
         return {
             "analysis": analysis,
             "solutions": solutions,
-            "action_plan": action_plan
+            "action_plan": action_plan,
+            "stages": stages
         }
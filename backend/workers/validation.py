@@ -0,0 +1,134 @@
+"""
+Content Validation - field-level checks for copywriter output
+
+GenerateExperienceContent asks for a 5-8 word tagline, a 180-220 word
+description, 5-7 highlights and five 1-10 scores, and bans phrases like
+"hidden gem" (see brand_voice.py), but the LM's answer is taken as-is.
+`validate_fields` checks every output field on its own, so the
+copywriter can re-request just the fields that failed: `repair_signature`
+cuts the signature down to those fields and adds the accepted ones and the
+problems found as inputs.
+"""
+
+import functools
+import json
+import math
+from typing import Dict, Optional, Tuple
+
+import dspy
+
+from .brand_voice import TEXT_FIELDS, find_phrases, text_of
+from .signatures import HIGHLIGHT_COUNT, SCORE_RANGE, WORD_TARGETS, GenerateExperienceContent
+
+OUTPUT_FIELDS = tuple(GenerateExperienceContent.output_fields)
+SCORE_FIELDS = tuple(name for name in OUTPUT_FIELDS if name.endswith("_score"))
+
+# Word counts get WORD_SLACK either side of the signature's targets, so a
+# near-miss isn't worth another LM call
+WORD_SLACK = 0.1
+
+
+def word_bounds(name: str) -> Tuple[int, int]:
+    low, high = WORD_TARGETS[name]
+    return math.floor(low * (1 - WORD_SLACK)), math.ceil(high * (1 + WORD_SLACK))
+
+
+def check_field(name: str, value) -> Optional[Tuple[str, str]]:
+    """`(reason, problem)` if `value` isn't acceptable for output field `name`, else None.
+
+    `reason` is a short code for metrics (missing, type, length, count,
+    range, banned); `problem` is the sentence fed back to the LM.
+    """
+    failure = _check_value(name, value)
+    if name in TEXT_FIELDS and value:
+        banned = [phrase for kind, phrase in find_phrases(text_of(value)) if kind == "banned"]
+        if banned:
+            # Folded into a length/count problem so one repair fixes both
+            phrases = ", ".join(dict.fromkeys(banned))
+            if failure is None:
+                return "banned", f"{name} uses banned phrases: {phrases}"
+            reason, problem = failure
+            return reason, f"{problem}, and it uses banned phrases: {phrases}"
+    return failure
+
+
+def _check_value(name: str, value) -> Optional[Tuple[str, str]]:
+    if value is None or value == "" or value == []:
+        return "missing", f"{name} is missing"
+    if name in WORD_TARGETS:
+        if not isinstance(value, str):
+            return "type", f"{name} must be text"
+        words = len(value.split())
+        low, high = word_bounds(name)
+        if not low <= words <= high:
+            target = "-".join(map(str, WORD_TARGETS[name]))
+            return "length", f"{name} has {words} words, it must have {target}"
+    elif name == "highlights":
+        if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+            return "type", "highlights must be a list of non-empty strings"
+        low, high = HIGHLIGHT_COUNT
+        if not low <= len(value) <= high:
+            return "count", f"highlights has {len(value)} items, it must have {low}-{high}"
+    elif name in SCORE_FIELDS:
+        if isinstance(value, bool) or not isinstance(value, int):
+            return "type", f"{name} must be a whole number"
+        low, high = SCORE_RANGE
+        if not low <= value <= high:
+            return "range", f"{name} is {value}, it must be between {low} and {high}"
+    return None
+
+
+def validate_fields(values: Dict[str, object]) -> Dict[str, Tuple[str, str]]:
+    """{field: (reason, problem)} for every output field that fails its check."""
+    failures = {}
+    for name in OUTPUT_FIELDS:
+        failure = check_field(name, values.get(name))
+        if failure is not None:
+            failures[name] = failure
+    return failures
+
+
+def clamp_scores(values: Dict[str, object]) -> Dict[str, object]:
+    """Pull integer scores into SCORE_RANGE (last resort once repairs ran out)."""
+    low, high = SCORE_RANGE
+    return {
+        name: min(max(value, low), high)
+        if name in SCORE_FIELDS and isinstance(value, int) and not isinstance(value, bool) else value
+        for name, value in values.items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def repair_signature(fields: Tuple[str, ...]) -> type:
+    """GenerateExperienceContent asking only for `fields` (sorted tuple).
+
+    The fields that passed go in as `accepted` (JSON) so the new ones stay
+    consistent with them, and `problems` says what was wrong last time.
+    """
+    signature = GenerateExperienceContent
+    for name in OUTPUT_FIELDS:
+        if name not in fields:
+            signature = signature.delete(name)
+    signature = signature.append(
+        "accepted", dspy.InputField(desc="Fields already accepted for this experience (JSON); stay consistent with them"),
+        type_=str,
+    )
+    signature = signature.append(
+        "problems", dspy.InputField(desc="What was wrong with the previous attempt at the requested fields"),
+        type_=list[str],
+    )
+    return signature.with_instructions(
+        "Rewrite only the requested fields of this experience's content, fixing the listed problems.\n\n"
+        + GenerateExperienceContent.instructions
+    )
+
+
+def repair_inputs(inputs: dict, values: Dict[str, object], failures: Dict[str, Tuple[str, str]]) -> dict:
+    """Keyword arguments for a repair call (signature included)."""
+    accepted = {name: value for name, value in values.items() if name not in failures}
+    return {
+        **inputs,
+        "signature": repair_signature(tuple(sorted(failures))),
+        "accepted": json.dumps(accepted, ensure_ascii=False),
+        "problems": [problem for _, problem in failures.values()],
+    }
@@ -5,6 +5,9 @@ Visual Designer Worker - Enhanced with brand examples and multi-step design proc
 import dspy
 from typing import List, Dict
 
+from .fused import check_mode, fuse_signatures, split_prediction
+from .stages import StageCache
+
 class VisualAuditStep1(dspy.Signature):
     """First step: Visual inventory and brand alignment check.
 
@@ -86,17 +89,40 @@ class VisualAuditStep3(dspy.Signature):
         desc="Elements that are working well - preserve these!"
     )
 
+VISUAL_STEPS = {
+    "inventory": VisualAuditStep1,
+    "problems": VisualAuditStep2,
+    "recommendations": VisualAuditStep3,
+}
+
+# Fast mode: all three steps' outputs in one structured call
+VisualAuditFused = fuse_signatures(
+    "Complete visual audit in one pass: take a visual inventory and check brand "
+    "alignment, diagnose the problems with specific fixes, then give code-ready "
+    "recommendations.",
+    list(VISUAL_STEPS.values()),
+)
+
 class VisualDesignerWorker(dspy.Module):
     """Enhanced Visual Designer with multi-step audit and code-ready outputs."""
 
-    def __init__(self):
+    def __init__(self, stage_cache: StageCache = None):
         super().__init__()
+        # Each step's prediction is memoized, so re-runs only pay for changed steps
+        self.stage_cache = stage_cache if stage_cache is not None else StageCache()
         self.step1 = dspy.ChainOfThought(VisualAuditStep1)
         self.step2 = dspy.ChainOfThought(VisualAuditStep2)
         self.step3 = dspy.ChainOfThought(VisualAuditStep3)
+        self.fused = dspy.Predict(VisualAuditFused)
 
     def forward(self, page_screenshot_description: str, brand_guidelines: str,
-                competitor_references: list = None):
+                competitor_references: list = None, mode: str = "chain"):
+        """Run the audit.
+
+        mode="chain" (default) runs three ChainOfThought steps; mode="fast"
+        makes one structured call. Both return inventory/problems/recommendations
+        predictions plus the stage report.
+        """
 
         if competitor_references is None:
             competitor_references = [
@@ -105,8 +131,20 @@ class VisualDesignerWorker(dspy.Module):
                 "Ace Hotel - boutique warmth + professional polish"
             ]
 
+        stages = []
+
+        if check_mode(mode) == "fast":
+            fused = self.stage_cache.run(
+                "visual", "fused", self.fused, VisualAuditFused, stages,
+                page_screenshot_description=page_screenshot_description,
+                brand_guidelines=brand_guidelines,
+                competitor_references=competitor_references
+            )
+            return {**split_prediction(fused, VISUAL_STEPS), "stages": stages}
+
         # Step 1: Visual inventory
-        inventory = self.step1(
+        inventory = self.stage_cache.run(
+            "visual", "step1", self.step1, VisualAuditStep1, stages,
             page_screenshot_description=page_screenshot_description,
             brand_guidelines=brand_guidelines,
             competitor_references=competitor_references
@@ -120,7 +158,9 @@ class VisualDesignerWorker(dspy.Module):
         Brand alignment: {inventory.brand_alignment_score}/10
         """
 
-        problems = self.step2(visual_inventory=inventory_summary)
+        problems = self.stage_cache.run(
+            "visual", "step2", self.step2, VisualAuditStep2, stages,
+            visual_inventory=inventory_summary)
 
         # Step 3: Solutions with code
         problems_summary = f"""
@@ -130,11 +170,14 @@ class VisualDesignerWorker(dspy.Module):
         Spacing refinements: {problems.spacing_refinements}
         """
 
-        recommendations = self.step3(problems=problems_summary)
+        recommendations = self.stage_cache.run(
+            "visual", "step3", self.step3, VisualAuditStep3, stages,
+            problems=problems_summary)
 
         # Combine all results
         return {
             "inventory": inventory,
             "problems": problems,
-            "recommendations": recommendations
+            "recommendations": recommendations,
+            "stages": stages
         }